@@ -6,6 +6,8 @@ from .team import router as team_router
 from .reference import router as reference_router
 from .reference_category import router as reference_category_router
 from .journal import router as journal_router
+from .job import router as job_router
+from .api_key import router as api_key_router
 
 api_router = APIRouter()
 
@@ -33,3 +35,9 @@ api_router.include_router(
 
 # Journal routes
 api_router.include_router(journal_router, prefix="/journals", tags=["journals"])
+
+# Background job routes
+api_router.include_router(job_router, prefix="/jobs", tags=["jobs"])
+
+# API key routes
+api_router.include_router(api_key_router, prefix="/api-keys", tags=["api-keys"])
@@ -0,0 +1,112 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlmodel import Session, col, select, delete
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.database import get_session
+from app.models.api_key import ApiKey, ApiKeyCreate, ApiKeyCreated, ApiKeyRead, ApiKeyTeam
+from app.models.user import User
+from app.api.user import get_login_user
+from app.services.api_keys import generate_api_key, pending_api_key_usage
+from app.services.auth_cache import find_team_membership
+
+router = APIRouter()
+
+
+def api_key_read(
+    api_key: ApiKey,
+    team_ids: List[int],
+    pending: Optional[Tuple[datetime, int]] = None,
+) -> ApiKeyRead:
+    """
+    API 密钥记录转为响应
+
+    Args:
+        pending: 尚未写入数据库的使用记录 (最后使用时间, 使用次数)，合并到返回值中
+    """
+    update: Dict[str, Any] = {"team_ids": None if api_key.all_teams else team_ids}
+    if pending is not None:
+        used_at, uses = pending
+        if api_key.last_used_at is None or api_key.last_used_at < used_at:
+            update["last_used_at"] = used_at
+        update["use_count"] = api_key.use_count + uses
+    return ApiKeyRead.model_validate(api_key, update=update)
+
+
+@router.post("/", response_model=ApiKeyCreated)
+def create_api_key(
+    api_key_in: ApiKeyCreate,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_login_user),
+):
+    """创建 API 密钥，返回的 key 只显示这一次"""
+    team_ids = sorted(set(api_key_in.team_ids or []))
+    for team_id in team_ids:
+        if find_team_membership(session, current_user, team_id) is None:
+            raise HTTPException(
+                status_code=403, detail=f"Not a member of team {team_id}"
+            )
+
+    key, prefix, key_hash = generate_api_key()
+    db_api_key = ApiKey(
+        name=api_key_in.name,
+        prefix=prefix,
+        key_hash=key_hash,
+        scope=api_key_in.scope,
+        all_teams=api_key_in.team_ids is None,
+        user_id=current_user.id,  # type: ignore
+        expires_at=api_key_in.expires_at,
+    )
+    session.add(db_api_key)
+    session.flush()
+    for team_id in team_ids:
+        session.add(ApiKeyTeam(api_key_id=db_api_key.id, team_id=team_id))  # type: ignore
+    session.commit()
+    session.refresh(db_api_key)
+
+    return ApiKeyCreated.model_validate(
+        api_key_read(db_api_key, team_ids), update={"key": key}
+    )
+
+
+@router.get("/", response_model=List[ApiKeyRead])
+def read_api_keys(
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_login_user),
+):
+    """获取当前用户的 API 密钥（不包含密钥本身）"""
+    api_keys = session.exec(
+        select(ApiKey).where(ApiKey.user_id == current_user.id).order_by(col(ApiKey.id))
+    ).all()
+
+    team_ids: Dict[int, List[int]] = {api_key.id: [] for api_key in api_keys}  # type: ignore
+    for api_key_id, team_id in session.exec(
+        select(ApiKeyTeam.api_key_id, ApiKeyTeam.team_id)
+        .where(col(ApiKeyTeam.api_key_id).in_(list(team_ids)))
+        .order_by(col(ApiKeyTeam.team_id))
+    ).all():
+        team_ids[api_key_id].append(team_id)
+    # 合并内存中尚未写入的使用记录，返回最新的使用时间和次数（不写入数据库）。
+    # 在查询之后读取：期间恰好批量写入时只会暂时少计，不会重复计算
+    pending = pending_api_key_usage()
+    return [
+        api_key_read(api_key, team_ids[api_key.id], pending.get(api_key.id))  # type: ignore
+        for api_key in api_keys
+    ]
+
+
+@router.delete("/{api_key_id}")
+def delete_api_key(
+    api_key_id: int,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_login_user),
+):
+    """删除（吊销）API 密钥，立即失效"""
+    api_key = session.get(ApiKey, api_key_id)
+    if not api_key or api_key.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="API key not found")
+
+    session.execute(delete(ApiKeyTeam).where(col(ApiKeyTeam.api_key_id) == api_key_id))
+    session.delete(api_key)
+    session.commit()
+    return {"ok": True}
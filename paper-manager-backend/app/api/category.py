@@ -3,10 +3,25 @@ from sqlmodel import Session, select
 from typing import List
 
 from app.core.database import get_session
-from app.models.category import Category, CategoryCreate, CategoryRead, CategoryUpdate
+from app.models.category import (
+    Category,
+    CategoryClosure,
+    CategoryCreate,
+    CategoryRead,
+    CategoryTreeNode,
+    CategoryUpdate,
+)
 from app.models.user import User
 from app.api.user import get_current_user
 from app.models.reference import ReferencePaper
+from app.services.category_tree import (
+    add_node,
+    descendant_ids,
+    move_node,
+    remove_nodes,
+    subtree_counts,
+)
+from app.services.category_stats import get_category_tree
 
 router = APIRouter()
 
@@ -40,6 +55,9 @@ def create_category(
 
     db_category = Category.from_orm(category)
     session.add(db_category)
+    session.flush()
+    assert db_category.id is not None
+    add_node(session, CategoryClosure, db_category.id, db_category.parent_id)
     session.commit()
     session.refresh(db_category)
     return db_category
@@ -55,6 +73,18 @@ def read_categories(
     """获取分类列表，可选择包含统计信息"""
     categories = session.exec(select(Category).offset(skip).limit(limit)).all()
 
+    # 如果需要统计信息，一次查询统计所有分类子树下的论文数量
+    paper_counts = {}
+    if include_stats:
+        from app.models.paper import Paper
+
+        paper_counts = subtree_counts(
+            session,
+            CategoryClosure,
+            Paper.category_id,
+            [c.id for c in categories if c.id is not None],
+        )
+
     result = []
     for category in categories:
         category_data = CategoryRead(
@@ -64,37 +94,22 @@ def read_categories(
             parent_id=category.parent_id,
         )
 
-        # 如果需要统计信息，计算论文数量
         if include_stats:
-            if category.id is not None:
-                paper_count = get_category_paper_count_recursive(session, category.id)
-            else:
-                paper_count = 0
-            category_data.paper_count = paper_count
+            category_data.paper_count = paper_counts.get(category_data.id, 0)
 
         result.append(category_data)
 
     return result
 
 
-def get_category_paper_count_recursive(session: Session, category_id: int) -> int:
-    """递归获取分类及其所有子分类下的论文数量"""
-    # 获取当前分类的论文数量
-    from app.models.paper import Paper
-
-    query = select(Paper).where(Paper.category_id == category_id)
-    current_count = len(session.exec(query).all())
-
-    # 获取子分类的论文数量
-    children = session.exec(
-        select(Category).where(Category.parent_id == category_id)
-    ).all()
-
-    for child in children:
-        if child.id is not None:
-            current_count += get_category_paper_count_recursive(session, child.id)
+@router.get("/tree", response_model=List[CategoryTreeNode])
+def read_category_tree(session: Session = Depends(get_session)):
+    """
+    获取完整的分类树
 
-    return current_count
+    每个节点包含直接归属的论文数量 paper_count 和包含子分类的 total_paper_count
+    """
+    return get_category_tree(session)
 
 
 @router.get("/{category_id}", response_model=CategoryRead)
@@ -135,11 +150,24 @@ def update_category(
             raise HTTPException(
                 status_code=400, detail="Category cannot be its own parent"
             )
+        if category.parent_id in descendant_ids(session, CategoryClosure, category_id):
+            raise HTTPException(
+                status_code=400,
+                detail="Category cannot be moved under its own subcategory",
+            )
 
+    # parent_id 显式设为 null 时移动到根级别，同样需要更新闭包表
     category_data = category.dict(exclude_unset=True)
+    parent_changed = (
+        "parent_id" in category_data and category.parent_id != db_category.parent_id
+    )
+
     for key, value in category_data.items():
         setattr(db_category, key, value)
 
+    if parent_changed:
+        move_node(session, CategoryClosure, category_id, category.parent_id)
+
     session.add(db_category)
     session.commit()
     session.refresh(db_category)
@@ -178,6 +206,7 @@ def delete_category(
             status_code=400, detail="Cannot delete category with associated papers"
         )
 
+    remove_nodes(session, CategoryClosure, [category_id])
     session.delete(category)
     session.commit()
     return {"ok": True}
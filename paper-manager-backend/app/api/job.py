@@ -0,0 +1,96 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlmodel import Session, col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List
+from datetime import datetime
+
+from app.core.database import get_async_session, get_session
+from app.models.job import Job, JobRead
+from app.models.user import User
+from app.api.user import get_current_user
+from app.services.file_serving import file_response
+from app.services.jobs import (
+    JOB_DONE,
+    JOB_RUNNING,
+    delete_job,
+    job_read,
+    job_result_path,
+)
+
+router = APIRouter()
+
+
+def get_job_or_404(job_id: str, user: User, session: Session) -> Job:
+    """获取任务，只有提交者和管理员可以访问"""
+    job = session.get(Job, job_id)
+    if not job or (job.created_by_id != user.id and not user.is_superuser):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/", response_model=List[JobRead])
+def read_jobs(
+    skip: int = 0,
+    limit: int = 100,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    """获取当前用户提交的任务，按提交时间倒序"""
+    jobs = session.exec(
+        select(Job)
+        .where(Job.created_by_id == current_user.id)
+        .order_by(col(Job.created_at).desc())
+        .offset(skip)
+        .limit(limit)
+    ).all()
+    return [job_read(job) for job in jobs]
+
+
+@router.get("/{job_id}", response_model=JobRead)
+def read_job(
+    job_id: str,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    """获取任务状态和进度"""
+    return job_read(get_job_or_404(job_id, current_user, session))
+
+
+@router.get("/{job_id}/download")
+async def download_job_result(
+    job_id: str,
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    """下载任务生成的文件"""
+    job = await session.run_sync(
+        lambda sync_session: get_job_or_404(job_id, current_user, sync_session)
+    )
+    if job.status != JOB_DONE:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+
+    full_path = job_result_path(job)
+    if full_path is None:
+        raise HTTPException(status_code=404, detail="Job has no result file")
+    if (job.expires_at and job.expires_at < datetime.utcnow()) or not full_path.is_file():
+        raise HTTPException(status_code=410, detail="Job result has expired")
+
+    return file_response(
+        full_path, request.headers, filename=job.result_name, media_type=job.media_type
+    )
+
+
+@router.delete("/{job_id}")
+def delete_job_by_id(
+    job_id: str,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    """删除任务及其结果文件（正在执行的任务不能删除）"""
+    job = get_job_or_404(job_id, current_user, session)
+    if job.status == JOB_RUNNING:
+        raise HTTPException(status_code=409, detail="Job is running")
+    delete_job(session, job)
+    session.commit()
+    return {"ok": True}
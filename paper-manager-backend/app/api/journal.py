@@ -13,6 +13,8 @@ from app.models.journal import (
 )
 from app.models.user import User
 from app.api.user import get_current_user
+from app.services.pagination import build_page, count_query
+from app.services.workload import refresh_journal_workloads
 
 router = APIRouter()
 
@@ -77,12 +79,12 @@ def read_journals(
 
     # 应用过滤条件
     if name:
-        query = query.where(Journal.name.contains(name))  # type: ignore
+        query = query.where(Journal.name.icontains(name))  # type: ignore
     if grade:
         query = query.where(Journal.grade == grade)
 
     # 计算总数量
-    total_count = len(session.exec(query).all())
+    total_count = count_query(session, query, Journal.id)
 
     # 执行分页查询
     journals = session.exec(query.offset(skip).limit(limit)).all()
@@ -99,17 +101,7 @@ def read_journals(
         for journal in journals
     ]
 
-    # 计算分页信息
-    current_page = (skip // limit) + 1
-    total_pages = (total_count + limit - 1) // limit
-
-    return PaginatedJournalResponse(
-        items=results,
-        total=total_count,
-        page=current_page,
-        size=limit,
-        pages=total_pages,
-    )
+    return build_page(PaginatedJournalResponse, results, total_count, skip, limit)
 
 
 @router.get("/search")
@@ -124,7 +116,7 @@ def search_journals(
         return {"items": []}
 
     journals = session.exec(
-        select(Journal).where(Journal.name.contains(q)).limit(limit)  # type: ignore
+        select(Journal).where(Journal.name.icontains(q)).limit(limit)  # type: ignore
     ).all()
 
     return {
@@ -188,6 +180,11 @@ def update_journal(
         setattr(journal, key, value)
 
     journal.updated_at = datetime.utcnow()
+
+    # 期刊等级变化时更新该期刊论文的工作量台账
+    if "grade" in update_data:
+        refresh_journal_workloads(session, journal_id)
+
     session.commit()
     session.refresh(journal)
 
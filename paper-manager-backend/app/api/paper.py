@@ -1,14 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, Form
 from sqlmodel import Session, select, delete, col
-from typing import List, Optional
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.orm import aliased
+from typing import Iterator, List, Optional, Tuple
 import os
-import uuid
 from datetime import datetime
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
 import tempfile
 import pandas as pd
 
-from app.core.database import get_session
+from app.core.database import get_async_session, get_session
 from app.models.paper import (
     Paper,
     PaperCreate,
@@ -17,21 +19,59 @@ from app.models.paper import (
     PaperAuthor,
     PaperKeyword,
     PaginatedPaperResponse,
+    PaperImportResult,
+    PaperOrderBy,
+    PaperExportFilters,
 )
 from app.models.keyword import Keyword
 from app.models.user import User
-from app.models.category import Category
+from app.models.category import Category, CategoryClosure
 from app.models.author import Author
 from app.models.team import Team, TeamUser
+from app.models.job import Job, JobRead
+from app.models.workload import WorkloadExportFilters
 from app.api.user import get_current_user
 from app.api.team import check_team_member
-from app.services.utils import calculate_workload
+from app.services.workload import (
+    get_author_workload_totals,
+    get_paper_workloads,
+    rebuild_workload_ledger,
+    refresh_paper_workloads,
+)
+from app.services.coauthor import (
+    find_collaboration_path,
+    get_author_neighborhood,
+    get_team_collaboration_graph,
+    get_top_collaborators,
+    paper_author_ids,
+    rebuild_coauthorships,
+    refresh_coauthorships,
+)
+from app.services.graph_analytics import get_collaboration_analytics
+from app.services.hydration import hydrate_paper, hydrate_papers
+from app.services.pagination import build_page, count_query, keyset_paginate
+from app.services.search import apply_content_search, apply_search, paper_fts
+from app.services.category_tree import ancestor_ids, descendant_ids
+from app.services.export import (
+    XLSX_MEDIA_TYPE,
+    iter_batches,
+    stream_csv,
+    write_xlsx,
+)
+from app.services.paper_import import import_papers, parse_import_file, resolve_names
+from app.services.blobs import release_file, resolve_file_path, store_upload
+from app.services.file_serving import file_response
+from app.services.text_extraction import queue_text_extraction
+from app.services.jobs import JobProgress, JobResult, enqueue_job, job_handler, job_read
+from app.services.auth_cache import find_team_membership, request_api_key
 from app.core.config_dev import PAPERS_DIR, build_file_url, convert_to_relative_path
 from app.models.journal import Journal
 
 router = APIRouter()
 
-UPLOAD_DIR = str(PAPERS_DIR)
+# 合作图查询的最大跳数
+MAX_NEIGHBORHOOD_HOPS = 4
+MAX_PATH_HOPS = 10
 
 
 def check_paper_access(paper_id: int, user: User, session: Session) -> Paper:
@@ -48,6 +88,14 @@ def check_paper_modify_permission(paper_id: int, user: User, session: Session) -
     if not paper:
         raise HTTPException(status_code=404, detail="Paper not found")
 
+    # 使用 API 密钥时只能修改密钥限定团队的论文（管理员的密钥也一样）
+    if request_api_key() is not None and not find_team_membership(
+        session, user, paper.team_id
+    ):
+        raise HTTPException(
+            status_code=403, detail="API key has no access to this paper's team"
+        )
+
     # 如果是管理员，直接允许修改
     if user.is_superuser:
         return paper
@@ -61,29 +109,22 @@ def check_paper_modify_permission(paper_id: int, user: User, session: Session) -
     return paper
 
 
-def get_category_and_subcategories(session: Session, category_id: int) -> List[int]:
-    """递归获取分类及其所有子分类的ID列表"""
-    result = [category_id]
-    children = session.exec(
-        select(Category).where(Category.parent_id == category_id)
-    ).all()
+def check_admin_permission(user: User):
+    """检查用户是否为管理员"""
+    if not user.is_superuser:
+        raise HTTPException(
+            status_code=403, detail="Only administrators can perform this operation"
+        )
 
-    for child in children:
-        if child.id is not None:
-            result.extend(get_category_and_subcategories(session, child.id))
 
-    return result
+def get_category_and_subcategories(session: Session, category_id: int) -> List[int]:
+    """获取分类及其所有子分类的ID列表"""
+    return descendant_ids(session, CategoryClosure, category_id)
 
 
 def get_category_and_parents(session: Session, category_id: int) -> List[int]:
-    """递归获取分类及其所有父分类的ID列表"""
-    result = [category_id]
-    category = session.get(Category, category_id)
-
-    if category and category.parent_id:
-        result.extend(get_category_and_parents(session, category.parent_id))
-
-    return result
+    """获取分类及其所有父分类的ID列表"""
+    return ancestor_ids(session, CategoryClosure, category_id)
 
 
 def get_or_create_keywords(session: Session, keyword_names: List[str]) -> List[Keyword]:
@@ -185,21 +226,10 @@ def create_paper(
                 status_code=404, detail=f"Category {paper.category_id} not found"
             )
 
-    # 处理作者
-    authors = []
+    # 处理作者（一次查询解析全部作者，缺失的批量创建）
+    author_ids = resolve_names(session, Author, paper.author_names)
+    assert db_paper.id is not None, "Paper must have an ID after creation."
     for i, name in enumerate(paper.author_names):
-        # 查找或创建作者
-        author = session.exec(select(Author).where(Author.name == name)).first()
-        if not author:
-            author = Author(name=name)
-            session.add(author)
-            session.flush()
-
-        assert (
-            author.id is not None
-        ), f"Author '{name}' must have an ID after creation or retrieval."
-        assert db_paper.id is not None, "Paper must have an ID after creation."
-
         # 创建论文-作者关联
         contribution_ratio = (
             paper.author_contribution_ratios[i]
@@ -214,119 +244,90 @@ def create_paper(
         )
         paper_author = PaperAuthor(
             paper_id=db_paper.id,
-            author_id=author.id,
+            author_id=author_ids[name],
             contribution_ratio=contribution_ratio,
             is_corresponding=is_corresponding,
             author_order=i + 1,
         )
         session.add(paper_author)
-        authors.append(name)
 
     # 处理关键词
-    keywords = []
+    keyword_ids = resolve_names(session, Keyword, paper.keyword_names)
     for name in paper.keyword_names:
-        # 查找或创建关键词
-        keyword = session.exec(select(Keyword).where(Keyword.name == name)).first()
-        if not keyword:
-            keyword = Keyword(name=name)
-            session.add(keyword)
-            session.flush()  # 创建论文-关键词关联
-        paper_keyword = PaperKeyword(paper_id=db_paper.id, keyword_id=keyword.id)
+        paper_keyword = PaperKeyword(paper_id=db_paper.id, keyword_id=keyword_ids[name])
         session.add(paper_keyword)
-        keywords.append(name)
+
+    # 更新工作量台账和合作关系
+    refresh_paper_workloads(session, [db_paper.id])
+    refresh_coauthorships(session, [db_paper.id])
 
     session.commit()
     session.refresh(db_paper)
 
-    # 获取分类名称
-    category_name = None
-    if db_paper.category_id:
-        category = session.get(Category, db_paper.category_id)
-        if category:
-            category_name = category.name  # 获取团队名称
-    team_name = None
-    if paper.team_id:
-        team = session.get(Team, paper.team_id)
-        if team:
-            team_name = team.name
-
-    # 获取期刊名称
-    journal_name = None
-    if paper.journal_id:
-        journal = session.get(Journal, paper.journal_id)
-        if journal:
-            journal_name = journal.name
+    return hydrate_paper(session, db_paper)
 
-    return PaperRead(
-        id=db_paper.id if db_paper.id is not None else 0,
-        title=db_paper.title,
-        abstract=db_paper.abstract,
-        publication_date=db_paper.publication_date,
-        journal_id=paper.journal_id,
-        journal_name=journal_name,
-        doi=db_paper.doi,
-        file_url=build_file_url(db_paper.file_path) if db_paper.file_path else None,
-        created_at=db_paper.created_at,
-        updated_at=db_paper.updated_at,
-        keywords=keywords,
-        authors=authors,
-        category_id=db_paper.category_id,
-        category_name=category_name,
-        team_id=paper.team_id,
-        team_name=team_name,
-        created_by_id=current_user.id,
-    )
+
+@router.post("/bulk", response_model=PaperImportResult)
+def bulk_import_papers(
+    file: UploadFile = File(...),
+    team_id: Optional[int] = Form(None),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    批量导入论文
+
+    支持 JSON、CSV、Excel 文件，字段与创建论文接口一致；
+    CSV/Excel 中的作者、关键词、贡献比例使用分号分隔。
+    team_id 作为未指定团队的行的默认团队。
+    校验失败的行不会导入，错误按行号返回。
+    """
+    # 同步路由在线程池中执行，解析和导入不阻塞事件循环
+    content = file.file.read()
+    try:
+        rows = parse_import_file(file.filename or "", content)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid import file: {e}")
+
+    return import_papers(session, rows, current_user, default_team_id=team_id)
 
 
 @router.post("/{paper_id}/upload")
 async def upload_paper_file(
     paper_id: int,
     file: UploadFile = File(...),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user),
 ):
     # 检查论文是否存在
-    paper = check_paper_modify_permission(paper_id, current_user, session)
-
-    # 如果论文已有文件，删除旧文件
-    if paper.file_path:
-        # 构建完整路径以删除旧文件
-        old_full_path = (
-            os.path.join(UPLOAD_DIR, paper.file_path)
-            if not os.path.isabs(paper.file_path)
-            else paper.file_path
+    paper = await session.run_sync(
+        lambda sync_session: check_paper_modify_permission(
+            paper_id, current_user, sync_session
         )
-        if os.path.exists(old_full_path):
-            os.remove(old_full_path)  # 生成唯一文件名（不保留原始文件名）
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    # 获取文件扩展名
-    file_extension = ""
-    if file.filename:
-        file_extension = os.path.splitext(file.filename)[1].lower()
-
-    # 生成新的文件名：论文ID_时间戳_随机数.扩展名
-    random_suffix = str(uuid.uuid4())[:8]
-    filename = f"paper_{paper_id}_{timestamp}_{random_suffix}{file_extension}"
-
-    # 存储相对路径
-    relative_path = filename
-    full_path = os.path.join(UPLOAD_DIR, filename)
-
-    # 保存文件
-    with open(full_path, "wb") as buffer:
-        content = await file.read()
-        buffer.write(content)
-
-    # 更新论文的文件路径（存储相对路径）
-    paper.file_path = relative_path
+    )
+
+    # 按内容存入 blob 存储（超过大小上限或保存失败时不影响原有文件，内容已存在时不再写入）
+    blob = await store_upload(session, file)
+    # PDF 在提交后由后台进程提取文本，用于正文检索
+    text_status = await session.run_sync(queue_text_extraction, blob)
+
+    # 更新论文的文件路径，释放原来的文件
+    old_file_path = paper.file_path
+    paper.file_path = blob.file_path
     paper.updated_at = datetime.utcnow()
     session.add(paper)
-    session.commit()  # 返回文件URL以支持预览
-    file_url = build_file_url(relative_path)
+    await session.run_sync(release_file, old_file_path, PAPERS_DIR)
+    await session.commit()
+
+    # 返回文件URL以支持预览
+    file_url = build_file_url(blob.file_path)
 
     return {
         "paper_id": paper_id,
         "file_url": file_url,
+        "file_size": blob.size,
+        "sha256": blob.sha256,
+        "text_status": text_status,
         "message": "File uploaded successfully",
     }
 
@@ -343,10 +344,20 @@ def read_papers(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     team_id: Optional[int] = None,
+    q: Optional[str] = None,
+    content: Optional[str] = None,
+    order_by: Optional[PaperOrderBy] = None,
+    cursor: Optional[str] = None,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    """获取论文列表"""
+    """获取论文列表
+
+    q 在标题和摘要中进行全文检索，偏移分页时按相关度排序。
+    content 在上传的 PDF 正文中检索，只返回文本已提取完成且包含全部检索词的记录。
+    默认使用 skip/limit 偏移分页；指定 order_by 或 cursor 时切换为游标分页，
+    按 (排序字段, id) 降序返回，并在响应中给出 next_cursor。
+    """
     # 基础查询
     query = select(Paper)
 
@@ -362,7 +373,7 @@ def read_papers(
 
     # 应用其他过滤条件
     if title:
-        query = query.where(Paper.title.contains(title))  # type: ignore
+        query = query.where(Paper.title.icontains(title))  # type: ignore
     if category_id:
         # 获取指定分类及其所有子分类的ID列表
         category_ids = get_category_and_subcategories(session, category_id)
@@ -381,88 +392,55 @@ def read_papers(
         query = query.where(
             (Paper.publication_date != None) & (Paper.publication_date <= end_date)  # type: ignore
         )
+    keyset_mode = order_by is not None or bool(cursor)
+    if q:
+        query = apply_search(
+            query,
+            paper_fts,
+            Paper.id,
+            [Paper.title, Paper.abstract],
+            q,
+            rank=not keyset_mode,
+        )
+    if content:
+        query = apply_content_search(query, Paper.file_path, content)
 
     # 计算总数量（在应用 offset/limit 之前）
-    total_count = len(session.exec(query).all())
+    total_count = count_query(session, query, Paper.id)
 
     # 执行分页查询
-    papers = session.exec(query.offset(skip).limit(limit)).all()
-
-    # 构建返回数据
-    results = []
-    for paper in papers:
-        # 获取关键词
-        keywords = [
-            kw.name
-            for kw in session.exec(
-                select(Keyword)
-                .join(PaperKeyword)
-                .where(PaperKeyword.paper_id == paper.id)
-            ).all()
-        ]
-
-        # 获取作者
-        authors = [
-            author.name
-            for author in session.exec(
-                select(Author)
-                .join(PaperAuthor)
-                .where(PaperAuthor.paper_id == paper.id)
-                .order_by(PaperAuthor.author_order)  # type: ignore
-            ).all()
-        ]  # 获取分类
-        category_name = None
-        if paper.category_id:
-            category = session.get(Category, paper.category_id)
-            if category:
-                category_name = category.name
-
-        # 获取期刊名称
-        journal_name = None
-        if paper.journal_id:
-            journal = session.get(Journal, paper.journal_id)
-            if journal:
-                journal_name = journal.name  # 获取团队名称
-        team_name = None
-        if paper.team_id:
-            team = session.get(Team, paper.team_id)
-            if team:
-                team_name = team.name
-
-        # 获取团队ID - 直接从论文对象获取
-        results.append(
-            PaperRead(
-                id=paper.id if paper.id is not None else 0,
-                title=paper.title,
-                abstract=paper.abstract,
-                publication_date=paper.publication_date,
-                journal_id=paper.journal_id,
-                journal_name=journal_name,
-                doi=paper.doi,
-                file_url=build_file_url(paper.file_path) if paper.file_path else None,
-                created_at=paper.created_at,
-                updated_at=paper.updated_at,
-                keywords=keywords,
-                authors=authors,
-                category_id=paper.category_id,
-                category_name=category_name,
-                team_id=paper.team_id,
-                team_name=team_name,
-                created_by_id=paper.created_by_id,
-            )
+    next_cursor = None
+    if keyset_mode:
+        papers, next_cursor = keyset_paginate(
+            session,
+            query,
+            sort_columns={
+                PaperOrderBy.CREATED_AT: Paper.created_at,
+                PaperOrderBy.PUBLICATION_DATE: Paper.publication_date,
+            },
+            id_column=Paper.id,
+            order_by=order_by,
+            cursor=cursor,
+            limit=limit,
         )
+        skip = 0
+    else:
+        # 筛选条件走不同索引时返回顺序不同，按 id 排序保证分页稳定（检索时作为相关度的次序）
+        papers = session.exec(
+            query.order_by(col(Paper.id)).offset(skip).limit(limit)
+        ).all()
 
-    # 计算分页信息
-    current_page = (skip // limit) + 1
-    total_pages = (total_count + limit - 1) // limit  # 向上取整
+    # 构建返回数据（批量加载关联信息）
+    results = hydrate_papers(session, papers)
 
     # 返回分页响应
-    return PaginatedPaperResponse(
-        items=results,
-        total=total_count,
-        page=current_page,
-        size=limit,
-        pages=total_pages,
+    return build_page(
+        PaginatedPaperResponse,
+        results,
+        total_count,
+        skip,
+        limit,
+        next_cursor=next_cursor,
     )
 
 
@@ -475,61 +453,7 @@ def read_paper(
     """获取单个论文"""
     paper = check_paper_access(paper_id, current_user, session)
 
-    # 获取关键词
-    keywords = [
-        kw.name
-        for kw in session.exec(
-            select(Keyword).join(PaperKeyword).where(PaperKeyword.paper_id == paper_id)
-        ).all()
-    ]
-
-    # 获取作者
-    authors = [
-        author.name
-        for author in session.exec(
-            select(Author)
-            .join(PaperAuthor)
-            .where(PaperAuthor.paper_id == paper_id)
-            .order_by(PaperAuthor.author_order)  # type: ignore
-        ).all()
-    ]  # 获取分类
-    category_name = None
-    if paper.category_id:
-        category = session.get(Category, paper.category_id)
-        if category:
-            category_name = category.name
-
-    # 获取期刊名称
-    journal_name = None
-    if paper.journal_id:
-        journal = session.get(Journal, paper.journal_id)
-        if journal:
-            journal_name = journal.name  # 获取团队名称
-    team_name = None
-    if paper.team_id:
-        team = session.get(Team, paper.team_id)
-        if team:
-            team_name = team.name
-
-    return PaperRead(
-        id=paper.id if paper.id is not None else 0,
-        title=paper.title,
-        abstract=paper.abstract,
-        publication_date=paper.publication_date,
-        journal_id=paper.journal_id,
-        journal_name=journal_name,
-        doi=paper.doi,
-        file_url=build_file_url(paper.file_path) if paper.file_path else None,
-        created_at=paper.created_at,
-        updated_at=paper.updated_at,
-        keywords=keywords,
-        authors=authors,
-        category_id=paper.category_id,
-        category_name=category_name,
-        team_id=paper.team_id,
-        team_name=team_name,
-        created_by_id=paper.created_by_id,
-    )
+    return hydrate_paper(session, paper)
 
 
 @router.patch("/{paper_id}", response_model=PaperRead)
@@ -541,6 +465,7 @@ def update_paper(
 ):
     """更新论文"""
     paper = check_paper_modify_permission(paper_id, current_user, session)
+    previous_author_ids = paper_author_ids(session, [paper_id])
 
     # 如果要更改团队，检查权限
     if paper_update.team_id is not None:
@@ -600,17 +525,8 @@ def update_paper(
             delete(PaperAuthor).where(col(PaperAuthor.paper_id) == paper_id)
         )
         # 添加新的作者关联
+        author_ids = resolve_names(session, Author, paper_update.author_names)
         for i, name in enumerate(paper_update.author_names):
-            author = session.exec(select(Author).where(Author.name == name)).first()
-            if not author:
-                author = Author(name=name)
-                session.add(author)
-                session.flush()
-
-            assert (
-                author.id is not None
-            ), f"Author '{name}' must have an ID after creation or retrieval."
-
             contribution_ratio = (
                 paper_update.author_contribution_ratios[i]
                 if paper_update.author_contribution_ratios
@@ -626,7 +542,7 @@ def update_paper(
 
             paper_author = PaperAuthor(
                 paper_id=paper_id,
-                author_id=author.id,
+                author_id=author_ids[name],
                 contribution_ratio=contribution_ratio,
                 is_corresponding=is_corresponding,
                 author_order=i + 1,
@@ -639,16 +555,21 @@ def update_paper(
             delete(PaperKeyword).where(col(PaperKeyword.paper_id) == paper_id)
         )
         # 添加新的关键词关联
+        keyword_ids = resolve_names(session, Keyword, paper_update.keyword_names)
         for name in paper_update.keyword_names:
-            keyword = session.exec(select(Keyword).where(Keyword.name == name)).first()
-            if not keyword:
-                keyword = Keyword(name=name)
-                session.add(keyword)
-                session.flush()
-            paper_keyword = PaperKeyword(paper_id=paper_id, keyword_id=keyword.id)
+            paper_keyword = PaperKeyword(paper_id=paper_id, keyword_id=keyword_ids[name])
             session.add(paper_keyword)
 
     paper.updated_at = datetime.utcnow()
+
+    # 作者、贡献比例、期刊、发表日期或团队可能变化，更新工作量台账
+    refresh_paper_workloads(session, [paper_id])
+    # 合作关系只受作者、发表日期和团队影响
+    if paper_update.author_names is not None or (
+        update_data.keys() & {"publication_date", "team_id"}
+    ):
+        refresh_coauthorships(session, [paper_id], previous_author_ids)
+
     session.commit()
     session.refresh(paper)
 
@@ -665,18 +586,15 @@ def delete_paper(
     """删除论文"""
     paper = check_paper_modify_permission(paper_id, current_user, session)
 
-    # 删除文件（如果存在）
-    if paper.file_path:
-        # 构建完整文件路径
-        if os.path.isabs(paper.file_path):
-            full_path = paper.file_path
-        else:
-            full_path = os.path.join(UPLOAD_DIR, paper.file_path)
+    # 释放文件引用（没有其他论文或参考文献使用时删除文件）
+    release_file(session, paper.file_path, PAPERS_DIR)
 
-        if os.path.exists(full_path):
-            os.remove(full_path)  # 删除所有关联
+    # 删除所有关联
+    previous_author_ids = paper_author_ids(session, [paper_id])
     session.execute(delete(PaperAuthor).where(col(PaperAuthor.paper_id) == paper_id))
     session.execute(delete(PaperKeyword).where(col(PaperKeyword.paper_id) == paper_id))
+    refresh_paper_workloads(session, [paper_id])  # 作者关联已删除，清除台账行
+    refresh_coauthorships(session, [paper_id], previous_author_ids)
 
     # 删除论文
     session.delete(paper)
@@ -685,6 +603,19 @@ def delete_paper(
     return {"ok": True}
 
 
+@router.get("/authors/workload")
+def read_author_workload_totals(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    team_id: Optional[int] = None,
+    session: Session = Depends(get_session),
+):
+    """获取所有作者的工作量汇总（按总工作量降序），可按发表日期范围和团队过滤"""
+    return get_author_workload_totals(
+        session, start_date=start_date, end_date=end_date, team_id=team_id
+    )
+
+
 @router.get("/{paper_id}/workload")
 def calculate_paper_workload(paper_id: int, session: Session = Depends(get_session)):
     paper = session.get(Paper, paper_id)
@@ -698,30 +629,17 @@ def calculate_paper_workload(paper_id: int, session: Session = Depends(get_sessi
         if journal:
             journal_grade = journal.grade
 
-    author_links = session.exec(
-        select(PaperAuthor).where(PaperAuthor.paper_id == paper_id)
-    ).all()
-
-    workloads = []
-    for author_link in author_links:
-        # 获取作者信息
-        author = session.get(Author, author_link.author_id)
-        author_name = author.name if author else "Unknown Author"
-
-        workload = calculate_workload(
-            contribution_ratio=author_link.contribution_ratio,
-            journal_grade=journal_grade,
-        )
-        workloads.append(
-            {
-                "author_id": author_link.author_id,
-                "author_name": author_name,
-                "contribution_ratio": author_link.contribution_ratio,
-                "is_corresponding": author_link.is_corresponding,
-                "author_order": author_link.author_order,
-                "workload": workload,
-            }
-        )
+    workloads = [
+        {
+            "author_id": row["author_id"],
+            "author_name": row["author_name"] or "Unknown Author",
+            "contribution_ratio": row["contribution_ratio"],
+            "is_corresponding": row["is_corresponding"],
+            "author_order": row["author_order"],
+            "workload": row["workload"],
+        }
+        for row in get_paper_workloads(session, paper_id=paper_id)
+    ]
 
     return {
         "paper_id": paper_id,
@@ -732,58 +650,41 @@ def calculate_paper_workload(paper_id: int, session: Session = Depends(get_sessi
 
 @router.get("/authors/workload/by-name")
 def calculate_author_workload_by_name(
-    author_name: str, session: Session = Depends(get_session)
+    author_name: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    team_id: Optional[int] = None,
+    session: Session = Depends(get_session),
 ):
-    """通过作者名字计算其所有论文工作量"""
+    """通过作者名字计算其所有论文工作量，可按发表日期范围和团队过滤"""
     # 查找作者
     author = session.exec(select(Author).where(Author.name == author_name)).first()
 
     if not author:
         raise HTTPException(status_code=404, detail=f"Author '{author_name}' not found")
 
-    # 获取作者的所有论文关联
-    author_papers = session.exec(
-        select(PaperAuthor).where(PaperAuthor.author_id == author.id)
-    ).all()
-
-    # 计算每篇论文的工作量
-    paper_workloads = []
-    for paper_link in author_papers:
-        paper = session.get(Paper, paper_link.paper_id)
-        if paper:
-            # 获取期刊等级
-            journal_grade = "OTHER"
-            journal_name = None
-            if paper.journal_id:
-                journal = session.get(Journal, paper.journal_id)
-                if journal:
-                    journal_grade = journal.grade
-                    journal_name = journal.name
-
-            workload = calculate_workload(
-                contribution_ratio=paper_link.contribution_ratio,
-                journal_grade=journal_grade,
-            )
-
-            paper_workloads.append(
-                {
-                    "paper_id": paper.id,
-                    "paper_title": paper.title,
-                    "contribution_ratio": paper_link.contribution_ratio,
-                    "is_corresponding": paper_link.is_corresponding,
-                    "author_order": paper_link.author_order,
-                    "workload": workload,
-                    "publication_date": paper.publication_date,
-                    "journal_id": paper.journal_id,
-                    "journal_name": journal_name,
-                    "journal_grade": journal_grade,
-                }
-            )
-
-    # 按发表日期排序
-    paper_workloads.sort(
-        key=lambda x: x["publication_date"] if x["publication_date"] else datetime.min
-    )
+    # 一次查询获取每篇论文的工作量（按发表日期排序）
+    paper_workloads = [
+        {
+            "paper_id": row["paper_id"],
+            "paper_title": row["paper_title"],
+            "contribution_ratio": row["contribution_ratio"],
+            "is_corresponding": row["is_corresponding"],
+            "author_order": row["author_order"],
+            "workload": row["workload"],
+            "publication_date": row["publication_date"],
+            "journal_id": row["journal_id"],
+            "journal_name": row["journal_name"],
+            "journal_grade": row["journal_grade"],
+        }
+        for row in get_paper_workloads(
+            session,
+            author_id=author.id,
+            start_date=start_date,
+            end_date=end_date,
+            team_id=team_id,
+        )
+    ]
 
     total_workload = sum(pw["workload"] for pw in paper_workloads)
 
@@ -798,12 +699,15 @@ def calculate_author_workload_by_name(
 @router.get("/{paper_id}/download")
 async def download_paper_by_id(
     paper_id: int,
-    session: Session = Depends(get_session),
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user),
 ):
     """通过ID下载论文PDF文件"""
     # 检查论文是否存在（所有论文都是公开的）
-    paper = check_paper_access(paper_id, current_user, session)
+    paper = await session.run_sync(
+        lambda sync_session: check_paper_access(paper_id, current_user, sync_session)
+    )
 
     # 检查文件是否存在
     if not paper.file_path:
@@ -812,29 +716,31 @@ async def download_paper_by_id(
         )
 
     # 构建完整文件路径
-    if os.path.isabs(paper.file_path):
-        full_path = paper.file_path
-    else:
-        full_path = os.path.join(UPLOAD_DIR, paper.file_path)
+    full_path = resolve_file_path(paper.file_path, PAPERS_DIR)
 
-    if not os.path.exists(full_path):
+    if not full_path.is_file():
         raise HTTPException(status_code=404, detail="PDF file not found for this paper")
 
     # 构建文件名
     filename = f"{paper.title}.pdf"
 
-    return FileResponse(full_path, filename=filename, media_type="application/pdf")
+    return file_response(
+        full_path, request.headers, filename=filename, media_type="application/pdf"
+    )
 
 
 @router.get("/download/by-title")
 async def download_paper_by_title(
     title: str,
-    session: Session = Depends(get_session),
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user),
 ):
     """通过标题下载论文PDF文件"""
     # 查找论文
-    paper_from_title = session.exec(select(Paper).where(Paper.title == title)).first()
+    paper_from_title = (
+        await session.exec(select(Paper).where(Paper.title == title))
+    ).first()
 
     if not paper_from_title:
         raise HTTPException(
@@ -851,8 +757,9 @@ async def download_paper_by_title(
     # 检查论文是否存在（所有论文都是公开的）
     # Now paper_from_title.id is known to be an int.
     # The variable 'paper' is used by the rest of the function.
-    paper = check_paper_access(
-        paper_from_title.id, current_user, session
+    paper_id = paper_from_title.id
+    paper = await session.run_sync(
+        lambda sync_session: check_paper_access(paper_id, current_user, sync_session)
     )  # 检查文件是否存在
     if not paper.file_path:
         raise HTTPException(
@@ -860,18 +767,17 @@ async def download_paper_by_title(
         )
 
     # 构建完整文件路径
-    if os.path.isabs(paper.file_path):
-        full_path = paper.file_path
-    else:
-        full_path = os.path.join(UPLOAD_DIR, paper.file_path)
+    full_path = resolve_file_path(paper.file_path, PAPERS_DIR)
 
-    if not os.path.exists(full_path):
+    if not full_path.is_file():
         raise HTTPException(status_code=404, detail="PDF file not found for this paper")
 
     # 构建文件名
     filename = f"{paper.title}.pdf"
 
-    return FileResponse(full_path, filename=filename, media_type="application/pdf")
+    return file_response(
+        full_path, request.headers, filename=filename, media_type="application/pdf"
+    )
 
 
 @router.get("/authors/collaboration-network")
@@ -885,50 +791,39 @@ def get_author_collaboration_network(
     if not author:
         raise HTTPException(status_code=404, detail=f"Author '{author_name}' not found")
 
-    # 获取作者参与的所有论文
-    author_papers = session.exec(
-        select(PaperAuthor).where(PaperAuthor.author_id == author.id)
+    # 一次查询获取该作者所有论文中的其他作者
+    own_link = aliased(PaperAuthor)
+    rows = session.exec(
+        select(PaperAuthor, Author)
+        .join(Author, col(Author.id) == PaperAuthor.author_id)
+        .join(own_link, col(own_link.paper_id) == PaperAuthor.paper_id)
+        .where(
+            own_link.author_id == author.id,
+            PaperAuthor.author_id != author.id,  # 排除作者本人
+        )
+        .order_by(col(PaperAuthor.paper_id), col(PaperAuthor.author_id))
     ).all()
 
     # 用于存储合作关系的字典
     collaborations = {}
 
-    # 遍历每篇论文，查找合作者
-    for paper_link in author_papers:
-        # 获取这篇论文的所有作者
-        coauthors = session.exec(
-            select(PaperAuthor, Author)
-            .join(Author)
-            .where(
-                PaperAuthor.paper_id == paper_link.paper_id,
-                PaperAuthor.author_id != author.id,  # 排除作者本人
-            )
-        ).all()
-
-        # 统计合作次数
-        for coauthor_link, coauthor in coauthors:
-            if coauthor.name not in collaborations:
-                collaborations[coauthor.name] = {
-                    "author_id": coauthor.id,
-                    "name": coauthor.name,
-                    "collaboration_count": 1,
-                    "papers": [
-                        {
-                            "paper_id": paper_link.paper_id,
-                            "author_order": coauthor_link.author_order,
-                            "is_corresponding": coauthor_link.is_corresponding,
-                        }
-                    ],
-                }
-            else:
-                collaborations[coauthor.name]["collaboration_count"] += 1
-                collaborations[coauthor.name]["papers"].append(
-                    {
-                        "paper_id": paper_link.paper_id,
-                        "author_order": coauthor_link.author_order,
-                        "is_corresponding": coauthor_link.is_corresponding,
-                    }
-                )
+    # 统计合作次数
+    for coauthor_link, coauthor in rows:
+        if coauthor.name not in collaborations:
+            collaborations[coauthor.name] = {
+                "author_id": coauthor.id,
+                "name": coauthor.name,
+                "collaboration_count": 0,
+                "papers": [],
+            }
+        collaborations[coauthor.name]["collaboration_count"] += 1
+        collaborations[coauthor.name]["papers"].append(
+            {
+                "paper_id": coauthor_link.paper_id,
+                "author_order": coauthor_link.author_order,
+                "is_corresponding": coauthor_link.is_corresponding,
+            }
+        )
 
     # 将合作者列表按合作次数降序排序
     sorted_collaborators = sorted(
@@ -942,21 +837,137 @@ def get_author_collaboration_network(
     }
 
 
-@router.get("/export/excel")
-def export_papers_excel(
-    title: Optional[str] = None,
-    category_id: Optional[int] = None,
-    author_name: Optional[str] = None,
-    keyword: Optional[str] = None,
-    journal_id: Optional[int] = None,
-    start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None,
+def get_author_or_404(author_id: int, session: Session) -> Author:
+    author = session.get(Author, author_id)
+    if not author:
+        raise HTTPException(status_code=404, detail="Author not found")
+    return author
+
+
+@router.get("/authors/collaboration-graph")
+def read_team_collaboration_graph(
+    team_id: int,
+    min_papers: int = 1,
+    session: Session = Depends(get_session),
+):
+    """获取团队的完整合作图（节点为团队论文的作者，边为合作关系）"""
+    if not session.get(Team, team_id):
+        raise HTTPException(status_code=404, detail=f"Team {team_id} not found")
+    return get_team_collaboration_graph(session, team_id, min_papers=min_papers)
+
+
+@router.get("/authors/collaboration-path")
+def read_collaboration_path(
+    source_id: int,
+    target_id: int,
+    max_hops: int = 6,
     team_id: Optional[int] = None,
     session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user),
 ):
-    """导出论文列表为Excel格式"""
-    # 使用与read_papers相同的查询逻辑
+    """查找两位作者之间最短的合作路径"""
+    if not 1 <= max_hops <= MAX_PATH_HOPS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"max_hops must be between 1 and {MAX_PATH_HOPS}",
+        )
+    get_author_or_404(source_id, session)
+    get_author_or_404(target_id, session)
+
+    path = find_collaboration_path(
+        session, source_id, target_id, max_hops=max_hops, team_id=team_id
+    )
+    if path is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No collaboration path within {max_hops} hops",
+        )
+    return {"hops": len(path) - 1, "path": path}
+
+
+@router.get("/authors/collaboration-analytics")
+def read_collaboration_analytics(
+    team_id: Optional[int] = None,
+    limit: int = 100,
+    session: Session = Depends(get_session),
+):
+    """
+    获取合作网络分析结果：连通分量、社区、模块度，以及每位作者的度中心性、
+    介数中心性、所属分量和社区（按介数中心性降序，limit 为 0 时返回全部）
+    """
+    if team_id is not None and not session.get(Team, team_id):
+        raise HTTPException(status_code=404, detail=f"Team {team_id} not found")
+    if limit < 0:
+        raise HTTPException(status_code=400, detail="limit must not be negative")
+    return get_collaboration_analytics(session, team_id=team_id, limit=limit)
+
+
+@router.get("/authors/{author_id}/collaborators")
+def read_top_collaborators(
+    author_id: int,
+    limit: int = 10,
+    team_id: Optional[int] = None,
+    session: Session = Depends(get_session),
+):
+    """获取作者合作论文最多的前 N 位合作者"""
+    author = get_author_or_404(author_id, session)
+    return {
+        "author": {"id": author.id, "name": author.name},
+        "collaborators": get_top_collaborators(
+            session, author_id, limit=limit, team_id=team_id
+        ),
+    }
+
+
+@router.get("/authors/{author_id}/neighborhood")
+def read_author_neighborhood(
+    author_id: int,
+    hops: int = 2,
+    max_nodes: int = 500,
+    team_id: Optional[int] = None,
+    session: Session = Depends(get_session),
+):
+    """获取作者 k 跳以内的合作网络（节点带跳数，边为节点之间的合作关系）"""
+    if not 1 <= hops <= MAX_NEIGHBORHOOD_HOPS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"hops must be between 1 and {MAX_NEIGHBORHOOD_HOPS}",
+        )
+    if max_nodes < 1:
+        raise HTTPException(status_code=400, detail="max_nodes must be positive")
+    get_author_or_404(author_id, session)
+    return get_author_neighborhood(
+        session, author_id, hops=hops, max_nodes=max_nodes, team_id=team_id
+    )
+
+
+PAPER_EXPORT_HEADERS = [
+    "ID",
+    "Title",
+    "Abstract",
+    "Authors",
+    "Keywords",
+    "Category",
+    "Journal",
+    "Publication Date",
+    "DOI",
+    "Team",
+    "Created At",
+    "Has File",
+]
+
+
+def build_paper_export_query(
+    session: Session,
+    title: Optional[str],
+    category_id: Optional[int],
+    author_name: Optional[str],
+    keyword: Optional[str],
+    journal_id: Optional[int],
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    team_id: Optional[int],
+):
+    """构建导出查询（与 read_papers 的过滤逻辑一致）"""
     query = select(Paper)
 
     # 根据team_id进行过滤
@@ -968,7 +979,7 @@ def export_papers_excel(
 
     # 应用其他过滤条件
     if title:
-        query = query.where(Paper.title.contains(title))  # type: ignore
+        query = query.where(Paper.title.icontains(title))  # type: ignore
     if category_id:
         category_ids = get_category_and_subcategories(session, category_id)
         query = query.where(Paper.category_id.in_(category_ids))  # type: ignore
@@ -986,103 +997,157 @@ def export_papers_excel(
         query = query.where(
             (Paper.publication_date != None) & (Paper.publication_date <= end_date)  # type: ignore
         )
-
-    papers = session.exec(query).all()
-
-    # 准备Excel数据
-    excel_data = []
-    for paper in papers:
-        # 获取相关信息
-        keywords = [
-            kw.name
-            for kw in session.exec(
-                select(Keyword)
-                .join(PaperKeyword)
-                .where(PaperKeyword.paper_id == paper.id)
-            ).all()
-        ]
-
-        authors = [
-            author.name
-            for author in session.exec(
-                select(Author)
-                .join(PaperAuthor)
-                .where(PaperAuthor.paper_id == paper.id)
-                .order_by(PaperAuthor.author_order)  # type: ignore
-            ).all()
-        ]
-
-        category_name = None
-        if paper.category_id:
-            category = session.get(Category, paper.category_id)
-            if category:
-                category_name = category.name
-
-        journal_name = None
-        if paper.journal_id:
-            journal = session.get(Journal, paper.journal_id)
-            if journal:
-                journal_name = journal.name
-
-        team_name = None
-        if paper.team_id:
-            team = session.get(Team, paper.team_id)
-            if team:
-                team_name = team.name
-
-        excel_data.append(
-            {
-                "ID": paper.id,
-                "Title": paper.title,
-                "Abstract": paper.abstract,
-                "Authors": "; ".join(authors),
-                "Keywords": "; ".join(keywords),
-                "Category": category_name or "",
-                "Journal": journal_name or "",
-                "Publication Date": (
+    return query
+
+
+def iter_paper_export_rows(session: Session, query) -> Iterator[List]:
+    """分批读取论文并逐行产出导出数据"""
+    for papers in iter_batches(session, query, Paper.id):
+        for paper, paper_read in zip(papers, hydrate_papers(session, papers)):
+            yield [
+                paper.id,
+                paper.title,
+                paper.abstract,
+                "; ".join(paper_read.authors),
+                "; ".join(paper_read.keywords),
+                paper_read.category_name or "",
+                paper_read.journal_name or "",
+                (
                     paper.publication_date.strftime("%Y-%m-%d")
                     if paper.publication_date
                     else ""
                 ),
-                "DOI": paper.doi or "",
-                "Team": team_name or "",
-                "Created At": paper.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                "Has File": (
+                paper.doi or "",
+                paper_read.team_name or "",
+                paper.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+                (
                     "Yes"
                     if paper.file_path and os.path.exists(paper.file_path)
                     else "No"
                 ),
-            }
-        )
+            ]
+
+
+@router.get("/export/excel")
+def export_papers_excel(
+    title: Optional[str] = None,
+    category_id: Optional[int] = None,
+    author_name: Optional[str] = None,
+    keyword: Optional[str] = None,
+    journal_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    team_id: Optional[int] = None,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    """导出论文列表为Excel格式"""
+    query = build_paper_export_query(
+        session, title, category_id, author_name, keyword,
+        journal_id, start_date, end_date, team_id,
+    )
 
-    # 创建Excel文件
-    df = pd.DataFrame(excel_data)
+    # 分批读取并逐行写入，内存占用不随论文数量增长
+    temp_path = write_xlsx(PAPER_EXPORT_HEADERS, iter_paper_export_rows(session, query))
 
     # 生成文件名
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"papers_export_{timestamp}.xlsx"
 
-    # 创建临时文件
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as temp_file:
-        df.to_excel(temp_file.name, index=False, engine="openpyxl")
-        temp_path = temp_file.name
-
     return FileResponse(
         temp_path,
         filename=filename,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        media_type=XLSX_MEDIA_TYPE,
         headers={"Content-Disposition": f"attachment; filename={filename}"},
+        background=BackgroundTask(os.remove, temp_path),  # 发送完成后删除临时文件
     )
 
 
-@router.get("/authors/workload/export/excel")
-async def export_author_workload_to_excel(
+@router.post("/export/excel", response_model=JobRead, status_code=202)
+def submit_paper_export_job(
+    title: Optional[str] = None,
+    category_id: Optional[int] = None,
     author_name: Optional[str] = None,
+    keyword: Optional[str] = None,
+    journal_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    team_id: Optional[int] = None,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    """导出作者工作量信息为Excel文件"""
+    """提交论文 Excel 导出任务（参数同 GET），完成后从 /api/jobs/{job_id}/download 下载"""
+    filters = PaperExportFilters(
+        title=title,
+        category_id=category_id,
+        author_name=author_name,
+        keyword=keyword,
+        journal_id=journal_id,
+        start_date=start_date,
+        end_date=end_date,
+        team_id=team_id,
+    )
+    # 提交前检查过滤条件（如团队是否存在）
+    build_paper_export_query(session, **filters.model_dump())
+
+    job = enqueue_job(session, "paper_export_excel", current_user.id, filters)
+    session.commit()
+    return job_read(job)
+
+
+@job_handler("paper_export_excel")
+def run_paper_export_job(session: Session, job: Job, progress: JobProgress) -> JobResult:
+    filters = PaperExportFilters.model_validate_json(job.params)
+    query = build_paper_export_query(session, **filters.model_dump())
+    total = count_query(session, query, Paper.id)
+    temp_path = write_xlsx(
+        PAPER_EXPORT_HEADERS,
+        progress.track(iter_paper_export_rows(session, query), total),
+    )
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return JobResult(temp_path, f"papers_export_{timestamp}.xlsx", XLSX_MEDIA_TYPE)
+
+
+@router.get("/export/csv")
+def export_papers_csv(
+    title: Optional[str] = None,
+    category_id: Optional[int] = None,
+    author_name: Optional[str] = None,
+    keyword: Optional[str] = None,
+    journal_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    team_id: Optional[int] = None,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    """导出论文列表为CSV格式（流式响应，边查询边发送）"""
+    query = build_paper_export_query(
+        session, title, category_id, author_name, keyword,
+        journal_id, start_date, end_date, team_id,
+    )
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"papers_export_{timestamp}.csv"
+
+    return StreamingResponse(
+        stream_csv(
+            PAPER_EXPORT_HEADERS,
+            lambda export_session: iter_paper_export_rows(export_session, query),
+        ),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
 
+def write_author_workload_excel(
+    session: Session,
+    author_name: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    team_id: Optional[int] = None,
+) -> Tuple[str, str]:
+    """生成作者工作量 Excel 临时文件，返回 (文件路径, 下载文件名)"""
     if author_name:
         # 导出指定作者的工作量信息
         # 查找作者
@@ -1092,47 +1157,33 @@ async def export_author_workload_to_excel(
                 status_code=404, detail=f"Author '{author_name}' not found"
             )
 
-        # 获取作者的所有论文关联
-        author_papers = session.exec(
-            select(PaperAuthor).where(PaperAuthor.author_id == author.id)
-        ).all()
-
         # 收集数据
         data = []
-        for paper_link in author_papers:
-            paper = session.get(Paper, paper_link.paper_id)
-            if paper:
-                # 获取期刊等级
-                journal_grade = "OTHER"
-                journal_name = None
-                if paper.journal_id:
-                    journal = session.get(Journal, paper.journal_id)
-                    if journal:
-                        journal_grade = journal.grade
-                        journal_name = journal.name
-
-                workload = calculate_workload(
-                    contribution_ratio=paper_link.contribution_ratio,
-                    journal_grade=journal_grade,
-                )
-
-                data.append(
-                    {
-                        "作者姓名": author.name,
-                        "论文标题": paper.title,
-                        "期刊名称": journal_name or "未指定",
-                        "期刊等级": journal_grade,
-                        "发表日期": (
-                            paper.publication_date.strftime("%Y-%m-%d")
-                            if paper.publication_date
-                            else "未指定"
-                        ),
-                        "贡献比例": paper_link.contribution_ratio,
-                        "是否通讯作者": "是" if paper_link.is_corresponding else "否",
-                        "作者顺序": paper_link.author_order,
-                        "工作量": workload,
-                    }
-                )
+        for row in get_paper_workloads(
+            session,
+            author_id=author.id,
+            start_date=start_date,
+            end_date=end_date,
+            team_id=team_id,
+            sort_by_date=False,
+        ):
+            data.append(
+                {
+                    "作者姓名": author.name,
+                    "论文标题": row["paper_title"],
+                    "期刊名称": row["journal_name"] or "未指定",
+                    "期刊等级": row["journal_grade"],
+                    "发表日期": (
+                        row["publication_date"].strftime("%Y-%m-%d")
+                        if row["publication_date"]
+                        else "未指定"
+                    ),
+                    "贡献比例": row["contribution_ratio"],
+                    "是否通讯作者": "是" if row["is_corresponding"] else "否",
+                    "作者顺序": row["author_order"],
+                    "工作量": row["workload"],
+                }
+            )
 
         # 计算总工作量
         total_workload = sum(item["工作量"] for item in data)
@@ -1155,55 +1206,23 @@ async def export_author_workload_to_excel(
 
         filename_prefix = f"{author_name}_workload"
     else:
-        # 导出所有作者的工作量汇总信息
-        # 获取所有作者
-        authors = session.exec(select(Author)).all()
-
-        data = []
-        for author in authors:
-            # 获取作者的所有论文关联
-            author_papers = session.exec(
-                select(PaperAuthor).where(PaperAuthor.author_id == author.id)
-            ).all()
-
-            total_workload = 0
-            paper_count = 0
-            corresponding_count = 0
-
-            for paper_link in author_papers:
-                paper = session.get(Paper, paper_link.paper_id)
-                if paper:
-                    # 获取期刊等级
-                    journal_grade = "OTHER"
-                    if paper.journal_id:
-                        journal = session.get(Journal, paper.journal_id)
-                        if journal:
-                            journal_grade = journal.grade
-
-                    workload = calculate_workload(
-                        contribution_ratio=paper_link.contribution_ratio,
-                        journal_grade=journal_grade,
-                    )
-
-                    total_workload += workload
-                    paper_count += 1
-                    if paper_link.is_corresponding:
-                        corresponding_count += 1
-
-            data.append(
-                {
-                    "作者姓名": author.name,
-                    "论文总数": paper_count,
-                    "通讯作者论文数": corresponding_count,
-                    "总工作量": total_workload,
-                    "平均工作量": (
-                        round(total_workload / paper_count, 2) if paper_count > 0 else 0
-                    ),
-                }
+        # 导出所有作者的工作量汇总信息（一次 GROUP BY 查询，已按总工作量降序）
+        data = [
+            {
+                "作者姓名": totals["author_name"],
+                "论文总数": totals["paper_count"],
+                "通讯作者论文数": totals["corresponding_count"],
+                "总工作量": totals["total_workload"],
+                "平均工作量": (
+                    round(totals["total_workload"] / totals["paper_count"], 2)
+                    if totals["paper_count"] > 0
+                    else 0
+                ),
+            }
+            for totals in get_author_workload_totals(
+                session, start_date=start_date, end_date=end_date, team_id=team_id
             )
-
-        # 按总工作量降序排序
-        data.sort(key=lambda x: x["总工作量"], reverse=True)
+        ]
 
         filename_prefix = "all_authors_workload_summary"
 
@@ -1236,10 +1255,97 @@ async def export_author_workload_to_excel(
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{filename_prefix}_{timestamp}.xlsx"
 
-        # 返回文件
-        return FileResponse(
-            path=tmp_file.name,
-            filename=filename,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            background=None,  # 不在后台删除，因为我们需要文件被下载后才删除
-        )
+        return tmp_file.name, filename
+
+
+@router.get("/authors/workload/export/excel")
+def export_author_workload_to_excel(
+    author_name: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    team_id: Optional[int] = None,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    """导出作者工作量信息为Excel文件"""
+    path, filename = write_author_workload_excel(
+        session, author_name, start_date, end_date, team_id
+    )
+
+    # 返回文件
+    return FileResponse(
+        path=path,
+        filename=filename,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        background=None,  # 不在后台删除，因为我们需要文件被下载后才删除
+    )
+
+
+@router.post("/authors/workload/export/excel", response_model=JobRead, status_code=202)
+def submit_author_workload_export_job(
+    author_name: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    team_id: Optional[int] = None,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    """提交作者工作量 Excel 导出任务（参数同 GET），完成后从 /api/jobs/{job_id}/download 下载"""
+    if author_name and not session.exec(
+        select(Author.id).where(Author.name == author_name)
+    ).first():
+        raise HTTPException(status_code=404, detail=f"Author '{author_name}' not found")
+
+    filters = WorkloadExportFilters(
+        author_name=author_name, start_date=start_date, end_date=end_date, team_id=team_id
+    )
+    job = enqueue_job(session, "workload_export_excel", current_user.id, filters)
+    session.commit()
+    return job_read(job)
+
+
+@job_handler("workload_export_excel")
+def run_author_workload_export_job(
+    session: Session, job: Job, progress: JobProgress
+) -> JobResult:
+    filters = WorkloadExportFilters.model_validate_json(job.params)
+    path, filename = write_author_workload_excel(session, **filters.model_dump())
+    return JobResult(path, filename, XLSX_MEDIA_TYPE)
+
+
+@router.post("/authors/workload/rebuild", response_model=JobRead, status_code=202)
+def submit_workload_rebuild_job(
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    """提交重建作者工作量台账的任务（仅管理员）"""
+    check_admin_permission(current_user)
+    job = enqueue_job(session, "workload_rebuild", current_user.id)
+    session.commit()
+    return job_read(job)
+
+
+@job_handler("workload_rebuild")
+def run_workload_rebuild_job(session: Session, job: Job, progress: JobProgress) -> None:
+    rebuild_workload_ledger(session)
+    session.commit()
+
+
+@router.post("/authors/coauthorships/rebuild", response_model=JobRead, status_code=202)
+def submit_coauthorship_rebuild_job(
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    """提交重建作者合作关系的任务（仅管理员）"""
+    check_admin_permission(current_user)
+    job = enqueue_job(session, "coauthorship_rebuild", current_user.id)
+    session.commit()
+    return job_read(job)
+
+
+@job_handler("coauthorship_rebuild")
+def run_coauthorship_rebuild_job(
+    session: Session, job: Job, progress: JobProgress
+) -> None:
+    rebuild_coauthorships(session)
+    session.commit()
@@ -1,15 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Request, status, UploadFile, File
 from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
 from sqlmodel import Session, col, select, delete
-from typing import List, Optional
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Iterator, List, Optional
 from datetime import datetime
 import os
-import shutil
-import tempfile
-import pandas as pd
-import uuid
 
-from app.core.database import get_session
+from app.core.database import get_async_session, get_session
 from app.core.config_dev import (
     get_team_upload_dir,
     build_file_url,
@@ -21,17 +19,30 @@ from app.models.reference import (
     ReferenceRead,
     ReferenceUpdate,
     ReferenceCategory,
+    ReferenceCategoryClosure,
     ReferenceKeyword,
-    ReferenceCategoryRead,
     PaginatedReferenceResponse,
+    ReferenceOrderBy,
+    ReferenceExportFilters,
 )
 from app.models.keyword import Keyword
 from app.models.user import User
-from app.models.team import TeamUser, TeamRole
+from app.models.team import TeamRole
 from app.models.journal import Journal
+from app.models.job import Job, JobRead
 from app.api.user import get_current_user
 from app.api.team import check_team_member
 from app.models.team import Team
+from app.services.auth_cache import user_team_ids
+from app.services.pagination import build_page, count_query, keyset_paginate
+from app.services.search import apply_content_search, apply_search, reference_fts
+from app.services.category_tree import descendant_ids
+from app.services.blobs import release_file, resolve_file_path, store_upload
+from app.services.file_serving import file_response
+from app.services.text_extraction import queue_text_extraction
+from app.services.export import XLSX_MEDIA_TYPE, iter_batches, write_xlsx
+from app.services.hydration import hydrate_reference, hydrate_references, load_names
+from app.services.jobs import JobProgress, JobResult, enqueue_job, job_handler, job_read
 
 router = APIRouter()
 
@@ -70,19 +81,8 @@ def get_or_create_keywords(session: Session, keyword_names: List[str]) -> List[K
 def get_reference_category_and_subcategories(
     session: Session, category_id: int
 ) -> List[int]:
-    """递归获取参考文献分类及其所有子分类的ID列表"""
-    from app.models.reference import ReferenceCategory
-
-    result = [category_id]
-    children = session.exec(
-        select(ReferenceCategory).where(ReferenceCategory.parent_id == category_id)
-    ).all()
-
-    for child in children:
-        assert child.id is not None, "Child category ID should not be None"
-        result.extend(get_reference_category_and_subcategories(session, child.id))
-
-    return result
+    """获取参考文献分类及其所有子分类的ID列表"""
+    return descendant_ids(session, ReferenceCategoryClosure, category_id)
 
 
 @router.post("/", response_model=ReferenceRead)
@@ -151,7 +151,7 @@ def create_reference(
     session.refresh(db_reference)
 
     # 构建返回数据
-    return get_reference_read(db_reference, session)
+    return hydrate_reference(session, db_reference)
 
 
 @router.get("/", response_model=PaginatedReferenceResponse)
@@ -164,10 +164,20 @@ def read_references(
     journal_id: Optional[int] = None,
     publication_year: Optional[int] = None,
     title: Optional[str] = None,
+    q: Optional[str] = None,
+    content: Optional[str] = None,
+    order_by: Optional[ReferenceOrderBy] = None,
+    cursor: Optional[str] = None,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    """获取参考文献列表"""
+    """获取参考文献列表
+
+    q 在标题和作者中进行全文检索，偏移分页时按相关度排序。
+    content 在上传的 PDF 正文中检索，只返回文本已提取完成且包含全部检索词的记录。
+    默认使用 skip/limit 偏移分页；指定 order_by 或 cursor 时切换为游标分页，
+    按 (排序字段, id) 降序返回，并在响应中给出 next_cursor。
+    """
     # 基础查询
     query = select(ReferencePaper)
 
@@ -177,15 +187,12 @@ def read_references(
         query = query.where(ReferencePaper.team_id == team_id)
     else:
         # 获取用户所在的所有团队ID
-        user_teams = session.exec(
-            select(TeamUser).where(TeamUser.user_id == current_user.id)
-        ).all()
-        team_ids = [0] + [tu.team_id for tu in user_teams]  # 包括公开的参考文献
+        team_ids = [0] + user_team_ids(session, current_user)  # 包括公开的参考文献
         query = query.where(ReferencePaper.team_id.in_(team_ids))  # type: ignore
 
     # 应用其他过滤条件
     if title:
-        query = query.where(ReferencePaper.title.contains(title))  # type: ignore
+        query = query.where(ReferencePaper.title.icontains(title))  # type: ignore
     if category_id:
         # 获取指定分类及其所有子分类的ID列表
         category_ids = get_reference_category_and_subcategories(session, category_id)
@@ -198,27 +205,55 @@ def read_references(
         query = query.where(ReferencePaper.journal_id == journal_id)
     if publication_year:
         query = query.where(ReferencePaper.publication_year == publication_year)
+    keyset_mode = order_by is not None or bool(cursor)
+    if q:
+        query = apply_search(
+            query,
+            reference_fts,
+            ReferencePaper.id,
+            [ReferencePaper.title, ReferencePaper.authors],
+            q,
+            rank=not keyset_mode,
+        )
+    if content:
+        query = apply_content_search(query, ReferencePaper.file_path, content)
 
     # 计算总数量（在应用 offset/limit 之前）
-    total_count = len(session.exec(query).all())
+    total_count = count_query(session, query, ReferencePaper.id)
 
     # 执行分页查询
-    references = session.exec(query.offset(skip).limit(limit)).all()
+    next_cursor = None
+    if keyset_mode:
+        references, next_cursor = keyset_paginate(
+            session,
+            query,
+            sort_columns={
+                ReferenceOrderBy.CREATED_AT: ReferencePaper.created_at,
+                ReferenceOrderBy.PUBLICATION_YEAR: ReferencePaper.publication_year,
+            },
+            id_column=ReferencePaper.id,
+            order_by=order_by,
+            cursor=cursor,
+            limit=limit,
+        )
+        skip = 0
+    else:
+        # 筛选条件走不同索引时返回顺序不同，按 id 排序保证分页稳定（检索时作为相关度的次序）
+        references = session.exec(
+            query.order_by(col(ReferencePaper.id)).offset(skip).limit(limit)
+        ).all()
 
     # 构建返回数据
-    results = [get_reference_read(ref, session) for ref in references]
-
-    # 计算分页信息
-    current_page = (skip // limit) + 1
-    total_pages = (total_count + limit - 1) // limit  # 向上取整
+    results = hydrate_references(session, references)
 
     # 返回分页响应
-    return PaginatedReferenceResponse(
-        items=results,
-        total=total_count,
-        page=current_page,
-        size=limit,
-        pages=total_pages,
+    return build_page(
+        PaginatedReferenceResponse,
+        results,
+        total_count,
+        skip,
+        limit,
+        next_cursor=next_cursor,
     )
 
 
@@ -240,7 +275,7 @@ def read_reference(
     # 检查用户是否有权限访问
     check_team_member(reference.team_id, current_user, session)
 
-    return get_reference_read(reference, session)
+    return hydrate_reference(session, reference)
 
 
 @router.patch("/{reference_id}", response_model=ReferenceRead)
@@ -259,13 +294,7 @@ def update_reference(
         raise HTTPException(status_code=400, detail="Reference has no associated team")
 
     # 检查用户是否有权限修改
-    check_team_member(db_reference.team_id, current_user, session)
-    team_user = session.exec(
-        select(TeamUser).where(
-            TeamUser.team_id == db_reference.team_id,
-            TeamUser.user_id == current_user.id,
-        )
-    ).first()
+    team_user = check_team_member(db_reference.team_id, current_user, session)
 
     # 只有创建者和团队管理员可以修改
     if db_reference.created_by_id != current_user.id and not (
@@ -330,7 +359,7 @@ def update_reference(
     session.commit()
     session.refresh(db_reference)
 
-    return get_reference_read(db_reference, session)
+    return hydrate_reference(session, db_reference)
 
 
 @router.delete("/{reference_id}")
@@ -349,12 +378,7 @@ def delete_reference(
         raise HTTPException(status_code=400, detail="Reference has no associated team")
 
     # 检查用户是否有权限删除
-    check_team_member(reference.team_id, current_user, session)
-    team_user = session.exec(
-        select(TeamUser).where(
-            TeamUser.team_id == reference.team_id, TeamUser.user_id == current_user.id
-        )
-    ).first()
+    team_user = check_team_member(reference.team_id, current_user, session)
 
     # 只有创建者和团队管理员可以删除
     if reference.created_by_id != current_user.id and not (
@@ -365,20 +389,8 @@ def delete_reference(
             detail="Only the creator or team administrators can delete this reference",
         )
 
-    # 删除文件（如果存在）
-    if reference.file_path:
-        # 构建完整文件路径
-        if os.path.isabs(reference.file_path):
-            full_path = reference.file_path
-        else:
-            # 相对路径需要构建完整路径
-            full_path = (
-                get_team_upload_dir(reference.team_id)
-                / reference.file_path.split("/")[-1]
-            )
-
-        if os.path.exists(full_path):
-            os.remove(full_path)
+    # 释放文件引用（没有其他论文或参考文献使用时删除文件）
+    release_file(session, reference.file_path, get_team_upload_dir(reference.team_id))
 
     # 删除关联的关键词
     session.execute(
@@ -392,119 +404,52 @@ def delete_reference(
     return {"ok": True}
 
 
-def get_reference_read(reference: ReferencePaper, session: Session) -> ReferenceRead:
-    """构建参考文献返回数据"""
-    if reference.id is None:
-        raise HTTPException(status_code=500, detail="Reference ID is missing")
-
-    # 获取关键词
-    keywords = [
-        kw.name
-        for kw in session.exec(
-            select(Keyword)
-            .join(ReferenceKeyword)
-            .where(ReferenceKeyword.reference_id == reference.id)
-        ).all()
-    ]  # 获取分类信息
-    category_info = None
-    if reference.category_id:
-        category = session.get(ReferenceCategory, reference.category_id)
-        if category:
-            category_info = ReferenceCategoryRead.from_orm(category)
-
-    # 获取期刊信息
-    journal_name = None
-    if reference.journal_id:
-        journal = session.get(Journal, reference.journal_id)
-        if journal:
-            journal_name = journal.name
-
-    return ReferenceRead(
-        id=reference.id,
-        title=reference.title,
-        authors=reference.authors,
-        doi=reference.doi,
-        file_url=build_file_url(reference.file_path) if reference.file_path else None,
-        journal_id=reference.journal_id,
-        journal_name=journal_name,
-        publication_year=reference.publication_year,
-        created_at=reference.created_at,
-        updated_at=reference.updated_at,
-        team_id=reference.team_id,
-        created_by_id=reference.created_by_id,
-        category_id=reference.category_id,
-        keywords=keywords,
-        category=category_info,
-    )
-
-
 @router.post("/{reference_id}/upload")
 async def upload_file(
     reference_id: int,
     file: UploadFile = File(...),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user),
 ):
     """上传参考文献的PDF文件"""
-    db_reference = session.get(ReferencePaper, reference_id)
+    db_reference = await session.get(ReferencePaper, reference_id)
     if not db_reference:
         raise HTTPException(status_code=404, detail="Reference paper not found")
     # 检查用户是否为团队成员
-    if db_reference.team_id is None:
+    team_id = db_reference.team_id
+    if team_id is None:
         raise HTTPException(status_code=400, detail="Reference has no associated team")
-    check_team_member(db_reference.team_id, current_user, session)
+    await session.run_sync(
+        lambda sync_session: check_team_member(team_id, current_user, sync_session)
+    )
 
     # 检查文件类型
     if not file.filename or not file.filename.lower().endswith(".pdf"):
         raise HTTPException(
             status_code=400, detail="Only PDF files are allowed"
-        )  # 创建存储目录
-    upload_dir = get_team_upload_dir(db_reference.team_id)
-    upload_dir.mkdir(parents=True, exist_ok=True)  # 生成文件路径（不保留原始文件名）
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    # 获取文件扩展名
-    file_extension = ""
-    if file.filename:
-        file_extension = os.path.splitext(file.filename)[1].lower()
-
-    # 生成新的文件名：参考文献ID_时间戳_随机数.扩展名
-    random_suffix = str(uuid.uuid4())[:8]
-    filename = f"ref_{reference_id}_{timestamp}_{random_suffix}{file_extension}"
-    file_path = upload_dir / filename
-
-    # 如果已存在文件，先删除
-    if db_reference.file_path:
-        # 构建完整路径以删除旧文件
-        if os.path.isabs(db_reference.file_path):
-            old_full_path = db_reference.file_path
-        else:
-            # 相对路径需要构建完整路径
-            old_full_path = (
-                get_team_upload_dir(db_reference.team_id) / db_reference.file_path
-            )
-        if os.path.exists(old_full_path):
-            os.remove(old_full_path)
-
-    # 保存新文件
-    try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
-
-    # 构建相对路径用于存储
-    relative_path = f"teams/{db_reference.team_id}/references/{filename}"
-
-    # 更新数据库中的文件路径（存储相对路径）
-    db_reference.file_path = relative_path
+        )
+    # 按内容存入 blob 存储（超过大小上限或保存失败时不影响原有文件，内容已存在时不再写入）
+    blob = await store_upload(session, file)
+    # PDF 在提交后由后台进程提取文本，用于正文检索
+    text_status = await session.run_sync(queue_text_extraction, blob)
+
+    # 更新数据库中的文件路径，释放原来的文件
+    old_file_path = db_reference.file_path
+    db_reference.file_path = blob.file_path
     db_reference.updated_at = datetime.utcnow()
     session.add(db_reference)
-    session.commit()  # 构建文件URL以支持预览
-    file_url = build_file_url(relative_path)
+    await session.run_sync(release_file, old_file_path, get_team_upload_dir(team_id))
+    await session.commit()
+
+    # 构建文件URL以支持预览
+    file_url = build_file_url(blob.file_path)
 
     return {
         "reference_id": reference_id,
         "file_url": file_url,
+        "file_size": blob.size,
+        "sha256": blob.sha256,
+        "text_status": text_status,
         "message": "File uploaded successfully",
     }
 
@@ -512,18 +457,22 @@ async def upload_file(
 @router.get("/{reference_id}/download")
 async def download_reference_by_id(
     reference_id: int,
-    session: Session = Depends(get_session),
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user),
 ):
     """通过ID下载参考文献PDF文件"""
-    db_reference = session.get(ReferencePaper, reference_id)
+    db_reference = await session.get(ReferencePaper, reference_id)
     if not db_reference:
         raise HTTPException(
             status_code=404, detail="Reference paper not found"
         )  # 检查用户是否为团队成员
-    if db_reference.team_id is None:
+    team_id = db_reference.team_id
+    if team_id is None:
         raise HTTPException(status_code=400, detail="Reference has no associated team")
-    check_team_member(db_reference.team_id, current_user, session)
+    await session.run_sync(
+        lambda sync_session: check_team_member(team_id, current_user, sync_session)
+    )
 
     # 检查文件是否存在
     if not db_reference.file_path:
@@ -532,21 +481,9 @@ async def download_reference_by_id(
         )
 
     # 构建完整文件路径
-    if os.path.isabs(db_reference.file_path):
-        full_path = db_reference.file_path
-    else:
-        # 相对路径需要构建完整路径
-        if db_reference.team_id:
-            full_path = (
-                get_team_upload_dir(db_reference.team_id)
-                / db_reference.file_path.split("/")[-1]
-            )
-        else:
-            raise HTTPException(
-                status_code=400, detail="Reference has no associated team"
-            )
+    full_path = resolve_file_path(db_reference.file_path, get_team_upload_dir(team_id))
 
-    if not os.path.exists(full_path):
+    if not full_path.is_file():
         raise HTTPException(
             status_code=404, detail="PDF file not found for this reference"
         )
@@ -554,25 +491,32 @@ async def download_reference_by_id(
     # 构建文件名
     filename = f"{db_reference.title}.pdf"
 
-    return FileResponse(str(full_path), filename=filename, media_type="application/pdf")
+    return file_response(
+        full_path, request.headers, filename=filename, media_type="application/pdf"
+    )
 
 
 @router.get("/download/by-title")
 async def download_reference_by_title(
     title: str,
     team_id: int,
-    session: Session = Depends(get_session),
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user),
 ):
     """通过标题下载参考文献PDF文件"""
     # 检查用户是否为团队成员
-    check_team_member(team_id, current_user, session)
+    await session.run_sync(
+        lambda sync_session: check_team_member(team_id, current_user, sync_session)
+    )
 
     # 查找参考文献
-    db_reference = session.exec(
-        select(ReferencePaper)
-        .where(ReferencePaper.team_id == team_id)
-        .where(ReferencePaper.title == title)
+    db_reference = (
+        await session.exec(
+            select(ReferencePaper)
+            .where(ReferencePaper.team_id == team_id)
+            .where(ReferencePaper.title == title)
+        )
     ).first()
 
     if not db_reference:
@@ -585,13 +529,9 @@ async def download_reference_by_title(
         )
 
     # 构建完整文件路径
-    if os.path.isabs(db_reference.file_path):
-        full_path = db_reference.file_path
-    else:
-        # 相对路径需要构建完整路径
-        full_path = get_team_upload_dir(team_id) / db_reference.file_path.split("/")[-1]
+    full_path = resolve_file_path(db_reference.file_path, get_team_upload_dir(team_id))
 
-    if not os.path.exists(full_path):
+    if not full_path.is_file():
         raise HTTPException(
             status_code=404, detail="PDF file not found for this reference"
         )
@@ -599,39 +539,51 @@ async def download_reference_by_title(
     # 构建文件名
     filename = f"{db_reference.title}.pdf"
 
-    return FileResponse(str(full_path), filename=filename, media_type="application/pdf")
+    return file_response(
+        full_path, request.headers, filename=filename, media_type="application/pdf"
+    )
 
 
-@router.get("/export/excel")
-def export_references_excel(
+REFERENCE_EXPORT_HEADERS = [
+    "ID",
+    "Title",
+    "Authors",
+    "Keywords",
+    "Category",
+    "Journal",
+    "Publication Year",
+    "DOI",
+    "Team",
+    "Created At",
+    "Has File",
+]
+
+
+def build_reference_export_query(
+    session: Session,
+    user: User,
     team_id: Optional[int] = None,
     category_id: Optional[int] = None,
     keyword: Optional[str] = None,
     journal_id: Optional[int] = None,
     publication_year: Optional[int] = None,
     title: Optional[str] = None,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user),
 ):
-    """导出参考文献列表为Excel格式"""
-    # 使用与read_references相同的查询逻辑
+    """构建导出查询（与 read_references 的过滤逻辑一致）"""
     query = select(ReferencePaper)
 
     # 如果指定了团队，检查用户是否为团队成员
     if team_id is not None:
-        check_team_member(team_id, current_user, session)
+        check_team_member(team_id, user, session)
         query = query.where(ReferencePaper.team_id == team_id)
     else:
         # 获取用户所在的所有团队ID
-        user_teams = session.exec(
-            select(TeamUser).where(TeamUser.user_id == current_user.id)
-        ).all()
-        team_ids = [0] + [tu.team_id for tu in user_teams]  # 包括公开的参考文献
+        team_ids = [0] + user_team_ids(session, user)  # 包括公开的参考文献
         query = query.where(ReferencePaper.team_id.in_(team_ids))  # type: ignore
 
     # 应用其他过滤条件
     if title:
-        query = query.where(ReferencePaper.title.contains(title))  # type: ignore
+        query = query.where(ReferencePaper.title.icontains(title))  # type: ignore
     if category_id:
         category_ids = get_reference_category_and_subcategories(session, category_id)
         query = query.where(ReferencePaper.category_id.in_(category_ids))  # type: ignore
@@ -644,72 +596,103 @@ def export_references_excel(
     if publication_year:
         query = query.where(ReferencePaper.publication_year == publication_year)
 
-    references = session.exec(query).all()
-
-    # 准备Excel数据
-    excel_data = []
-    for ref in references:
-        # 获取相关信息
-        keywords = [
-            kw.name
-            for kw in session.exec(
-                select(Keyword)
-                .join(ReferenceKeyword)
-                .where(ReferenceKeyword.reference_id == ref.id)
-            ).all()
-        ]
-
-        category_name = None
-        if ref.category_id:
-            category = session.get(ReferenceCategory, ref.category_id)
-            if category:
-                category_name = category.name
-
-        journal_name = None
-        if ref.journal_id:
-            journal = session.get(Journal, ref.journal_id)
-            if journal:
-                journal_name = journal.name
-
-        team_name = None
-        if ref.team_id:
-            team = session.get(Team, ref.team_id)
-            if team:
-                team_name = team.name
-
-        excel_data.append(
-            {
-                "ID": ref.id,
-                "Title": ref.title,
-                "Authors": ref.authors or "",
-                "Keywords": "; ".join(keywords),
-                "Category": category_name or "",
-                "Journal": journal_name or "",
-                "Publication Year": ref.publication_year,
-                "DOI": ref.doi or "",
-                "Team": team_name or "",
-                "Created At": ref.created_at,
-                "Has File": (
-                    "Yes" if ref.file_path and os.path.exists(ref.file_path) else "No"
-                ),
-            }
-        )
+    return query
+
+
+def iter_reference_export_rows(session: Session, query) -> Iterator[List]:
+    """分批读取参考文献并逐行产出导出数据"""
+    for references in iter_batches(session, query, ReferencePaper.id):
+        team_names = load_names(session, Team, (ref.team_id for ref in references))
+        for ref, ref_read in zip(references, hydrate_references(session, references)):
+            yield [
+                ref.id,
+                ref.title,
+                ref.authors or "",
+                "; ".join(ref_read.keywords),
+                ref_read.category.name if ref_read.category else "",
+                ref_read.journal_name or "",
+                ref.publication_year,
+                ref.doi or "",
+                team_names.get(ref.team_id or 0, ""),
+                ref.created_at,
+                "Yes" if ref.file_path and os.path.exists(ref.file_path) else "No",
+            ]
+
 
-    # 创建Excel文件
-    df = pd.DataFrame(excel_data)
+@router.get("/export/excel")
+def export_references_excel(
+    team_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    keyword: Optional[str] = None,
+    journal_id: Optional[int] = None,
+    publication_year: Optional[int] = None,
+    title: Optional[str] = None,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    """导出参考文献列表为Excel格式"""
+    query = build_reference_export_query(
+        session, current_user, team_id, category_id, keyword,
+        journal_id, publication_year, title,
+    )
+    temp_path = write_xlsx(
+        REFERENCE_EXPORT_HEADERS, iter_reference_export_rows(session, query)
+    )
 
     # 生成文件名
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"references_export_{timestamp}.xlsx"
 
-    # 创建临时文件
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as temp_file:
-        df.to_excel(temp_file.name, index=False, engine="openpyxl")
-        temp_path = temp_file.name
-
     return FileResponse(
         temp_path,
         filename=filename,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        media_type=XLSX_MEDIA_TYPE,
         headers={"Content-Disposition": f"attachment; filename={filename}"},
+        background=BackgroundTask(os.remove, temp_path),  # 发送完成后删除临时文件
     )
+
+
+@router.post("/export/excel", response_model=JobRead, status_code=202)
+def submit_reference_export_job(
+    team_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    keyword: Optional[str] = None,
+    journal_id: Optional[int] = None,
+    publication_year: Optional[int] = None,
+    title: Optional[str] = None,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    """提交参考文献 Excel 导出任务（参数同 GET），完成后从 /api/jobs/{job_id}/download 下载"""
+    filters = ReferenceExportFilters(
+        team_id=team_id,
+        category_id=category_id,
+        keyword=keyword,
+        journal_id=journal_id,
+        publication_year=publication_year,
+        title=title,
+    )
+    # 提交前检查团队权限，执行时按提交者当时的团队重新检查
+    build_reference_export_query(session, current_user, **filters.model_dump())
+
+    job = enqueue_job(session, "reference_export_excel", current_user.id, filters)
+    session.commit()
+    return job_read(job)
+
+
+@job_handler("reference_export_excel")
+def run_reference_export_job(
+    session: Session, job: Job, progress: JobProgress
+) -> JobResult:
+    user = session.get(User, job.created_by_id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    filters = ReferenceExportFilters.model_validate_json(job.params)
+    query = build_reference_export_query(session, user, **filters.model_dump())
+    total = count_query(session, query, ReferencePaper.id)
+    temp_path = write_xlsx(
+        REFERENCE_EXPORT_HEADERS,
+        progress.track(iter_reference_export_rows(session, query), total),
+    )
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return JobResult(temp_path, f"references_export_{timestamp}.xlsx", XLSX_MEDIA_TYPE)
@@ -5,23 +5,32 @@ from typing import List
 from app.core.database import get_session
 from app.models.reference import (
     ReferenceCategory,
+    ReferenceCategoryClosure,
     ReferenceCategoryCreate,
     ReferenceCategoryRead,
+    ReferenceCategoryTreeNode,
     ReferenceCategoryUpdate,
     ReferencePaper,
 )
 from app.models.user import User
 from app.api.user import get_current_user
-from app.models.team import Team, TeamUser, TeamRole
+from app.models.team import Team, TeamRole
+from app.services.auth_cache import find_team_membership
+from app.services.category_tree import (
+    add_node,
+    descendant_ids,
+    move_node,
+    remove_nodes,
+    subtree_counts,
+)
+from app.services.category_stats import get_reference_category_tree
 
 router = APIRouter()
 
 
 def check_team_admin(user: User, team_id: int, session: Session):
     """检查用户是否为团队管理员"""
-    team_user = session.exec(
-        select(TeamUser).where(TeamUser.team_id == team_id, TeamUser.user_id == user.id)
-    ).first()
+    team_user = find_team_membership(session, user, team_id)
 
     if not team_user or team_user.role not in [TeamRole.OWNER, TeamRole.ADMIN]:
         raise HTTPException(
@@ -30,28 +39,6 @@ def check_team_admin(user: User, team_id: int, session: Session):
         )
 
 
-def get_reference_category_count_recursive(session: Session, category_id: int) -> int:
-    """递归获取参考文献分类及其所有子分类下的参考文献数量"""
-    # 获取当前分类的参考文献数量
-    current_count = len(
-        session.exec(
-            select(ReferencePaper).where(ReferencePaper.category_id == category_id)
-        ).all()
-    )
-
-    # 获取子分类的参考文献数量
-    children = session.exec(
-        select(ReferenceCategory).where(ReferenceCategory.parent_id == category_id)
-    ).all()
-
-    for child in children:
-        assert child.id is not None, "Child category ID should not be None"
-
-        current_count += get_reference_category_count_recursive(session, child.id)
-
-    return current_count
-
-
 @router.post("/", response_model=ReferenceCategoryRead)
 def create_reference_category(
     category: ReferenceCategoryCreate,
@@ -77,6 +64,9 @@ def create_reference_category(
 
     db_category = ReferenceCategory.from_orm(category)
     session.add(db_category)
+    session.flush()
+    assert db_category.id is not None
+    add_node(session, ReferenceCategoryClosure, db_category.id, db_category.parent_id)
     session.commit()
     session.refresh(db_category)
     return db_category
@@ -93,11 +83,7 @@ def read_reference_categories(
 ):
     """获取团队的参考文献分类列表，可选择包含统计信息"""
     # 检查用户是否为团队成员
-    team_user = session.exec(
-        select(TeamUser).where(
-            TeamUser.team_id == team_id, TeamUser.user_id == current_user.id
-        )
-    ).first()
+    team_user = find_team_membership(session, current_user, team_id)
 
     if not team_user:
         raise HTTPException(status_code=403, detail="Not a member of this team")
@@ -109,6 +95,16 @@ def read_reference_categories(
         .limit(limit)
     ).all()
 
+    # 如果需要统计信息，一次查询统计所有分类子树下的参考文献数量
+    reference_counts = {}
+    if include_stats:
+        reference_counts = subtree_counts(
+            session,
+            ReferenceCategoryClosure,
+            ReferencePaper.category_id,
+            [c.id for c in categories if c.id is not None],
+        )
+
     result = []
     for category in categories:
         assert category.id is not None, "Category ID should not be None"
@@ -121,18 +117,34 @@ def read_reference_categories(
             team_id=category.team_id,
         )
 
-        # 如果需要统计信息，计算参考文献数量
         if include_stats:
-            reference_count = get_reference_category_count_recursive(
-                session, category.id
-            )
-            category_data.reference_count = reference_count
+            category_data.reference_count = reference_counts.get(category.id, 0)
 
         result.append(category_data)
 
     return result
 
 
+@router.get("/tree", response_model=List[ReferenceCategoryTreeNode])
+def read_reference_category_tree(
+    team_id: int,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    获取团队的参考文献分类树
+
+    每个节点包含直接归属的参考文献数量 reference_count 和包含子分类的 total_reference_count
+    """
+    # 检查用户是否为团队成员
+    team_user = find_team_membership(session, current_user, team_id)
+
+    if not team_user:
+        raise HTTPException(status_code=403, detail="Not a member of this team")
+
+    return get_reference_category_tree(session, team_id)
+
+
 @router.get("/{category_id}", response_model=ReferenceCategoryRead)
 def read_reference_category(
     category_id: int,
@@ -145,11 +157,7 @@ def read_reference_category(
         raise HTTPException(status_code=404, detail="Category not found")
 
     # 检查用户是否为团队成员
-    team_user = session.exec(
-        select(TeamUser).where(
-            TeamUser.team_id == category.team_id, TeamUser.user_id == current_user.id
-        )
-    ).first()
+    team_user = find_team_membership(session, current_user, category.team_id)
 
     if not team_user:
         raise HTTPException(status_code=403, detail="Not a member of this team")
@@ -192,11 +200,24 @@ def update_reference_category(
             raise HTTPException(
                 status_code=400, detail="Category cannot be its own parent"
             )
+        if category.parent_id in descendant_ids(session, ReferenceCategoryClosure, category_id):
+            raise HTTPException(
+                status_code=400,
+                detail="Category cannot be moved under its own subcategory",
+            )
 
+    # parent_id 显式设为 null 时移动到根级别，同样需要更新闭包表
     category_data = category.dict(exclude_unset=True)
+    parent_changed = (
+        "parent_id" in category_data and category.parent_id != db_category.parent_id
+    )
+
     for key, value in category_data.items():
         setattr(db_category, key, value)
 
+    if parent_changed:
+        move_node(session, ReferenceCategoryClosure, category_id, category.parent_id)
+
     session.add(db_category)
     session.commit()
     session.refresh(db_category)
@@ -235,6 +256,7 @@ def delete_reference_category(
             status_code=400, detail="Cannot delete category with associated references"
         )
 
+    remove_nodes(session, ReferenceCategoryClosure, [category_id])
     session.delete(category)
     session.commit()
     return {"ok": True}
@@ -5,10 +5,15 @@ from app.models.keyword import Keyword
 from app.models.paper import Paper, PaperCreate, PaperRead, PaperUpdate, PaperAuthor, PaperKeyword
 from app.models.user import User, UserCreate, UserRead, UserUpdate
 from app.models.category import Category, CategoryCreate, CategoryRead, CategoryUpdate
-from app.models.reference import ReferencePaper, ReferenceCreate, ReferenceRead, ReferenceUpdate, ReferenceKeyword, ReferenceCategory
+from app.models.reference import ReferencePaper, ReferenceCreate, ReferenceRead, ReferenceUpdate, ReferenceKeyword, ReferenceCategory, ReferenceCategoryClosure
+from app.models.api_key import ApiKeyTeam
 from app.models.team import Team, TeamCreate, TeamRead, TeamUpdate, TeamUser, TeamRole
 from app.core.database import get_session
 from app.api.user import get_current_user
+from app.services.auth_cache import find_team_membership, user_team_ids
+from app.services.blobs import release_files
+from app.services.category_tree import remove_nodes
+from app.core.config_dev import get_team_upload_dir
 from datetime import datetime
 
 
@@ -27,13 +32,12 @@ router = APIRouter()
 
 
 def check_team_member(team_id: int, user: User, session: Session) -> TeamUser:
-    """检查用户是否为团队成员，并返回团队成员关系"""
-    team_user = session.exec(
-        select(TeamUser).where(
-            TeamUser.team_id == team_id,
-            TeamUser.user_id == user.id
-        )
-    ).first()
+    """
+    检查用户是否为团队成员，并返回团队成员关系
+
+    成员关系来自认证缓存（见 app.services.auth_cache），返回的 TeamUser 只用于读取角色
+    """
+    team_user = find_team_membership(session, user, team_id)
 
     if not team_user:
         raise HTTPException(
@@ -108,11 +112,10 @@ def read_teams(
     current_user: User = Depends(get_current_user)
 ):
     """获取用户所在的团队列表"""
-    # 获取用户所在的所有团队
+    # 获取用户所在的所有团队（来自认证缓存，使用 API 密钥时只包含密钥限定的团队）
     teams = session.exec(
         select(Team)
-        .join(TeamUser)
-        .where(TeamUser.user_id == current_user.id)
+        .where(col(Team.id).in_(user_team_ids(session, current_user)))
         .offset(skip)
         .limit(limit)
     ).all()
@@ -239,21 +242,56 @@ def delete_team(
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
 
+    # 论文、工作量台账和合作关系都引用团队，团队下还有论文时不能删除
+    if session.exec(select(Paper.id).where(Paper.team_id == team_id).limit(1)).first():
+        raise HTTPException(
+            status_code=409, detail="Team still has papers, delete them first"
+        )
+
     # 删除团队成员关系
     session.execute(
         delete(TeamUser).where(col(TeamUser.team_id) == team_id)
     )
 
-    # 删除团队的参考文献分类
+    # API 密钥不再能访问该团队
     session.execute(
-        delete(ReferenceCategory).where(col(ReferenceCategory.team_id) == team_id)
+        delete(ApiKeyTeam).where(col(ApiKeyTeam.team_id) == team_id)
     )
 
-    # 删除团队的参考文献
+    # 删除团队的参考文献（先释放其文件引用，删除关键词关联）
+    release_files(
+        session,
+        session.exec(
+            select(ReferencePaper.file_path).where(
+                ReferencePaper.team_id == team_id,
+                col(ReferencePaper.file_path).is_not(None),
+            )
+        ).all(),
+        get_team_upload_dir(team_id),
+    )
+    session.execute(
+        delete(ReferenceKeyword).where(
+            col(ReferenceKeyword.reference_id).in_(
+                select(ReferencePaper.id).where(ReferencePaper.team_id == team_id)
+            )
+        )
+    )
     session.execute(
         delete(ReferencePaper).where(col(ReferencePaper.team_id) == team_id)
     )
 
+    # 删除团队的参考文献分类（先清理分类树闭包表）；参考文献引用分类，须在其后删除
+    remove_nodes(
+        session,
+        ReferenceCategoryClosure,
+        session.exec(
+            select(ReferenceCategory.id).where(ReferenceCategory.team_id == team_id)
+        ).all(),
+    )
+    session.execute(
+        delete(ReferenceCategory).where(col(ReferenceCategory.team_id) == team_id)
+    )
+
     # 删除团队
     session.delete(team)
     session.commit()
@@ -1,18 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
 from datetime import datetime, timedelta
 
-from app.core.database import get_session
+from app.core.database import get_async_session, get_session
 from app.models.user import User, UserCreate, UserRead, UserUpdate
 from app.schemas.user import UserProfileUpdate
-from app.services.utils import (
-    verify_password,
-    get_password_hash,
-    create_access_token,
-    verify_token,
+from app.services.api_keys import api_key_digest, check_api_key, is_api_key
+from app.services.auth_cache import (
+    cache_token,
+    cached_api_key,
+    cached_token,
+    cached_user,
+    load_api_key,
+    load_user,
+    request_api_key,
+    set_request_api_key,
 )
+from app.services.password_hashing import (
+    hash_password,
+    hash_password_async,
+    hashing_stats,
+    verify_password_async,
+)
+from app.services.utils import create_access_token, verify_token
 from app.core.config_dev import settings
 
 router = APIRouter()
@@ -20,26 +33,48 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/users/token")
 
 
 async def get_current_user(
-    token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    session: AsyncSession = Depends(get_async_session),
 ) -> User:
-    token_data = verify_token(token)
-    if not token_data:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
+    """
+    按令牌获取当前用户
+
+    令牌可以是登录获取的 JWT，也可以是 API 密钥（pm_ 开头，见 app.services.api_keys）。
+    令牌验证结果和用户信息缓存在当前进程中（见 app.services.auth_cache），
+    命中时不访问数据库。返回的用户已从会话中分离，
+    路由可以把它加入自己的会话（同步或异步）中修改。
+    """
+    api_key = None
+    if is_api_key(token):
+        key_hash = api_key_digest(token)
+        api_key = check_api_key(
+            cached_api_key(key_hash) or await session.run_sync(load_api_key, key_hash),
+            request.method,
         )
+        username = api_key.username
+    else:
+        username = cached_token(token)
+    if username is None:
+        token_data = verify_token(token)
+        if not token_data or not token_data.username:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        cache_token(token, token_data)
+        username = token_data.username
+    set_request_api_key(api_key)
 
-    user = session.exec(
-        select(User).where(User.username == token_data.username)
-    ).first()
-
-    if not user:
+    snapshot = cached_user(username) or await session.run_sync(load_user, username)
+    if not snapshot:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    user = snapshot.to_user()
 
     # Check if user account is active
     if not user.is_active:
@@ -52,14 +87,33 @@ async def get_current_user(
     return user
 
 
+def get_login_user(current_user: User = Depends(get_current_user)) -> User:
+    """登录用户（JWT 认证）：修改密码、管理 API 密钥等操作不接受 API 密钥"""
+    if request_api_key() is not None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="This operation requires logging in, API keys are not accepted",
+        )
+    return current_user
+
+
 @router.post("/token")
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ):
-    user = session.exec(select(User).where(User.username == form_data.username)).first()
+    user = (
+        await session.exec(select(User).where(User.username == form_data.username))
+    ).first()
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    # 先归还数据库连接，密码在独立线程池中验证，不阻塞事件循环
+    await session.close()
+    valid, new_hash = (
+        await verify_password_async(form_data.password, user.hashed_password)
+        if user
+        else (False, None)
+    )
+    if not user or not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -74,6 +128,12 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # BCRYPT_ROUNDS 修改后，按新成本保存用户的密码哈希
+    if new_hash:
+        session.add(user)
+        user.hashed_password = new_hash
+        await session.commit()
+
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user.username}, expires_delta=access_token_expires
@@ -107,7 +167,7 @@ def create_user(user: UserCreate, session: Session = Depends(get_session)):
         username=user.username,
         email=user.email,
         full_name=user.full_name,
-        hashed_password=get_password_hash(user.password),
+        hashed_password=hash_password(user.password),
     )
     session.add(db_user)
     session.commit()
@@ -123,8 +183,8 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
 @router.patch("/me", response_model=UserRead)
 async def update_my_profile(
     profile_update: UserProfileUpdate,
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    current_user: User = Depends(get_login_user),
+    session: AsyncSession = Depends(get_async_session),
 ):
     """普通用户更新自己的个人信息"""
 
@@ -133,9 +193,11 @@ async def update_my_profile(
 
     # 如果更新邮箱，检查是否已被其他用户使用
     if "email" in update_data:
-        existing_user = session.exec(
-            select(User).where(
-                User.email == update_data["email"], User.id != current_user.id
+        existing_user = (
+            await session.exec(
+                select(User).where(
+                    User.email == update_data["email"], User.id != current_user.id
+                )
             )
         ).first()
         if existing_user:
@@ -145,7 +207,9 @@ async def update_my_profile(
 
     # 如果更新密码，进行哈希处理
     if "password" in update_data:
-        update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+        update_data["hashed_password"] = await hash_password_async(
+            update_data.pop("password")
+        )
 
     # 更新updated_at时间戳
     update_data["updated_at"] = datetime.utcnow()
@@ -155,8 +219,8 @@ async def update_my_profile(
         setattr(current_user, key, value)
 
     session.add(current_user)
-    session.commit()
-    session.refresh(current_user)
+    await session.commit()
+    await session.refresh(current_user)
 
     return current_user
 
@@ -169,6 +233,17 @@ def read_users(
     return users
 
 
+@router.get("/password-hashing")
+def read_password_hashing_stats(current_user: User = Depends(get_current_user)):
+    """密码哈希线程池的配置和排队统计（仅超级用户）"""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only administrators can view password hashing statistics",
+        )
+    return hashing_stats()
+
+
 @router.get("/{user_id}", response_model=UserRead)
 def read_user(user_id: int, session: Session = Depends(get_session)):
     user = session.get(User, user_id)
@@ -197,7 +272,7 @@ def update_user(
 
     user_data = user_update.dict(exclude_unset=True)
     if "password" in user_data:
-        user_data["hashed_password"] = get_password_hash(user_data.pop("password"))
+        user_data["hashed_password"] = hash_password(user_data.pop("password"))
 
     for key, value in user_data.items():
         setattr(db_user, key, value)
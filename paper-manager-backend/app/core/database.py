@@ -1,20 +1,117 @@
-from sqlmodel import SQLModel, create_engine, Session
-from .config_dev import DATABASE_URL
+from pathlib import Path
+from typing import Any, Dict
 
-# SQLite 数据库引擎配置
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .config_dev import (
+    ASYNC_DATABASE_URL,
+    DATABASE_BACKEND,
+    DATABASE_URL,
+    DB_ECHO,
+    DB_MAX_OVERFLOW,
+    DB_POOL_SIZE,
+    SQLITE_PRAGMAS,
+)
+
+ALEMBIC_INI = Path(__file__).parent.parent.parent / "alembic.ini"
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: Dict[str, str]) -> None:
+    """在引擎建立的每个新连接上执行 PRAGMA（busy_timeout、cache_size 等只对当前连接生效）"""
+    if not pragmas or engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def engine_options(backend: str = DATABASE_BACKEND) -> Dict[str, Any]:
+    """创建引擎的参数，连接池大小见 config_dev"""
+    options: Dict[str, Any] = {
+        "echo": DB_ECHO,  # DB_ECHO=true 时输出 SQL
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+    }
+    if backend == "postgresql":
+        # 数据库重启或连接被服务端关闭后，取出连接时自动重连
+        options["pool_pre_ping"] = True
+    return options
+
+
+# 数据库引擎配置
 engine = create_engine(
     DATABASE_URL,
-    echo=True,  # Set to False in production
-    connect_args={"check_same_thread": False},  # SQLite 需要这个配置
+    # SQLite 连接会在线程池的不同线程中使用
+    connect_args={"check_same_thread": False} if DATABASE_BACKEND == "sqlite" else {},
+    **engine_options(),
 )
+apply_sqlite_pragmas(engine, SQLITE_PRAGMAS)
+
+# 异步引擎（aiosqlite / psycopg），供 async def 路由使用，查询期间不阻塞事件循环
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options())
+apply_sqlite_pragmas(async_engine.sync_engine, SQLITE_PRAGMAS)
+
+
+def insert_ignore(session: Session, model: Any) -> Any:
+    """
+    INSERT ... ON CONFLICT DO NOTHING 语句（SQLite 和 PostgreSQL 均支持）
+
+    并发插入相同主键的记录时，后提交的事务不报错，也不覆盖已有记录。
+    """
+    dialect = postgresql if session.get_bind().dialect.name == "postgresql" else sqlite
+    return dialect.insert(model).on_conflict_do_nothing()
+
+
+def upgrade_db(bind: Engine = engine) -> None:
+    """
+    用 Alembic 将数据库迁移到最新版本
+
+    基线迁移只创建不存在的表和索引，引入迁移之前由 create_all 创建的数据库
+    也可以直接升级。
+    """
+    alembic_config = AlembicConfig(str(ALEMBIC_INI))
+    with bind.begin() as connection:
+        alembic_config.attributes["connection"] = connection
+        command.upgrade(alembic_config, "head")
 
 
 def init_db():
-    """初始化数据库，创建所有表"""
-    SQLModel.metadata.create_all(engine)
+    """初始化数据库：执行迁移，建立全文索引并补齐派生数据"""
+    from app.services.search import init_search_index
+    from app.services.category_tree import sync_closures
+    from app.services.workload import sync_workload_ledger
+    from app.services.coauthor import sync_coauthorships
+
+    upgrade_db(engine)
+    init_search_index(engine)
+    with Session(engine) as session:
+        sync_closures(session)
+        sync_workload_ledger(session)
+        sync_coauthorships(session)
 
 
 def get_session():
     """获取数据库会话"""
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session():
+    """
+    获取异步数据库会话
+
+    用于 async def 路由。提交后不使 ORM 对象过期，提交后访问属性不会触发隐式查询；
+    基于同步 Session 的服务函数通过 session.run_sync 调用。
+    """
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
@@ -4,12 +4,26 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_swagger_ui_html
 import os
 import secrets
+from anyio import to_thread
 from sqlmodel import Session, select
 from colorama import init, Fore, Style
-from app.core.database import init_db, engine
+from app.core.config_dev import THREADPOOL_SIZE
+from app.core.database import init_db, engine, async_engine
 from app.api import api_router
 from app.models.user import User
 from app.services.utils import get_password_hash
+from app.services.file_serving import MediaFiles
+from app.services.text_extraction import (
+    resume_text_extraction,
+    shutdown_text_extraction,
+)
+from app.services.jobs import resume_jobs, shutdown_jobs, start_job_sweeper
+from app.services.password_hashing import shutdown_password_hashing
+from app.services.api_keys import (
+    shutdown_api_key_usage_flusher,
+    start_api_key_usage_flusher,
+)
+from app.services.uploads import UploadSizeLimitMiddleware
 from scripts.create_admin import create_admin_user_sync
 
 # Initialize colorama for Windows
@@ -31,7 +45,10 @@ app.mount("/static", StaticFiles(directory=static_dir), name="static")
 from app.core.config_dev import config
 
 media_dir = str(config.uploads)
-app.mount("/media", StaticFiles(directory=media_dir), name="media")
+app.mount("/media", MediaFiles(directory=media_dir), name="media")
+
+# Reject oversized uploads before the request body is read
+app.add_middleware(UploadSizeLimitMiddleware)
 
 # CORS middleware configuration
 app.add_middleware(
@@ -40,6 +57,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 跨域的 PDF 阅读器需要读取这些响应头才能分段加载，下载时需要读取文件名
+    expose_headers=[
+        "Accept-Ranges",
+        "Content-Range",
+        "Content-Length",
+        "Content-Disposition",
+        "ETag",
+    ],
 )
 
 # Include all API routes
@@ -58,8 +83,23 @@ async def custom_swagger_ui_html():
 
 @app.on_event("startup")
 async def startup_event():
+    # Sync routes and dependencies run in this threadpool
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
     init_db()
 
+    # Resume text extraction and background jobs left unfinished by the previous run
+    with Session(engine) as session:
+        resumed = resume_text_extraction(session)
+        resumed_jobs = resume_jobs(session)
+    if resumed:
+        print(f"{Fore.CYAN}Resumed text extraction for {resumed} files{Style.RESET_ALL}")
+    if resumed_jobs:
+        print(f"{Fore.CYAN}Resumed {resumed_jobs} background jobs{Style.RESET_ALL}")
+    # Delete expired job results now and periodically
+    start_job_sweeper()
+    # Write API key usage in batches
+    start_api_key_usage_flusher()
+
     # Create default admin user
     admin_username = os.getenv("ADMIN_USERNAME", "admin")
     admin_email = os.getenv("ADMIN_EMAIL", "admin@paperManager.com")
@@ -145,6 +185,16 @@ async def startup_event():
         )
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Unfinished extraction and jobs are resumed on the next startup
+    shutdown_text_extraction()
+    shutdown_jobs()
+    shutdown_password_hashing()
+    shutdown_api_key_usage_flusher()
+    await async_engine.dispose()
+
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to Paper Manager API"}
@@ -3,10 +3,13 @@ from sqlmodel import SQLModel
 print("DEBUG: Starting app.models.__init__.py execution")
 
 # 基础模型
-from .category import Category, CategoryCreate, CategoryRead, CategoryUpdate
+from .category import (
+    Category, CategoryCreate, CategoryRead, CategoryUpdate, CategoryClosure,
+    CategoryTreeNode
+)
 print(f"DEBUG: Imported .category. Registered tables: {list(SQLModel.metadata.tables.keys())}")
 
-from .author import Author # Import Author model
+from .author import Author, Coauthorship # Import Author model
 print(f"DEBUG: Imported .author. Registered tables: {list(SQLModel.metadata.tables.keys())}")
 
 from .keyword import Keyword, KeywordCreate, KeywordRead, KeywordUpdate
@@ -24,21 +27,37 @@ print(f"DEBUG: Imported .team. Registered tables: {list(SQLModel.metadata.tables
 
 from .reference import (
     ReferencePaper, ReferenceCreate, ReferenceRead, ReferenceUpdate,
-    ReferenceKeyword, ReferenceCategory, ReferenceCategoryRead
+    ReferenceKeyword, ReferenceCategory, ReferenceCategoryRead,
+    ReferenceCategoryClosure, ReferenceCategoryTreeNode
 )
 print(f"DEBUG: Imported .reference. Registered tables: {list(SQLModel.metadata.tables.keys())}")
 
 from .user import User, UserCreate, UserRead, UserUpdate
 print(f"DEBUG: Imported .user. Registered tables: {list(SQLModel.metadata.tables.keys())}")
 
+from .workload import AuthorWorkload
+print(f"DEBUG: Imported .workload. Registered tables: {list(SQLModel.metadata.tables.keys())}")
+
+from .blob import FileBlob, FileText
+print(f"DEBUG: Imported .blob. Registered tables: {list(SQLModel.metadata.tables.keys())}")
+
+from .job import Job, JobRead
+print(f"DEBUG: Imported .job. Registered tables: {list(SQLModel.metadata.tables.keys())}")
+
+from .api_key import ApiKey, ApiKeyTeam
+print(f"DEBUG: Imported .api_key. Registered tables: {list(SQLModel.metadata.tables.keys())}")
+
 __all__ = [
-    "Author",
+    "ApiKey", "ApiKeyTeam",
+    "Author", "AuthorWorkload", "Coauthorship", "FileBlob", "FileText", "Job", "JobRead",
     "User", "UserCreate", "UserRead", "UserUpdate",
-    "Category", "CategoryCreate", "CategoryRead", "CategoryUpdate",
+    "Category", "CategoryCreate", "CategoryRead", "CategoryUpdate", "CategoryClosure",
+    "CategoryTreeNode",
     "Team", "TeamCreate", "TeamRead", "TeamUpdate", "TeamUser",
     "Paper", "PaperCreate", "PaperRead", "PaperUpdate", "PaperAuthor", "PaperKeyword",  # Removed PaperCategory
     "ReferencePaper", "ReferenceCreate", "ReferenceRead", "ReferenceUpdate", "ReferenceKeyword",
-    "ReferenceCategory", "ReferenceCategoryRead",
+    "ReferenceCategory", "ReferenceCategoryRead", "ReferenceCategoryClosure",
+    "ReferenceCategoryTreeNode",
     "Keyword", "KeywordCreate", "KeywordRead", "KeywordUpdate"
 ]
 
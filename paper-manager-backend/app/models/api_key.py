@@ -0,0 +1,68 @@
+from typing import List, Optional
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+from enum import Enum
+
+
+class ApiKeyScope(str, Enum):
+    """API 密钥的权限"""
+
+    READ = "READ"  # 只能发送 GET / HEAD 请求
+    WRITE = "WRITE"  # 读写
+
+
+class ApiKey(SQLModel, table=True):
+    """
+    API 密钥
+
+    供导入脚本等程序长期使用，请求时作为 Bearer 令牌发送，代替登录获取的 JWT。
+    只保存密钥的 SHA-256 摘要，密钥本身仅在创建时返回一次。
+    """
+
+    __tablename__ = "api_key"  # type: ignore
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str  # 用途说明
+    prefix: str = Field(max_length=16)  # 密钥开头几位，便于辨认
+    key_hash: str = Field(unique=True, index=True, max_length=64)  # SHA-256 十六进制摘要
+    scope: ApiKeyScope = Field(default=ApiKeyScope.READ)
+    all_teams: bool = Field(default=True)  # 为 False 时只能访问 api_key_team 中的团队
+    user_id: int = Field(foreign_key="user.id", index=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: Optional[datetime] = None
+    last_used_at: Optional[datetime] = None  # 批量更新，最多延迟 API_KEY_USAGE_FLUSH_SECONDS
+    use_count: int = Field(default=0)
+
+
+class ApiKeyTeam(SQLModel, table=True):
+    """API 密钥可以访问的团队"""
+
+    __tablename__ = "api_key_team"  # type: ignore
+
+    api_key_id: int = Field(foreign_key="api_key.id", primary_key=True)
+    team_id: int = Field(foreign_key="team.id", primary_key=True, index=True)
+
+
+class ApiKeyCreate(SQLModel):
+    name: str
+    scope: ApiKeyScope = ApiKeyScope.READ
+    team_ids: Optional[List[int]] = None  # 不指定时可以访问用户所在的全部团队
+    expires_at: Optional[datetime] = None
+
+
+class ApiKeyRead(SQLModel):
+    id: int
+    name: str
+    prefix: str
+    scope: ApiKeyScope
+    team_ids: Optional[List[int]] = None
+    created_at: datetime
+    expires_at: Optional[datetime] = None
+    last_used_at: Optional[datetime] = None
+    use_count: int
+
+
+class ApiKeyCreated(ApiKeyRead):
+    """创建密钥的返回模型，key 只在此时返回"""
+
+    key: str
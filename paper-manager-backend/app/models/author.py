@@ -19,3 +19,21 @@ class Author(SQLModel, table=True):
         back_populates="authors", link_model=PaperAuthor
     )
     paper_links: List[PaperAuthor] = Relationship(back_populates="author")
+
+
+class Coauthorship(SQLModel, table=True):
+    """
+    作者合作关系（合作图的边）
+
+    每对作者在每个团队中只保存一行（author_id < coauthor_id），
+    由 PaperAuthor 派生，在论文作者、发表日期或团队变化时增量更新。
+    """
+
+    __tablename__ = "coauthorship"  # type: ignore
+
+    author_id: int = Field(foreign_key="author.id", primary_key=True)
+    coauthor_id: int = Field(foreign_key="author.id", primary_key=True, index=True)
+    team_id: int = Field(foreign_key="team.id", primary_key=True, index=True)
+    paper_count: int = Field(default=0)  # 合作论文数
+    first_year: Optional[int] = None  # 最早合作年份
+    last_year: Optional[int] = None  # 最近合作年份
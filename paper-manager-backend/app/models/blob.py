@@ -0,0 +1,41 @@
+from typing import Optional
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+
+
+class FileBlob(SQLModel, table=True):
+    """
+    内容寻址存储的文件
+
+    上传的文件按内容的 SHA-256 保存一份，Paper.file_path 和 ReferencePaper.file_path
+    指向同一文件时共用一条记录。ref_count 为引用该文件的论文和参考文献数量，
+    降为 0 时删除记录和文件。
+    """
+
+    __tablename__ = "file_blob"  # type: ignore
+
+    sha256: str = Field(primary_key=True, max_length=64)
+    file_path: str = Field()  # 相对 uploads 目录的路径：blobs/{前两位}/{sha256}{扩展名}
+    size: int = Field()
+    ref_count: int = Field(default=0)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class FileText(SQLModel, table=True):
+    """
+    从 blob 中提取的文本
+
+    上传 PDF 后在后台逐页提取，页之间以换页符分隔，用于全文检索。
+    相同内容只提取一次；blob 删除时一并删除。
+    """
+
+    __tablename__ = "file_text"  # type: ignore
+
+    id: Optional[int] = Field(default=None, primary_key=True)  # 全文索引的 rowid
+    sha256: str = Field(foreign_key="file_blob.sha256", unique=True, max_length=64)
+    status: str = Field(default="pending", index=True)  # pending / done / failed
+    page_count: Optional[int] = None
+    text: Optional[str] = None
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    extracted_at: Optional[datetime] = None
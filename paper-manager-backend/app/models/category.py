@@ -28,6 +28,18 @@ class Category(SQLModel, table=True):
     papers: List["Paper"] = Relationship(back_populates="category")
 
 
+class CategoryClosure(SQLModel, table=True):
+    """分类闭包表：记录所有祖先-后代关系（包括节点自身，depth 为 0）"""
+
+    __tablename__ = "category_closure"  # type: ignore
+
+    ancestor_id: int = Field(foreign_key="category.id", primary_key=True)
+    descendant_id: int = Field(
+        foreign_key="category.id", primary_key=True, index=True
+    )
+    depth: int = Field(default=0)  # 祖先到后代的层级距离
+
+
 class CategoryCreate(SQLModel):
     """创建分类"""
 
@@ -46,6 +58,13 @@ class CategoryRead(SQLModel):
     paper_count: Optional[int] = None  # 添加论文计数字段
 
 
+class CategoryTreeNode(CategoryRead):
+    """分类树节点（paper_count 为直接归属该分类的论文数量）"""
+
+    total_paper_count: int = 0  # 包含所有子分类的论文数量
+    children: List["CategoryTreeNode"] = []
+
+
 class CategoryUpdate(SQLModel):
     """更新分类"""
 
@@ -0,0 +1,44 @@
+from typing import Optional
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+
+
+class Job(SQLModel, table=True):
+    """
+    后台任务
+
+    导出、重建台账等耗时操作提交为任务后立即返回，由后台线程执行。
+    结果文件保存在 data/jobs 下，expires_at 之后连同记录一起删除。
+    """
+
+    __tablename__ = "job"  # type: ignore
+
+    id: str = Field(primary_key=True, max_length=32)
+    kind: str = Field(index=True)  # 任务类型，如 paper_export_excel
+    status: str = Field(default="queued", index=True)  # queued / running / done / failed
+    params: str = Field(default="{}")  # 任务参数（JSON）
+    team_ids: Optional[str] = None  # 提交任务的 API 密钥限定的团队（JSON 列表），None 为不限定
+    progress: float = Field(default=0.0)  # 0 ~ 1
+    result_path: Optional[str] = None  # 相对 data/jobs 的结果文件路径
+    result_name: Optional[str] = None  # 下载时的文件名
+    media_type: Optional[str] = None
+    error: Optional[str] = None
+    created_by_id: int = Field(foreign_key="user.id", index=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = Field(default=None, index=True)
+
+
+class JobRead(SQLModel):
+    id: str
+    kind: str
+    status: str
+    progress: float
+    error: Optional[str] = None
+    result_name: Optional[str] = None
+    download_url: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
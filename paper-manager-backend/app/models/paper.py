@@ -1,6 +1,8 @@
 from typing import Optional, List, TYPE_CHECKING, Dict, Any
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 from datetime import datetime
+from enum import Enum
 
 from app.models.journal import Journal
 
@@ -14,6 +16,8 @@ if TYPE_CHECKING:
 
 class PaperAuthor(SQLModel, table=True):
     __tablename__ = "paper_author"  # type: ignore
+    # 按作者查论文（作者筛选、合作关系）只需读索引
+    __table_args__ = (Index("ix_paper_author_author_id_paper_id", "author_id", "paper_id"),)
 
     paper_id: int = Field(foreign_key="paper.id", primary_key=True)
     author_id: int = Field(foreign_key="author.id", primary_key=True)
@@ -28,6 +32,11 @@ class PaperAuthor(SQLModel, table=True):
 class PaperKeyword(SQLModel, table=True):
     """论文-关键字关联表"""
 
+    # 按关键词查论文只需读索引
+    __table_args__ = (
+        Index("ix_paperkeyword_keyword_id_paper_id", "keyword_id", "paper_id"),
+    )
+
     paper_id: Optional[int] = Field(
         default=None, foreign_key="paper.id", primary_key=True
     )
@@ -42,19 +51,23 @@ class PaperKeyword(SQLModel, table=True):
 class PaperBase(SQLModel):
     title: str = Field(index=True)
     abstract: Optional[str] = None
-    publication_date: Optional[datetime] = None
-    journal_id: Optional[int] = Field(default=None, foreign_key="journal.id")
+    publication_date: Optional[datetime] = Field(default=None, index=True)
+    journal_id: Optional[int] = Field(default=None, foreign_key="journal.id", index=True)
     doi: Optional[str] = Field(default=None, unique=True)
     file_path: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     category_id: Optional[int] = Field(
-        default=None, foreign_key="category.id"
+        default=None, foreign_key="category.id", index=True
     )  # Direct foreign key
 
 
 class Paper(PaperBase, table=True):
     __tablename__ = "paper"  # type: ignore
+    # 团队筛选，以及团队内按发表日期筛选、排序
+    __table_args__ = (
+        Index("ix_paper_team_id_publication_date", "team_id", "publication_date"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     created_by_id: int = Field(foreign_key="user.id")
@@ -94,6 +107,23 @@ class PaperCreate(SQLModel):
     team_id: int
 
 
+class PaperImportError(SQLModel):
+    """批量导入中单行的错误"""
+
+    row: int  # 行号（从 1 开始，不含表头）
+    error: str
+
+
+class PaperImportResult(SQLModel):
+    """批量导入结果"""
+
+    total: int = 0
+    created: int = 0
+    failed: int = 0
+    paper_ids: List[int] = []
+    errors: List[PaperImportError] = []
+
+
 class PaperRead(SQLModel):
     """论文返回模型"""
 
@@ -132,6 +162,13 @@ class PaperUpdate(SQLModel):
     team_id: Optional[int] = None
 
 
+class PaperOrderBy(str, Enum):
+    """论文游标分页的排序字段"""
+
+    CREATED_AT = "created_at"
+    PUBLICATION_DATE = "publication_date"
+
+
 class PaginatedPaperResponse(SQLModel):
     """分页论文响应模型"""
 
@@ -140,3 +177,17 @@ class PaginatedPaperResponse(SQLModel):
     page: int
     size: int
     pages: int
+    next_cursor: Optional[str] = None  # 游标分页模式下的下一页游标
+
+
+class PaperExportFilters(SQLModel):
+    """论文导出的过滤条件（与 read_papers 一致），也用作后台导出任务的参数"""
+
+    title: Optional[str] = None
+    category_id: Optional[int] = None
+    author_name: Optional[str] = None
+    keyword: Optional[str] = None
+    journal_id: Optional[int] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    team_id: Optional[int] = None
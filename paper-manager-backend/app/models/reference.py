@@ -1,6 +1,8 @@
 from typing import Optional, List, TYPE_CHECKING, Dict, Any
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 from datetime import datetime
+from enum import Enum
 
 if TYPE_CHECKING:
     from .keyword import Keyword
@@ -36,6 +38,18 @@ class ReferenceCategory(SQLModel, table=True):
     )
 
 
+class ReferenceCategoryClosure(SQLModel, table=True):
+    """参考文献分类闭包表：记录所有祖先-后代关系（包括节点自身，depth 为 0）"""
+
+    __tablename__ = "reference_category_closure"  # type: ignore
+
+    ancestor_id: int = Field(foreign_key="reference_category.id", primary_key=True)
+    descendant_id: int = Field(
+        foreign_key="reference_category.id", primary_key=True, index=True
+    )
+    depth: int = Field(default=0)  # 祖先到后代的层级距离
+
+
 class ReferenceCategoryCreate(SQLModel):
     """创建参考文献分类"""
 
@@ -56,6 +70,13 @@ class ReferenceCategoryRead(SQLModel):
     reference_count: Optional[int] = None  # 添加参考文献计数字段
 
 
+class ReferenceCategoryTreeNode(ReferenceCategoryRead):
+    """参考文献分类树节点（reference_count 为直接归属该分类的参考文献数量）"""
+
+    total_reference_count: int = 0  # 包含所有子分类的参考文献数量
+    children: List["ReferenceCategoryTreeNode"] = []
+
+
 class ReferenceCategoryUpdate(SQLModel):
     """更新参考文献分类"""
 
@@ -67,6 +88,11 @@ class ReferenceCategoryUpdate(SQLModel):
 class ReferenceKeyword(SQLModel, table=True):
     """参考文献-关键字关联表"""
 
+    # 按关键词查参考文献只需读索引
+    __table_args__ = (
+        Index("ix_referencekeyword_keyword_id_reference_id", "keyword_id", "reference_id"),
+    )
+
     reference_id: Optional[int] = Field(
         default=None, foreign_key="referencepaper.id", primary_key=True
     )
@@ -83,18 +109,25 @@ class ReferencePaperBase(SQLModel):
     authors: str
     doi: Optional[str] = Field(default=None, unique=True)
     file_path: Optional[str] = None
-    journal_id: Optional[int] = Field(default=None, foreign_key="journal.id")
+    journal_id: Optional[int] = Field(default=None, foreign_key="journal.id", index=True)
     publication_year: Optional[int] = Field(default=None, index=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     team_id: Optional[int] = Field(default=None, foreign_key="team.id")
     created_by_id: int = Field(foreign_key="user.id")
     category_id: Optional[int] = Field(
-        default=None, foreign_key="reference_category.id"
+        default=None, foreign_key="reference_category.id", index=True
     )
 
 
 class ReferencePaper(ReferencePaperBase, table=True):
+    # 团队筛选，以及团队内按发表年份筛选、排序
+    __table_args__ = (
+        Index(
+            "ix_referencepaper_team_id_publication_year", "team_id", "publication_year"
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
 
     # Relationships
@@ -140,6 +173,13 @@ class ReferenceUpdate(SQLModel):
     keyword_names: Optional[List[str]] = None
 
 
+class ReferenceOrderBy(str, Enum):
+    """参考文献游标分页的排序字段"""
+
+    CREATED_AT = "created_at"
+    PUBLICATION_YEAR = "publication_year"
+
+
 class PaginatedReferenceResponse(SQLModel):
     """分页参考文献响应模型"""
 
@@ -148,3 +188,15 @@ class PaginatedReferenceResponse(SQLModel):
     page: int
     size: int
     pages: int
+    next_cursor: Optional[str] = None  # 游标分页模式下的下一页游标
+
+
+class ReferenceExportFilters(SQLModel):
+    """参考文献导出的过滤条件（与 read_references 一致），也用作后台导出任务的参数"""
+
+    team_id: Optional[int] = None
+    category_id: Optional[int] = None
+    keyword: Optional[str] = None
+    journal_id: Optional[int] = None
+    publication_year: Optional[int] = None
+    title: Optional[str] = None
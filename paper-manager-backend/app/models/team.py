@@ -29,8 +29,8 @@ class TeamUser(SQLModel, table=True):
         default=None, foreign_key="team.id", primary_key=True
     )
     user_id: Optional[int] = Field(
-        default=None, foreign_key="user.id", primary_key=True
-    )
+        default=None, foreign_key="user.id", primary_key=True, index=True
+    )  # 主键以 team_id 开头，按用户查团队需要单独的索引
     role: TeamRole = Field(default=TeamRole.MEMBER)  # 团队中的角色
     joined_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -0,0 +1,34 @@
+from typing import Optional
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+
+
+class AuthorWorkload(SQLModel, table=True):
+    """
+    作者工作量台账
+
+    每位作者在每篇论文上的工作量，由 PaperAuthor、论文和期刊等级派生，
+    在论文作者、贡献比例、期刊、发表日期或期刊等级变化时增量更新。
+    """
+
+    __tablename__ = "author_workload"  # type: ignore
+
+    author_id: int = Field(foreign_key="author.id", primary_key=True)
+    paper_id: int = Field(foreign_key="paper.id", primary_key=True, index=True)
+    year: Optional[int] = Field(default=None, index=True)  # 发表年份
+    publication_date: Optional[datetime] = None
+    team_id: int = Field(foreign_key="team.id", index=True)
+    journal_grade: str = Field(default="OTHER")
+    contribution_ratio: float = Field(default=1.0)
+    is_corresponding: bool = Field(default=False)
+    author_order: int = Field()
+    workload: float = Field(default=0.0)
+
+
+class WorkloadExportFilters(SQLModel):
+    """作者工作量导出的过滤条件，也用作后台导出任务的参数"""
+
+    author_name: Optional[str] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    team_id: Optional[int] = None
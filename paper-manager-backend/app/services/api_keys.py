@@ -0,0 +1,157 @@
+"""
+API 密钥
+
+导入脚本等程序使用长期有效的 API 密钥代替登录：请求时以
+`Authorization: Bearer pm_...` 发送，由 get_current_user 识别。
+
+- 密钥是 32 字节的随机数，数据库中只保存 SHA-256 摘要。密钥本身足够随机，
+  不需要 bcrypt 这样的慢哈希，每次请求的验证只需计算一次 SHA-256
+- 密钥快照缓存在内存中（见 app.services.auth_cache），命中时验证不访问数据库
+- 使用时间和次数先在内存中累计，由后台线程每 API_KEY_USAGE_FLUSH_SECONDS 秒
+  批量写入，服务停止时写入剩余的部分
+"""
+
+import hashlib
+import secrets
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config_dev import API_KEY_USAGE_FLUSH_SECONDS
+from app.core.database import engine
+from app.models.api_key import ApiKey, ApiKeyScope
+from app.services.auth_cache import ApiKeySnapshot
+
+# 密钥前缀，用于区分 API 密钥和 JWT
+API_KEY_PREFIX = "pm_"
+
+# 保存用于辨认的密钥开头字符数（包括前缀）
+API_KEY_DISPLAY_LENGTH = 11
+
+# 只读密钥允许的请求方法
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# 密钥 ID -> (最后使用时间, 未写入的使用次数)
+_usage: Dict[int, Tuple[datetime, int]] = {}
+_usage_lock = threading.Lock()
+_flusher_stop = threading.Event()
+
+
+def is_api_key(token: str) -> bool:
+    return token.startswith(API_KEY_PREFIX)
+
+
+def api_key_digest(key: str) -> str:
+    """密钥的 SHA-256 十六进制摘要"""
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def generate_api_key() -> Tuple[str, str, str]:
+    """生成新密钥，返回 (密钥, 用于辨认的开头部分, 摘要)"""
+    key = API_KEY_PREFIX + secrets.token_urlsafe(32)
+    return key, key[:API_KEY_DISPLAY_LENGTH], api_key_digest(key)
+
+
+def check_api_key(api_key: Optional[ApiKeySnapshot], method: str) -> ApiKeySnapshot:
+    """
+    检查密钥是否有效、是否允许该请求方法，并记录使用
+
+    Raises:
+        HTTPException: 密钥不存在或已过期（401），只读密钥发送写请求（403）
+    """
+    if api_key is None or (
+        api_key.expires_at is not None and api_key.expires_at <= datetime.utcnow()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired API key",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if api_key.scope != ApiKeyScope.WRITE and method.upper() not in READ_METHODS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="This API key is read-only",
+        )
+    record_api_key_use(api_key.id)
+    return api_key
+
+
+def record_api_key_use(api_key_id: int) -> None:
+    """在内存中累计密钥的使用，稍后批量写入"""
+    now = datetime.utcnow()
+    with _usage_lock:
+        _, count = _usage.get(api_key_id, (now, 0))
+        _usage[api_key_id] = (now, count + 1)
+
+
+def pending_api_key_usage() -> Dict[int, Tuple[datetime, int]]:
+    """尚未写入数据库的使用记录：密钥 ID -> (最后使用时间, 使用次数)"""
+    with _usage_lock:
+        return dict(_usage)
+
+
+def flush_api_key_usage() -> int:
+    """
+    将累计的使用时间和次数写入数据库，返回更新的密钥数量
+
+    直接在连接上执行 UPDATE，不经过 Session，不会使认证缓存失效。
+    写入失败时把本次的累计合并回去，下次重试。
+    """
+    with _usage_lock:
+        pending = dict(_usage)
+        _usage.clear()
+    if not pending:
+        return 0
+
+    table = ApiKey.__table__  # type: ignore
+    try:
+        with engine.begin() as connection:
+            connection.execute(
+                update(table)
+                .where(table.c.id == bindparam("key_id"))
+                .values(
+                    last_used_at=bindparam("used_at"),
+                    use_count=table.c.use_count + bindparam("uses"),
+                ),
+                [
+                    {"key_id": key_id, "used_at": used_at, "uses": uses}
+                    for key_id, (used_at, uses) in pending.items()
+                ],
+            )
+    except SQLAlchemyError:
+        with _usage_lock:
+            for key_id, (used_at, uses) in pending.items():
+                latest, count = _usage.get(key_id, (used_at, 0))
+                _usage[key_id] = (max(latest, used_at), count + uses)
+        raise
+    return len(pending)
+
+
+def _flush_loop() -> None:
+    while not _flusher_stop.wait(API_KEY_USAGE_FLUSH_SECONDS):
+        try:
+            flush_api_key_usage()
+        except SQLAlchemyError:
+            # 数据库忙时等待下一次写入
+            pass
+
+
+def start_api_key_usage_flusher() -> None:
+    """启动定期写入密钥使用记录的后台线程"""
+    _flusher_stop.clear()
+    threading.Thread(
+        target=_flush_loop, name="api-key-usage", daemon=True
+    ).start()
+
+
+def shutdown_api_key_usage_flusher() -> None:
+    """停止后台线程并写入剩余的使用记录"""
+    _flusher_stop.set()
+    try:
+        flush_api_key_usage()
+    except SQLAlchemyError:
+        pass
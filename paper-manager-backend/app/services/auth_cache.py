@@ -0,0 +1,305 @@
+"""
+认证缓存
+
+每个需要登录的请求都要验证 JWT、按用户名查询用户，团队相关的接口还要查询
+团队成员关系。这些结果缓存在当前进程中，命中时认证不访问数据库：
+
+- 已验证的令牌 -> 用户名，不超过令牌本身的过期时间
+- API 密钥摘要 -> 密钥快照：所属用户名、权限和可以访问的团队
+- 用户名 -> 用户快照：用户的全部字段及其所在团队和角色
+
+条目在 AUTH_CACHE_TTL_SECONDS 秒后过期，每类缓存最多保存 AUTH_CACHE_SIZE 个条目，
+超出时淘汰最久未使用的。用户、团队成员关系或 API 密钥发生变化（修改、停用、加入或
+移出团队、更改角色、创建或删除密钥）的事务提交后，用户和密钥快照全部失效
+（见 app.services.cache）。
+
+使用 API 密钥认证的请求只能访问密钥限定的团队：认证时记录当前请求的密钥和团队范围，
+find_team_membership 和 user_team_ids 只返回这些团队。后台任务在提交时保存团队范围，
+执行时用 team_scope 恢复（见 app.services.jobs）。
+
+其他进程（多实例部署、命令行脚本）的修改不会使本进程的缓存失效，最长在 TTL 后生效。
+AUTH_CACHE_TTL_SECONDS=0 时不缓存。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel import Session
+
+from app.core.config_dev import TokenData, config
+from app.models.api_key import ApiKey, ApiKeyScope, ApiKeyTeam
+from app.models.team import TeamRole, TeamUser
+from app.models.user import User
+from app.services.cache import cache_version, has_pending_changes, register_cache_scope
+
+AUTH = "auth"
+
+register_cache_scope(AUTH, User, TeamUser, ApiKey, ApiKeyTeam)
+
+
+@dataclass(frozen=True)
+class Membership:
+    """用户在一个团队中的成员关系"""
+
+    role: TeamRole
+    joined_at: datetime
+
+
+@dataclass(frozen=True)
+class AuthSnapshot:
+    """用户快照"""
+
+    user: Dict[str, Any]  # User 的全部字段
+    memberships: Dict[int, Membership]  # 团队 ID -> 成员关系
+    version: int  # 读取时 AUTH 范围的数据版本
+    expires_at: float  # time.monotonic() 时间
+
+    def to_user(self) -> User:
+        """
+        构建已从会话分离的 User
+
+        每次调用返回新对象，路由可以修改它并加入自己的会话（提交时执行 UPDATE）。
+        """
+        user = User(**self.user)
+        make_transient_to_detached(user)
+        return user
+
+
+@dataclass(frozen=True)
+class ApiKeySnapshot:
+    """API 密钥快照"""
+
+    id: int
+    username: str  # 所属用户
+    scope: ApiKeyScope
+    team_ids: Optional[FrozenSet[int]]  # 可以访问的团队，None 为用户所在的全部团队
+    expires_at: Optional[datetime]  # 密钥的过期时间（UTC）
+    version: int  # 读取时 AUTH 范围的数据版本
+    cached_until: float  # time.monotonic() 时间
+
+
+_tokens: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+_api_keys: "OrderedDict[str, ApiKeySnapshot]" = OrderedDict()
+_users: "OrderedDict[str, AuthSnapshot]" = OrderedDict()
+_lock = threading.Lock()
+
+# 当前请求使用的 API 密钥，JWT 认证的请求为 None。
+# 同步路由在线程池中执行时会复制当前上下文，也能读取到
+_request_api_key: ContextVar[Optional[ApiKeySnapshot]] = ContextVar(
+    "request_api_key", default=None
+)
+
+# 当前上下文可以访问的团队，None 为用户所在的全部团队
+_team_scope: ContextVar[Optional[FrozenSet[int]]] = ContextVar("team_scope", default=None)
+
+
+def _enabled() -> bool:
+    return config.auth_cache_ttl > 0 and config.auth_cache_size > 0
+
+
+def _store(entries: "OrderedDict[str, Any]", key: str, value: Any) -> None:
+    """写入条目并淘汰最久未使用的条目（调用方持有锁）"""
+    entries[key] = value
+    entries.move_to_end(key)
+    while len(entries) > config.auth_cache_size:
+        entries.popitem(last=False)
+
+
+def cached_token(token: str) -> Optional[str]:
+    """已验证令牌对应的用户名，未缓存或已过期时返回 None"""
+    with _lock:
+        entry = _tokens.get(token)
+        if entry is None:
+            return None
+        username, expires_at = entry
+        if expires_at <= time.monotonic():
+            del _tokens[token]
+            return None
+        _tokens.move_to_end(token)
+        return username
+
+
+def cache_token(token: str, token_data: TokenData) -> None:
+    """缓存已验证的令牌，缓存时间不超过令牌的剩余有效期"""
+    if not _enabled() or token_data.username is None:
+        return
+    ttl: float = config.auth_cache_ttl
+    if token_data.expires_at is not None:
+        ttl = min(ttl, token_data.expires_at - time.time())
+    if ttl <= 0:
+        return
+    with _lock:
+        _store(_tokens, token, (token_data.username, time.monotonic() + ttl))
+
+
+def cached_api_key(key_hash: str) -> Optional[ApiKeySnapshot]:
+    """API 密钥快照，未缓存、已过期或已失效时返回 None"""
+    version = cache_version(AUTH)
+    with _lock:
+        snapshot = _api_keys.get(key_hash)
+        if snapshot is None:
+            return None
+        if snapshot.version != version or snapshot.cached_until <= time.monotonic():
+            del _api_keys[key_hash]
+            return None
+        _api_keys.move_to_end(key_hash)
+        return snapshot
+
+
+def load_api_key(session: Session, key_hash: str) -> Optional[ApiKeySnapshot]:
+    """读取 API 密钥及其团队并缓存，密钥不存在时返回 None"""
+    version = cache_version(AUTH)
+    api_key = ApiKey.__table__  # type: ignore
+    row = session.execute(
+        select(api_key, User.__table__.c.username)  # type: ignore
+        .join(User.__table__, User.__table__.c.id == api_key.c.user_id)  # type: ignore
+        .where(api_key.c.key_hash == key_hash)
+    ).mappings().first()
+    if row is None:
+        return None
+    team_ids = None
+    if not row["all_teams"]:
+        team_ids = frozenset(
+            session.execute(
+                select(ApiKeyTeam.__table__.c.team_id).where(  # type: ignore
+                    ApiKeyTeam.__table__.c.api_key_id == row["id"]  # type: ignore
+                )
+            ).scalars()
+        )
+
+    snapshot = ApiKeySnapshot(
+        id=row["id"],
+        username=row["username"],
+        scope=row["scope"],
+        team_ids=team_ids,
+        expires_at=row["expires_at"],
+        version=version,
+        cached_until=time.monotonic() + config.auth_cache_ttl,
+    )
+    if _enabled() and not has_pending_changes(session, AUTH):
+        with _lock:
+            if cache_version(AUTH) == version:
+                _store(_api_keys, key_hash, snapshot)
+    return snapshot
+
+
+def set_request_api_key(api_key: Optional[ApiKeySnapshot]) -> None:
+    """记录当前请求使用的 API 密钥（JWT 认证时为 None）及其限定的团队"""
+    _request_api_key.set(api_key)
+    _team_scope.set(api_key.team_ids if api_key is not None else None)
+
+
+def request_api_key() -> Optional[ApiKeySnapshot]:
+    """当前请求使用的 API 密钥，JWT 认证时为 None"""
+    return _request_api_key.get()
+
+
+def current_team_scope() -> Optional[FrozenSet[int]]:
+    """当前上下文可以访问的团队，None 为不限定"""
+    return _team_scope.get()
+
+
+@contextmanager
+def team_scope(team_ids: Optional[Iterable[int]]) -> Iterator[None]:
+    """在请求之外（如后台任务）按给定的团队范围检查成员关系，None 为不限定"""
+    token = _team_scope.set(None if team_ids is None else frozenset(team_ids))
+    try:
+        yield
+    finally:
+        _team_scope.reset(token)
+
+
+def cached_user(username: str) -> Optional[AuthSnapshot]:
+    """用户快照，未缓存、已过期或已失效时返回 None"""
+    version = cache_version(AUTH)
+    with _lock:
+        snapshot = _users.get(username)
+        if snapshot is None:
+            return None
+        if snapshot.version != version or snapshot.expires_at <= time.monotonic():
+            del _users[username]
+            return None
+        _users.move_to_end(username)
+        return snapshot
+
+
+def load_user(session: Session, username: str) -> Optional[AuthSnapshot]:
+    """
+    读取用户及其团队成员关系并缓存，用户不存在时返回 None
+
+    与 app.services.cache.cached 相同，读取期间有修改提交时不写入缓存，避免缓存旧数据；
+    会话中有未提交的用户或成员关系修改时也不写入，它们可能被回滚。
+    """
+    version = cache_version(AUTH)
+    # 按表查询，不把对象放入会话：路由可能把 to_user() 返回的用户加入同一个会话
+    user = session.execute(
+        select(User.__table__).where(User.__table__.c.username == username)  # type: ignore
+    ).mappings().first()
+    if user is None:
+        return None
+    team_users = session.execute(
+        select(TeamUser.__table__).where(TeamUser.__table__.c.user_id == user["id"])  # type: ignore
+    ).mappings().all()
+
+    snapshot = AuthSnapshot(
+        user=dict(user),
+        memberships={
+            team_user["team_id"]: Membership(team_user["role"], team_user["joined_at"])
+            for team_user in team_users
+        },
+        version=version,
+        expires_at=time.monotonic() + config.auth_cache_ttl,
+    )
+    if _enabled() and not has_pending_changes(session, AUTH):
+        with _lock:
+            if cache_version(AUTH) == version:
+                _store(_users, username, snapshot)
+    return snapshot
+
+
+def _memberships(session: Session, user: User) -> Dict[int, Membership]:
+    """当前用户的团队成员关系，未缓存时重新读取；限定了团队范围时只包含这些团队"""
+    snapshot = cached_user(user.username)
+    if snapshot is None or snapshot.user["id"] != user.id:
+        snapshot = load_user(session, user.username)
+    if snapshot is None or snapshot.user["id"] != user.id:
+        # 用户在请求期间被删除或改名
+        return {}
+    scope = _team_scope.get()
+    if scope is None:
+        return snapshot.memberships
+    return {
+        team_id: membership
+        for team_id, membership in snapshot.memberships.items()
+        if team_id in scope
+    }
+
+
+def find_team_membership(session: Session, user: User, team_id: int) -> Optional[TeamUser]:
+    """
+    用户在团队中的成员关系，不是团队成员时返回 None
+
+    返回的 TeamUser 不属于任何会话，只用于读取角色；需要修改成员关系时请在会话中查询。
+    """
+    membership = _memberships(session, user).get(team_id)
+    if membership is None:
+        return None
+    return TeamUser(
+        team_id=team_id,
+        user_id=user.id,
+        role=membership.role,
+        joined_at=membership.joined_at,
+    )
+
+
+def user_team_ids(session: Session, user: User) -> List[int]:
+    """用户所在的全部团队 ID"""
+    return sorted(_memberships(session, user))
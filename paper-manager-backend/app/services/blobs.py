@@ -0,0 +1,310 @@
+"""
+内容寻址的文件存储
+
+上传的文件按内容的 SHA-256 保存在 uploads/blobs/{前两位}/{sha256}{扩展名}，
+相同内容只保存一份：Paper.file_path 和 ReferencePaper.file_path 存储 blob 的相对路径，
+file_blob 表记录每个 blob 被引用的次数。
+
+- 上传时先流式接收到临时文件并计算哈希，事务提交后移动到 blob 路径；
+  内容已存在时丢弃临时文件，只增加引用计数
+- 替换或删除文件时引用计数减一，降为 0 的 blob 连同记录一起删除
+
+引用计数的增减和无引用文件的删除在同一事务中进行：待删除的文件先改名，
+事务提交后删除；回滚或未提交就关闭会话时恢复原名。
+引入 blob 存储之前按目录保存的旧文件仍可访问，由 scripts/migrate_blobs.py 迁移到 blob 存储。
+"""
+
+import logging
+import os
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import UploadFile
+from sqlalchemy import delete, event, func, update
+from sqlmodel import Session, col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config_dev import config
+from app.core.database import insert_ignore
+from app.models.blob import FileBlob, FileText
+from app.models.paper import Paper
+from app.models.reference import ReferencePaper
+from app.services.hydration import chunked
+from app.services.uploads import (
+    StoredUpload,
+    discard_upload,
+    publish_upload,
+    receive_upload,
+)
+
+BLOBS_DIR = config.uploads / "blobs"
+
+# blob 在 file_path 中的前缀（相对 uploads 目录）
+BLOB_PREFIX = "blobs/"
+
+_REMOVED_KEY = "blob_files_removed"
+_UPLOADED_KEY = "blob_files_uploaded"
+
+logger = logging.getLogger(__name__)
+
+
+def blob_relative_path(sha256: str, suffix: str = "") -> str:
+    """blob 相对 uploads 目录的路径"""
+    return f"{BLOB_PREFIX}{sha256[:2]}/{sha256}{suffix}"
+
+
+def is_blob_path(file_path: str) -> bool:
+    return file_path.replace("\\", "/").startswith(BLOB_PREFIX)
+
+
+def _blob_sha256(file_path: str) -> str:
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+
+def resolve_file_path(file_path: str, legacy_dir: Path) -> Path:
+    """
+    将记录中的 file_path 转换为磁盘路径
+
+    Args:
+        file_path: 绝对路径、blob 路径，或旧的按目录存储的文件路径
+        legacy_dir: 旧文件所在目录（论文为 PAPERS_DIR，参考文献为团队的 references 目录）
+    """
+    if os.path.isabs(file_path):
+        return Path(file_path)
+    if is_blob_path(file_path):
+        return config.uploads / file_path
+    return legacy_dir / os.path.basename(file_path)
+
+
+def acquire_blob(session: Session, sha256: str, size: int, suffix: str = "") -> FileBlob:
+    """
+    blob 引用计数加一，不存在时创建记录（不提交）
+
+    记录用 INSERT ... ON CONFLICT DO NOTHING 创建，引用计数用 UPDATE 语句原子地增加，
+    多个进程或实例并发上传相同内容时不会重复创建记录或丢失计数。
+    """
+    session.execute(
+        insert_ignore(session, FileBlob).values(
+            sha256=sha256,
+            file_path=blob_relative_path(sha256, suffix),
+            size=size,
+            ref_count=0,
+            created_at=datetime.utcnow(),
+        )
+    )
+    session.execute(
+        update(FileBlob)
+        .where(col(FileBlob.sha256) == sha256)
+        .values(ref_count=col(FileBlob.ref_count) + 1)
+    )
+    return session.get_one(FileBlob, sha256, populate_existing=True)
+
+
+async def store_upload(session: AsyncSession, upload: UploadFile) -> FileBlob:
+    """
+    接收上传文件并存入 blob 存储，引用计数加一（异步会话，不提交）
+
+    文件在事务提交后才出现在 blob.file_path，内容已存在时不再写入，
+    事务未提交时删除临时文件。调用方把返回的 blob.file_path 赋给记录，
+    并对原来的文件调用 release_file。
+
+    Raises:
+        HTTPException: 超过大小上限（413）或写入失败（500）
+    """
+    suffix = os.path.splitext(upload.filename or "")[1].lower()
+    stored = await receive_upload(upload, BLOBS_DIR)
+    try:
+        blob = await session.run_sync(acquire_blob, stored.sha256, stored.size, suffix)
+    except Exception:
+        discard_upload(stored)
+        raise
+    # 临时文件在事务提交后才移动到 blob 路径，未提交时删除，不会留下没有记录的文件
+    session.info.setdefault(_UPLOADED_KEY, []).append(
+        (stored, config.uploads / blob.file_path)
+    )
+    return blob
+
+
+def release_file(
+    session: Session, file_path: Optional[str], legacy_dir: Path
+) -> None:
+    """
+    释放记录对文件的引用（不提交）
+
+    blob 的引用计数减一，降为 0 时删除记录和文件；旧的按目录存储的文件直接删除。
+    文件在事务提交后才真正删除。
+
+    Args:
+        file_path: 记录原来的 file_path，为空时不做任何操作
+        legacy_dir: 旧文件所在目录，见 resolve_file_path
+    """
+    if not file_path:
+        return
+    if not is_blob_path(file_path):
+        _remove_on_commit(session, resolve_file_path(file_path, legacy_dir))
+        return
+
+    sha256 = _blob_sha256(file_path)
+    session.execute(
+        update(FileBlob)
+        .where(col(FileBlob.sha256) == sha256)
+        .values(ref_count=col(FileBlob.ref_count) - 1)
+    )
+    _remove_unreferenced(session, [sha256])
+
+
+def release_files(
+    session: Session, file_paths: Iterable[Optional[str]], legacy_dir: Path
+) -> None:
+    """批量释放文件引用（不提交），用于批量删除记录之前"""
+    for file_path in file_paths:
+        release_file(session, file_path, legacy_dir)
+
+
+def _remove_unreferenced(session: Session, sha256s: List[str]) -> None:
+    """删除引用计数不大于 0 的 blob 记录及其提取的文本，文件在提交后删除"""
+    for batch in chunked(sha256s):
+        blobs = session.exec(
+            select(FileBlob).where(
+                col(FileBlob.sha256).in_(batch), col(FileBlob.ref_count) <= 0
+            )
+        ).all()
+        if not blobs:
+            continue
+        session.execute(
+            delete(FileText).where(
+                col(FileText.sha256).in_([blob.sha256 for blob in blobs])
+            )
+        )
+        for blob in blobs:
+            session.delete(blob)
+        session.flush()
+        for blob in blobs:
+            _remove_on_commit(session, config.uploads / blob.file_path)
+
+
+def _remove_on_commit(session: Session, path: Path) -> None:
+    """
+    将文件改名，事务提交后删除，未提交时恢复
+
+    改名在持有 blob 记录写锁时进行，并发上传相同内容的事务要等本事务结束
+    才能重新创建记录和文件，不会误删其他事务刚写入的文件。
+    """
+    if not path.exists():
+        return
+    removed = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.deleted")
+    os.replace(path, removed)
+    session.info.setdefault(_REMOVED_KEY, []).append((removed, path))
+
+
+@event.listens_for(Session, "after_commit", insert=True)
+def _publish_uploaded_files(session: Any) -> None:
+    """
+    事务提交后把上传的临时文件移动到 blob 路径，内容已存在时丢弃
+
+    排在其他 after_commit 钩子之前，提交后提交给文本提取的文件已经就位。
+    """
+    uploaded: List[Tuple[StoredUpload, Path]] = session.info.pop(_UPLOADED_KEY, [])
+    for stored, target in uploaded:
+        try:
+            if target.exists():
+                discard_upload(stored)
+            else:
+                publish_upload(stored, target)
+        except OSError:
+            # 事务已提交，无法再向请求报告错误
+            logger.exception("Failed to publish uploaded blob %s", target)
+            discard_upload(stored)
+
+
+@event.listens_for(Session, "after_commit")
+def _delete_removed_files(session: Any) -> None:
+    removed: List[Tuple[Path, Path]] = session.info.pop(_REMOVED_KEY, [])
+    for path, _ in removed:
+        if path.exists():
+            os.remove(path)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _restore_removed_files(session: Any, transaction: Any) -> None:
+    """
+    事务没有提交就结束时恢复改名的文件，删除上传的临时文件
+
+    包括回滚，以及出错后未提交就关闭会话（此时不触发 after_rollback）。
+    提交时文件列表已由 after_commit 钩子取走。
+    """
+    if transaction.parent is not None:
+        return
+    for stored, _ in session.info.pop(_UPLOADED_KEY, []):
+        discard_upload(stored)
+    removed: List[Tuple[Path, Path]] = session.info.pop(_REMOVED_KEY, [])
+    for path, original in reversed(removed):
+        if path.exists():
+            os.replace(path, original)
+
+
+def referenced_blob_counts(session: Session) -> Dict[str, int]:
+    """从 Paper 和 ReferencePaper 统计每个 blob 路径被引用的次数"""
+    counts: Dict[str, int] = defaultdict(int)
+    for model in (Paper, ReferencePaper):
+        rows = session.exec(
+            select(model.file_path, func.count())  # type: ignore
+            .where(col(model.file_path).startswith(BLOB_PREFIX))
+            .group_by(model.file_path)
+        ).all()
+        for file_path, count in rows:
+            counts[file_path] += count
+    return counts
+
+
+def count_blob_mismatches(session: Session) -> int:
+    """统计引用计数与实际引用不一致的 blob 数量（包括缺少记录和无引用的记录）"""
+    expected = {
+        _blob_sha256(path): count
+        for path, count in referenced_blob_counts(session).items()
+    }
+    actual = dict(session.exec(select(FileBlob.sha256, FileBlob.ref_count)).all())
+    return sum(
+        1
+        for sha256 in expected.keys() | actual.keys()
+        if expected.get(sha256, 0) != actual.get(sha256, 0)
+    )
+
+
+def rebuild_blob_refcounts(session: Session) -> int:
+    """
+    按实际引用重新计算引用计数（不提交），返回修正的 blob 数量
+
+    被引用但没有记录的 blob 补建记录，无引用的 blob 删除记录和文件。
+    """
+    expected: Dict[str, Tuple[str, int]] = {
+        _blob_sha256(path): (path, count)
+        for path, count in referenced_blob_counts(session).items()
+    }
+    blobs = {blob.sha256: blob for blob in session.exec(select(FileBlob)).all()}
+
+    fixed = 0
+    for sha256, (file_path, count) in expected.items():
+        blob = blobs.get(sha256)
+        if blob is None:
+            full_path = config.uploads / file_path
+            size = full_path.stat().st_size if full_path.exists() else 0
+            session.add(
+                FileBlob(sha256=sha256, file_path=file_path, size=size, ref_count=count)
+            )
+            fixed += 1
+        elif blob.ref_count != count:
+            blob.ref_count = count
+            session.add(blob)
+            fixed += 1
+
+    unreferenced = [sha256 for sha256 in blobs if sha256 not in expected]
+    for sha256 in unreferenced:
+        blobs[sha256].ref_count = 0
+        session.add(blobs[sha256])
+    session.flush()
+    _remove_unreferenced(session, unreferenced)
+    return fixed + len(unreferenced)
@@ -0,0 +1,126 @@
+"""
+按数据版本缓存的计算结果
+
+每个缓存范围（scope）登记它依赖的模型。这些模型的记录在事务中发生变化
+（包括 flush 的增删改和批量 INSERT/UPDATE/DELETE 语句）并提交后，
+该范围的数据版本加一，缓存随之失效。
+
+缓存只存在于当前进程，多进程部署时各进程分别缓存、分别失效
+（其他进程的修改不会使本进程的缓存失效）。
+"""
+
+import threading
+from collections import defaultdict
+from itertools import chain
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple, TypeVar
+
+from sqlalchemy import event
+from sqlmodel import Session
+
+T = TypeVar("T")
+
+# 模型 -> [(缓存范围, 修改时是否影响该范围的判断函数)]
+_SCOPES_OF_MODEL: Dict[type, List[Tuple[str, Optional[Callable[[Any], bool]]]]] = (
+    defaultdict(list)
+)
+
+_DIRTY_KEY = "cache_scopes_dirty"
+
+_cache: Dict[Tuple[str, Hashable], Any] = {}
+_version: Dict[str, int] = defaultdict(int)
+_lock = threading.Lock()
+
+
+def register_cache_scope(
+    scope: str,
+    *models: type,
+    changed: Optional[Callable[[Any], bool]] = None,
+) -> None:
+    """
+    登记缓存范围依赖的模型
+
+    Args:
+        scope: 缓存范围名称
+        models: 依赖的模型，其记录新增、删除或修改时缓存失效
+        changed: 可选，判断一条被修改的记录是否影响该范围（新增和删除总是影响）
+    """
+    for model in models:
+        _SCOPES_OF_MODEL[model].append((scope, changed))
+
+
+def cache_version(scope: str) -> int:
+    """当前进程中缓存范围的数据版本"""
+    with _lock:
+        return _version[scope]
+
+
+def invalidate_cache(*scopes: str) -> None:
+    """使指定范围的缓存失效"""
+    with _lock:
+        for scope in scopes:
+            _version[scope] += 1
+            for key in [k for k in _cache if k[0] == scope]:
+                del _cache[key]
+
+
+def cached(scope: str, key: Hashable, build: Callable[[], T]) -> T:
+    """读取缓存，不存在时调用 build 计算并缓存"""
+    with _lock:
+        if (scope, key) in _cache:
+            return _cache[(scope, key)]
+        version = _version[scope]
+
+    result = build()
+
+    with _lock:
+        # 计算期间缓存已失效时不写入，避免缓存旧数据
+        if _version[scope] == version:
+            _cache[(scope, key)] = result
+    return result
+
+
+def has_pending_changes(session: Any, scope: str) -> bool:
+    """会话中是否有尚未提交、会使该范围缓存失效的修改"""
+    return scope in session.info.get(_DIRTY_KEY, ())
+
+
+def _mark_dirty(session: Any, scopes: Set[str]) -> None:
+    if scopes:
+        session.info.setdefault(_DIRTY_KEY, set()).update(scopes)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session: Any, flush_context: Any) -> None:
+    dirty: Set[str] = set()
+    for obj in chain(session.new, session.deleted):
+        dirty.update(scope for scope, _ in _SCOPES_OF_MODEL.get(type(obj), ()))
+    for obj in session.dirty:
+        for scope, changed in _SCOPES_OF_MODEL.get(type(obj), ()):
+            if changed is None or changed(obj):
+                dirty.add(scope)
+    _mark_dirty(session, dirty)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_statement(state: Any) -> None:
+    """批量 INSERT/UPDATE/DELETE 语句不经过 flush，单独记录"""
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+    mapper = state.bind_mapper
+    if mapper is not None:
+        _mark_dirty(
+            state.session,
+            {scope for scope, _ in _SCOPES_OF_MODEL.get(mapper.class_, ())},
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Any) -> None:
+    scopes = session.info.pop(_DIRTY_KEY, None)
+    if scopes:
+        invalidate_cache(*scopes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Any) -> None:
+    session.info.pop(_DIRTY_KEY, None)
@@ -0,0 +1,137 @@
+"""
+分类树及统计
+
+一次查询读取全部分类，一次 GROUP BY 统计每个分类直接归属的条目数量，
+再在内存中自底向上汇总出子树数量并组装成树。
+
+结果按数据版本缓存（见 app.services.cache）：论文、参考文献的分类或分类本身
+发生变化的事务提交后，相应的缓存失效。
+"""
+
+from typing import Any, List, Tuple, Type
+
+from sqlalchemy import func, inspect
+from sqlmodel import Session, SQLModel, col, select
+
+from app.models.category import Category, CategoryClosure, CategoryTreeNode
+from app.models.paper import Paper
+from app.models.reference import (
+    ReferenceCategory,
+    ReferenceCategoryClosure,
+    ReferenceCategoryTreeNode,
+    ReferencePaper,
+)
+from app.services.cache import cached, invalidate_cache, register_cache_scope
+
+CATEGORY_TREE = "category"
+REFERENCE_CATEGORY_TREE = "reference_category"
+
+
+def _category_changed(item: Any) -> bool:
+    """条目只有分类变化时才影响统计"""
+    return inspect(item).attrs.category_id.history.has_changes()
+
+
+register_cache_scope(CATEGORY_TREE, Category, CategoryClosure)
+register_cache_scope(CATEGORY_TREE, Paper, changed=_category_changed)
+register_cache_scope(REFERENCE_CATEGORY_TREE, ReferenceCategory, ReferenceCategoryClosure)
+register_cache_scope(REFERENCE_CATEGORY_TREE, ReferencePaper, changed=_category_changed)
+
+
+def invalidate_tree_cache(*trees: str) -> None:
+    """使指定分类树的缓存失效（不指定时全部失效）"""
+    invalidate_cache(*(trees or (CATEGORY_TREE, REFERENCE_CATEGORY_TREE)))
+
+
+def _build_tree(
+    session: Session,
+    model: Type[SQLModel],
+    item_category_column: Any,
+    node_cls: Type[SQLModel],
+    count_field: str,
+    total_field: str,
+    *filters: Any,
+) -> List[Any]:
+    """读取分类并统计数量，返回根节点列表"""
+    categories = session.exec(
+        select(model).where(*filters).order_by(model.id)  # type: ignore
+    ).all()
+
+    # 每个分类直接归属的条目数量
+    direct_counts = dict(
+        session.exec(
+            select(item_category_column, func.count())
+            .join(model, col(model.id) == item_category_column)  # type: ignore
+            .where(*filters)
+            .group_by(item_category_column)
+        ).all()
+    )
+
+    nodes = {}
+    for category in categories:
+        # 只取列字段，不触发 children 等关系的懒加载
+        node = node_cls.model_validate(category.model_dump())
+        setattr(node, count_field, direct_counts.get(category.id, 0))
+        nodes[category.id] = node
+
+    roots = []
+    for node in nodes.values():
+        parent = nodes.get(node.parent_id) if node.parent_id else None
+        if parent is not None and parent is not node:
+            parent.children.append(node)
+        else:
+            roots.append(node)
+
+    # 自底向上汇总子树数量（后序遍历，visited 防止异常数据中的环）
+    visited = set()
+    stack: List[Tuple[Any, bool]] = [(root, False) for root in roots]
+    while stack:
+        node, children_done = stack.pop()
+        if children_done:
+            total = getattr(node, count_field) + sum(
+                getattr(child, total_field) for child in node.children
+            )
+            setattr(node, total_field, total)
+            continue
+        if node.id in visited:
+            continue
+        visited.add(node.id)
+        stack.append((node, True))
+        stack.extend((child, False) for child in node.children)
+
+    return roots
+
+
+def get_category_tree(session: Session) -> List[CategoryTreeNode]:
+    """获取完整的论文分类树"""
+    return cached(
+        CATEGORY_TREE,
+        None,
+        lambda: _build_tree(
+            session,
+            Category,
+            Paper.category_id,
+            CategoryTreeNode,
+            "paper_count",
+            "total_paper_count",
+        ),
+    )
+
+
+def get_reference_category_tree(
+    session: Session, team_id: int
+) -> List[ReferenceCategoryTreeNode]:
+    """获取团队的参考文献分类树"""
+    return cached(
+        REFERENCE_CATEGORY_TREE,
+        team_id,
+        lambda: _build_tree(
+            session,
+            ReferenceCategory,
+            ReferencePaper.category_id,
+            ReferenceCategoryTreeNode,
+            "reference_count",
+            "total_reference_count",
+            ReferenceCategory.team_id == team_id,
+        ),
+    )
@@ -0,0 +1,180 @@
+"""
+分类树闭包表维护
+
+Category 与 ReferenceCategory 各有一张闭包表，记录每个节点与其所有祖先的关系
+（包括自身，depth 为 0）。子树查询、子树计数因此只需一次带索引的查询，
+无需逐层递归。闭包表在分类的创建、移动、删除时同步更新。
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Type
+
+from sqlalchemy import delete, func, insert, literal, true
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, SQLModel, col, select
+
+
+def add_node(
+    session: Session, closure: Type[SQLModel], node_id: int, parent_id: Optional[int]
+) -> None:
+    """新建分类后调用：添加自身关系，并继承父分类的所有祖先"""
+    session.add(closure(ancestor_id=node_id, descendant_id=node_id, depth=0))
+    if parent_id:
+        session.execute(
+            insert(closure).from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(
+                    closure.ancestor_id,  # type: ignore
+                    literal(node_id),
+                    closure.depth + 1,  # type: ignore
+                ).where(closure.descendant_id == parent_id),  # type: ignore
+            )
+        )
+
+
+def move_node(
+    session: Session,
+    closure: Type[SQLModel],
+    node_id: int,
+    new_parent_id: Optional[int],
+) -> None:
+    """修改父分类后调用：将整棵子树从原祖先下摘除，再挂到新父分类下"""
+    subtree = descendant_ids(session, closure, node_id)
+
+    # 删除子树与子树外祖先之间的关系
+    session.execute(
+        delete(closure).where(
+            col(closure.descendant_id).in_(subtree),  # type: ignore
+            col(closure.ancestor_id).not_in(subtree),  # type: ignore
+        )
+    )
+
+    if new_parent_id:
+        # 新父分类的每个祖先 × 子树中的每个节点
+        parent_links = aliased(closure)
+        subtree_links = aliased(closure)
+        session.execute(
+            insert(closure).from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(
+                    parent_links.ancestor_id,  # type: ignore
+                    subtree_links.descendant_id,  # type: ignore
+                    parent_links.depth + subtree_links.depth + 1,  # type: ignore
+                )
+                .select_from(parent_links)
+                .join(subtree_links, true())
+                .where(
+                    parent_links.descendant_id == new_parent_id,  # type: ignore
+                    subtree_links.ancestor_id == node_id,  # type: ignore
+                ),
+            )
+        )
+
+
+def remove_nodes(
+    session: Session, closure: Type[SQLModel], node_ids: Iterable[int]
+) -> None:
+    """删除分类前调用：移除与这些节点相关的所有关系"""
+    ids = list(node_ids)
+    if not ids:
+        return
+    session.execute(
+        delete(closure).where(
+            col(closure.descendant_id).in_(ids)  # type: ignore
+            | col(closure.ancestor_id).in_(ids)  # type: ignore
+        )
+    )
+
+
+def descendant_ids(session: Session, closure: Type[SQLModel], node_id: int) -> List[int]:
+    """获取分类及其所有子分类的ID列表"""
+    ids = session.exec(
+        select(closure.descendant_id).where(closure.ancestor_id == node_id)  # type: ignore
+    ).all()
+    # 闭包表中没有该节点（分类不存在）时与原递归实现一致，返回自身
+    return list(ids) or [node_id]
+
+
+def ancestor_ids(session: Session, closure: Type[SQLModel], node_id: int) -> List[int]:
+    """获取分类及其所有父分类的ID列表（由近及远）"""
+    ids = session.exec(
+        select(closure.ancestor_id)  # type: ignore
+        .where(closure.descendant_id == node_id)  # type: ignore
+        .order_by(closure.depth)  # type: ignore
+    ).all()
+    return list(ids) or [node_id]
+
+
+def subtree_counts(
+    session: Session,
+    closure: Type[SQLModel],
+    item_category_column: Any,
+    node_ids: Iterable[int],
+) -> Dict[int, int]:
+    """
+    一次查询统计多个分类子树下的条目数量
+
+    Args:
+        closure: 闭包表模型
+        item_category_column: 条目表的分类外键列，如 Paper.category_id
+        node_ids: 需要统计的分类ID
+
+    Returns:
+        分类ID -> 该分类及其所有子分类下的条目数量（无条目的分类不在结果中）
+    """
+    ids = list(node_ids)
+    if not ids:
+        return {}
+    rows = session.exec(
+        select(closure.ancestor_id, func.count())  # type: ignore
+        .join(
+            item_category_column.class_,
+            col(item_category_column) == closure.descendant_id,  # type: ignore
+        )
+        .where(col(closure.ancestor_id).in_(ids))  # type: ignore
+        .group_by(closure.ancestor_id)  # type: ignore
+    ).all()
+    return {ancestor_id: count for ancestor_id, count in rows}
+
+
+def rebuild_closure(
+    session: Session, model: Type[SQLModel], closure: Type[SQLModel]
+) -> None:
+    """根据 parent_id 重新生成整张闭包表（用于已有数据的迁移和一致性修复）"""
+    parents = {
+        node_id: parent_id
+        for node_id, parent_id in session.exec(
+            select(model.id, model.parent_id)  # type: ignore
+        ).all()
+    }
+
+    rows = []
+    for node_id in parents:
+        ancestor, depth, seen = node_id, 0, set()
+        while ancestor is not None and ancestor in parents and ancestor not in seen:
+            seen.add(ancestor)
+            rows.append({"ancestor_id": ancestor, "descendant_id": node_id, "depth": depth})
+            ancestor, depth = parents[ancestor], depth + 1
+
+    session.execute(delete(closure))
+    if rows:
+        session.execute(insert(closure), rows)
+
+
+def sync_closures(session: Session) -> None:
+    """闭包表与分类表不一致时重建（如升级前已存在的分类数据）"""
+    from app.models.category import Category, CategoryClosure
+    from app.models.reference import ReferenceCategory, ReferenceCategoryClosure
+
+    for model, closure in (
+        (Category, CategoryClosure),
+        (ReferenceCategory, ReferenceCategoryClosure),
+    ):
+        node_count = session.exec(select(func.count()).select_from(model)).one()
+        self_links = session.exec(
+            select(func.count())
+            .select_from(closure)
+            .where(closure.depth == 0)  # type: ignore
+        ).one()
+        if node_count != self_links:
+            rebuild_closure(session, model, closure)
+    session.commit()
@@ -0,0 +1,445 @@
+"""
+作者合作图
+
+coauthorship 表保存每对作者在每个团队中的合作论文数及最早、最近合作年份，
+每对作者只保存一行（author_id < coauthor_id）。论文作者、发表日期或团队变化时，
+只重新计算这些论文修改前后涉及的作者对。
+
+多跳邻域和最短合作路径按层展开，每层对当前边界做一次批量查询，
+查询量只与经过的节点数有关，与作者总数无关。
+"""
+
+from itertools import combinations
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, delete, extract, func, insert, tuple_
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, col, select
+
+from app.models.author import Author, Coauthorship
+from app.models.paper import Paper, PaperAuthor
+from app.services.hydration import chunked
+
+_EDGE_COLUMNS = [
+    "author_id",
+    "coauthor_id",
+    "team_id",
+    "paper_count",
+    "first_year",
+    "last_year",
+]
+
+# (作者, 合作者, 合作论文数, 最早合作年份, 最近合作年份)
+NeighborRow = Tuple[int, int, int, Optional[int], Optional[int]]
+
+
+def _author_links() -> Tuple[Any, Any, Any]:
+    """
+    同一篇论文的两条作者关联 (first, second, 连接条件)，second 的作者ID较大
+
+    别名在调用时创建，避免导入本模块时提前配置映射。
+    """
+    first = aliased(PaperAuthor, name="first_author")
+    second = aliased(PaperAuthor, name="second_author")
+    on = and_(
+        second.paper_id == first.paper_id,
+        second.author_id > first.author_id,
+    )
+    return first, second, on
+
+
+def _edge_source(pairs: Optional[List[Tuple[int, int]]] = None) -> Any:
+    """
+    从 PaperAuthor 计算合作关系的查询，列顺序与 _EDGE_COLUMNS 一致
+
+    Args:
+        pairs: 只计算这些作者对（较小ID在前），不指定时计算全部
+    """
+    first, second, on = _author_links()
+    year = extract("year", col(Paper.publication_date))
+    query = (
+        select(
+            first.author_id,
+            second.author_id,
+            Paper.team_id,
+            func.count(),
+            func.min(year),
+            func.max(year),
+        )
+        .join(second, on)
+        .join(Paper, col(Paper.id) == first.paper_id)
+        .group_by(first.author_id, second.author_id, Paper.team_id)
+    )
+    if pairs is not None:
+        # 单独的 IN 条件使 first 可以使用 author_id 索引
+        query = query.where(
+            col(first.author_id).in_({a for a, _ in pairs}),
+            tuple_(first.author_id, second.author_id).in_(pairs),
+        )
+    return query
+
+
+def paper_author_ids(session: Session, paper_ids: Iterable[int]) -> Set[int]:
+    """
+    获取论文当前的作者ID
+
+    在修改或删除论文作者之前调用，结果作为 refresh_coauthorships 的 previous_author_ids。
+    """
+    author_ids: Set[int] = set()
+    for batch in chunked(list(dict.fromkeys(paper_ids))):
+        author_ids.update(
+            session.exec(
+                select(PaperAuthor.author_id).where(col(PaperAuthor.paper_id).in_(batch))
+            ).all()
+        )
+    return author_ids
+
+
+def refresh_coauthorships(
+    session: Session,
+    paper_ids: Iterable[int],
+    previous_author_ids: Iterable[int] = (),
+) -> None:
+    """
+    重新计算指定论文涉及的作者对（不提交）
+
+    Args:
+        paper_ids: 作者、发表日期或团队发生变化的论文（新建、修改、删除）
+        previous_author_ids: 修改或删除前这些论文的作者ID（见 paper_author_ids），
+            用于更新被移除的作者之间的合作关系；新建论文时不需要
+    """
+    pairs: Set[Tuple[int, int]] = set(
+        combinations(sorted(set(previous_author_ids)), 2)
+    )
+    first, second, on = _author_links()
+    for batch in chunked(list(dict.fromkeys(paper_ids))):
+        pairs.update(
+            session.exec(
+                select(first.author_id, second.author_id)
+                .join(second, on)
+                .where(col(first.paper_id).in_(batch))
+            ).all()
+        )
+
+    for batch in chunked(sorted(pairs)):  # type: ignore
+        session.execute(
+            delete(Coauthorship).where(
+                col(Coauthorship.author_id).in_({a for a, _ in batch}),
+                tuple_(Coauthorship.author_id, Coauthorship.coauthor_id).in_(batch),
+            )
+        )
+        session.execute(
+            insert(Coauthorship).from_select(
+                _EDGE_COLUMNS,
+                _edge_source(batch),  # type: ignore
+            )
+        )
+
+
+def rebuild_coauthorships(session: Session) -> None:
+    """从 PaperAuthor 完整重建合作关系（不提交）"""
+    session.execute(delete(Coauthorship))
+    session.execute(insert(Coauthorship).from_select(_EDGE_COLUMNS, _edge_source()))
+
+
+def count_coauthorship_mismatches(session: Session) -> int:
+    """统计合作关系与源数据不一致的行数（多出的行 + 缺少的行）"""
+    stored = select(*[getattr(Coauthorship, c) for c in _EDGE_COLUMNS])
+    source = _edge_source()
+    stale = session.exec(
+        select(func.count()).select_from(stored.except_(source).subquery())
+    ).one()
+    missing = session.exec(
+        select(func.count()).select_from(source.except_(stored).subquery())
+    ).one()
+    return stale + missing
+
+
+def sync_coauthorships(session: Session) -> None:
+    """合作关系行数与源数据不一致时重建（如升级前已存在的论文数据）"""
+    stored_count = session.exec(select(func.count()).select_from(Coauthorship)).one()
+    source_count = session.exec(
+        select(func.count()).select_from(_edge_source().subquery())
+    ).one()
+    if stored_count != source_count:
+        rebuild_coauthorships(session)
+    session.commit()
+
+
+def _neighbor_rows(
+    session: Session, author_ids: Iterable[int], team_id: Optional[int] = None
+) -> List[NeighborRow]:
+    """
+    批量获取作者的所有合作者
+
+    不指定团队时合并各团队的合作论文数。
+    """
+    rows: List[NeighborRow] = []
+    directions = (
+        (Coauthorship.author_id, Coauthorship.coauthor_id),
+        (Coauthorship.coauthor_id, Coauthorship.author_id),
+    )
+    for batch in chunked(list(dict.fromkeys(author_ids))):
+        for own, other in directions:
+            query = (
+                select(
+                    own,
+                    other,
+                    func.sum(Coauthorship.paper_count),
+                    func.min(Coauthorship.first_year),
+                    func.max(Coauthorship.last_year),
+                )
+                .where(col(own).in_(batch))
+                .group_by(own, other)
+            )
+            if team_id is not None:
+                query = query.where(Coauthorship.team_id == team_id)
+            rows.extend(session.exec(query).all())  # type: ignore
+    return rows
+
+
+def _author_names(session: Session, author_ids: Iterable[int]) -> Dict[int, str]:
+    names: Dict[int, str] = {}
+    for batch in chunked(list(dict.fromkeys(author_ids))):
+        names.update(
+            session.exec(
+                select(Author.id, Author.name).where(col(Author.id).in_(batch))
+            ).all()
+        )
+    return names
+
+
+def _edge_dict(
+    source: int,
+    target: int,
+    paper_count: int,
+    first_year: Optional[int],
+    last_year: Optional[int],
+) -> Dict[str, Any]:
+    return {
+        "source": source,
+        "target": target,
+        "paper_count": paper_count,
+        "first_year": first_year,
+        "last_year": last_year,
+    }
+
+
+def get_top_collaborators(
+    session: Session,
+    author_id: int,
+    limit: Optional[int] = 10,
+    team_id: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """获取作者合作论文最多的合作者（按合作论文数降序）"""
+    rows = sorted(
+        _neighbor_rows(session, [author_id], team_id), key=lambda r: (-r[2], r[1])
+    )
+    if limit:
+        rows = rows[:limit]
+    names = _author_names(session, [row[1] for row in rows])
+    return [
+        {
+            "author_id": other,
+            "name": names.get(other),
+            "paper_count": paper_count,
+            "first_year": first_year,
+            "last_year": last_year,
+        }
+        for _, other, paper_count, first_year, last_year in rows
+    ]
+
+
+def get_author_neighborhood(
+    session: Session,
+    author_id: int,
+    hops: int = 2,
+    max_nodes: int = 500,
+    team_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    获取作者 k 跳以内的合作网络
+
+    逐层展开，每层按合作论文数从多到少加入节点；节点数达到 max_nodes 时停止，
+    并将 truncated 置为 True。返回的边包含所有节点之间的合作关系。
+    """
+    distance = {author_id: 0}
+    frontier = [author_id]
+    truncated = False
+    for hop in range(1, hops + 1):
+        next_frontier = []
+        rows = sorted(
+            _neighbor_rows(session, frontier, team_id), key=lambda r: (-r[2], r[1])
+        )
+        for _, other, *_ in rows:
+            if other in distance:
+                continue
+            if len(distance) >= max_nodes:
+                truncated = True
+                break
+            distance[other] = hop
+            next_frontier.append(other)
+        if truncated or not next_frontier:
+            break
+        frontier = next_frontier
+
+    # 节点之间的边：每条边只在较小的作者ID一侧保存一次
+    edges = []
+    for batch in chunked(list(distance)):
+        query = (
+            select(
+                Coauthorship.author_id,
+                Coauthorship.coauthor_id,
+                func.sum(Coauthorship.paper_count),
+                func.min(Coauthorship.first_year),
+                func.max(Coauthorship.last_year),
+            )
+            .where(col(Coauthorship.author_id).in_(batch))
+            .group_by(Coauthorship.author_id, Coauthorship.coauthor_id)
+        )
+        if team_id is not None:
+            query = query.where(Coauthorship.team_id == team_id)
+        edges.extend(
+            _edge_dict(*row)
+            for row in session.exec(query).all()
+            if row[1] in distance
+        )
+
+    names = _author_names(session, distance)
+    return {
+        "author_id": author_id,
+        "hops": hops,
+        "truncated": truncated,
+        "nodes": [
+            {"author_id": node, "name": names.get(node), "hop": hop}
+            for node, hop in distance.items()
+        ],
+        "edges": edges,
+    }
+
+
+def find_collaboration_path(
+    session: Session,
+    source_id: int,
+    target_id: int,
+    max_hops: int = 6,
+    team_id: Optional[int] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    查找两位作者之间最短的合作路径（双向广度优先搜索）
+
+    每次展开两侧中较小的边界，两侧相遇时在该层所有相遇点中取最短路径。
+
+    Returns:
+        路径上的作者列表（从 source 到 target，每项带与下一位作者的合作论文数），
+        超过 max_hops 仍未找到时返回 None
+    """
+    if source_id == target_id:
+        names = _author_names(session, [source_id])
+        return [
+            {"author_id": source_id, "name": names.get(source_id), "paper_count": None}
+        ]
+
+    # 每侧：作者 -> (父节点, 与父节点的合作论文数, 距离)
+    parents: List[Dict[int, Tuple[Optional[int], Optional[int], int]]] = [
+        {source_id: (None, None, 0)},
+        {target_id: (None, None, 0)},
+    ]
+    frontiers = [[source_id], [target_id]]
+
+    meeting = None
+    for _ in range(max_hops):
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        if not frontiers[side]:
+            return None
+        visited, other_side = parents[side], parents[1 - side]
+
+        best_length = None
+        next_frontier = []
+        for node, neighbor, paper_count, _, _ in _neighbor_rows(
+            session, frontiers[side], team_id
+        ):
+            depth = visited[node][2] + 1
+            if neighbor in other_side:
+                length = depth + other_side[neighbor][2]
+                if best_length is None or length < best_length:
+                    best_length = length
+                    meeting = (side, node, neighbor, paper_count)
+            if neighbor not in visited:
+                visited[neighbor] = (node, paper_count, depth)
+                next_frontier.append(neighbor)
+
+        if meeting is not None:
+            break
+        frontiers[side] = next_frontier
+    else:
+        return None
+
+    side, node, neighbor, paper_count = meeting
+    source_tree, target_tree = parents
+    # 相遇的边：near 在起点一侧，far 在终点一侧
+    near, far = (node, neighbor) if side == 0 else (neighbor, node)
+
+    ids: List[int] = []
+    current: Optional[int] = near
+    while current is not None:  # near 回溯到起点
+        ids.append(current)
+        current = source_tree[current][0]
+    ids.reverse()
+    # 起点一侧：与下一位作者的合作论文数记录在下一位作者上
+    counts: List[Optional[int]] = [source_tree[author][1] for author in ids[1:]]
+    counts.append(paper_count)
+
+    current = far
+    while current is not None:  # far 回溯到终点
+        parent, count, _ = target_tree[current]
+        ids.append(current)
+        counts.append(count)
+        current = parent
+    # 终点一侧：记录的是与父节点（即路径上的下一位作者）的合作论文数，终点为 None
+
+    names = _author_names(session, ids)
+    return [
+        {"author_id": author, "name": names.get(author), "paper_count": count}
+        for author, count in zip(ids, counts)
+    ]
+
+
+def get_team_collaboration_graph(
+    session: Session, team_id: int, min_papers: int = 1
+) -> Dict[str, Any]:
+    """
+    获取团队的完整合作图
+
+    节点为在该团队有论文的作者（带团队内论文数），边为团队论文中的合作关系，
+    只保留合作论文数不少于 min_papers 的边。
+    """
+    nodes = [
+        {"author_id": author_id, "name": name, "paper_count": paper_count}
+        for author_id, name, paper_count in session.exec(
+            select(Author.id, Author.name, func.count())
+            .join(PaperAuthor, col(PaperAuthor.author_id) == Author.id)
+            .join(Paper, col(Paper.id) == PaperAuthor.paper_id)
+            .where(Paper.team_id == team_id)
+            .group_by(col(Author.id))
+            .order_by(col(Author.id))
+        ).all()
+    ]
+    edges = [
+        _edge_dict(
+            edge.author_id,
+            edge.coauthor_id,
+            edge.paper_count,
+            edge.first_year,
+            edge.last_year,
+        )
+        for edge in session.exec(
+            select(Coauthorship)
+            .where(
+                Coauthorship.team_id == team_id,
+                Coauthorship.paper_count >= min_papers,
+            )
+            .order_by(col(Coauthorship.author_id), col(Coauthorship.coauthor_id))
+        ).all()
+    ]
+    return {"team_id": team_id, "nodes": nodes, "edges": edges}
@@ -0,0 +1,130 @@
+"""
+文件下载
+
+下载接口和 /media 共用的文件响应：
+
+- ETag：blob 的文件名就是内容的 SHA-256，直接作为强 ETag；
+  旧的按目录存储的文件使用由修改时间和大小生成的 ETag
+- 条件请求：If-None-Match（优先）或 If-Modified-Since 命中时返回 304，不发送文件内容
+- 分段请求：Range / If-Range 由 FileResponse 处理，返回 206，PDF 阅读器可以按需加载页面
+- 缓存策略：/media/blobs 下的文件内容永不改变，浏览器可以长期缓存；
+  下载接口的 URL 对应的文件可能被替换，浏览器每次使用前向服务器验证（命中时为 304）
+"""
+
+import os
+import re
+from email.utils import parsedate
+from pathlib import Path
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.services.blobs import BLOBS_DIR
+
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+_SHA256_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+
+def content_etag(path: Path) -> Optional[str]:
+    """blob 文件的 ETag（内容的 SHA-256），其他文件返回 None"""
+    # 按 blobs/{前两位}/{sha256} 的结构判断，StaticFiles 传入的路径可能已解析符号链接
+    sha256 = path.stem
+    if (
+        _SHA256_PATTERN.fullmatch(sha256)
+        and path.parent.name == sha256[:2]
+        and path.parent.parent.name == BLOBS_DIR.name
+    ):
+        return f'"{sha256}"'
+    return None
+
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request_headers: Headers, response_headers: Headers) -> bool:
+    """
+    条件请求是否可以返回 304
+
+    有 If-None-Match 时只按 ETag 判断（弱比较），忽略 If-Modified-Since。
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        etag = response_headers.get("etag")
+        tags = {_opaque_tag(tag) for tag in if_none_match.split(",")}
+        return "*" in tags or (etag is not None and _opaque_tag(etag) in tags)
+
+    if_modified_since = parsedate(request_headers.get("if-modified-since", ""))
+    last_modified = parsedate(response_headers.get("last-modified", ""))
+    return (
+        if_modified_since is not None
+        and last_modified is not None
+        and if_modified_since >= last_modified
+    )
+
+
+def file_response(
+    path: Path,
+    request_headers: Headers,
+    filename: Optional[str] = None,
+    media_type: Optional[str] = None,
+    cache_control: str = REVALIDATE_CACHE_CONTROL,
+    stat_result: Optional[os.stat_result] = None,
+) -> Response:
+    """
+    返回文件内容，支持条件请求和分段请求
+
+    Args:
+        path: 文件路径
+        request_headers: 请求头
+        filename: 下载文件名，指定时以附件形式返回
+        media_type: 内容类型，默认按扩展名推断
+        cache_control: Cache-Control 响应头
+        stat_result: 已获取的文件状态，省略时读取
+
+    Raises:
+        FileNotFoundError: 文件不存在
+    """
+    headers = {"cache-control": cache_control}
+    etag = content_etag(path)
+    if etag:
+        headers["etag"] = etag
+    response = FileResponse(
+        path,
+        headers=headers,
+        media_type=media_type,
+        filename=filename,
+        stat_result=stat_result or os.stat(path),
+    )
+    if is_not_modified(request_headers, response.headers):
+        return NotModifiedResponse(response.headers)
+    return response
+
+
+class MediaFiles(StaticFiles):
+    """/media 静态文件：blob 使用内容 ETag 并允许长期缓存"""
+
+    def file_response(
+        self,
+        full_path: "os.PathLike[str] | str",
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        if status_code != 200:
+            return super().file_response(full_path, stat_result, scope, status_code)
+        path = Path(full_path)
+        return file_response(
+            path,
+            Headers(scope=scope),
+            cache_control=(
+                IMMUTABLE_CACHE_CONTROL if content_etag(path) else REVALIDATE_CACHE_CONTROL
+            ),
+            stat_result=stat_result,
+        )
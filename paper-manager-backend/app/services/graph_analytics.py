@@ -0,0 +1,357 @@
+"""
+合作网络分析
+
+从 coauthorship 表一次读取全部合作关系，构建 CSR 邻接矩阵（NumPy 数组：
+indptr、indices、weights，每条无向边在两端各存一次），再批量计算：
+
+- 度中心性：合作者数量及合作论文总数
+- 介数中心性：Brandes 算法，每个源点的广度优先搜索按层向量化；
+  节点较多时随机抽取固定数量的源点估算
+- 连通分量：最小标签传播配合指针跳跃
+- 社区发现：加权标签传播，并给出模块度
+
+结果按数据版本缓存（见 app.services.cache），合作关系变化的事务提交后失效。
+"""
+
+from itertools import chain
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, inspect
+from sqlmodel import Session, col, select
+
+from app.models.author import Author, Coauthorship
+from app.models.paper import Paper, PaperAuthor
+from app.services.cache import cache_version, cached, register_cache_scope
+
+COLLABORATION_GRAPH = "collaboration_graph"
+
+# 节点数超过该值时，介数中心性改为抽样估算
+BETWEENNESS_SAMPLES = 64
+
+# 标签传播的最大迭代次数
+MAX_LABEL_ITERATIONS = 30
+
+# 固定随机种子，保证同一数据版本的结果一致
+RANDOM_SEED = 0
+
+
+def _team_changed(paper: Any) -> bool:
+    """论文只有团队变化时才影响团队合作网络的节点"""
+    return inspect(paper).attrs.team_id.history.has_changes()
+
+
+register_cache_scope(COLLABORATION_GRAPH, Coauthorship, Author, PaperAuthor)
+register_cache_scope(COLLABORATION_GRAPH, Paper, changed=_team_changed)
+
+
+class CollaborationGraph:
+    """合作网络的 CSR 邻接表示，节点按作者ID升序编号"""
+
+    def __init__(
+        self,
+        author_ids: np.ndarray,
+        sources: np.ndarray,
+        targets: np.ndarray,
+        weights: np.ndarray,
+    ):
+        """
+        Args:
+            author_ids: 全部节点的作者ID（升序）
+            sources / targets / weights: 每条无向边一行（作者ID及合作论文数）
+        """
+        self.author_ids = author_ids
+        n = len(author_ids)
+        src = np.searchsorted(author_ids, sources)
+        dst = np.searchsorted(author_ids, targets)
+
+        # 两个方向各存一次，按起点排序
+        rows = np.concatenate([src, dst])
+        cols = np.concatenate([dst, src])
+        order = np.argsort(rows, kind="stable")
+        self.indices = cols[order].astype(np.int64)
+        self.weights = np.concatenate([weights, weights])[order].astype(np.float64)
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=self.indptr[1:])
+
+    @property
+    def node_count(self) -> int:
+        return len(self.author_ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices) // 2
+
+    def degrees(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def strengths(self) -> np.ndarray:
+        """加权度（合作论文总数）"""
+        return np.bincount(
+            self.edge_rows(), weights=self.weights, minlength=self.node_count
+        )
+
+    def edge_rows(self) -> np.ndarray:
+        """每条有向边的起点"""
+        return np.repeat(np.arange(self.node_count), self.degrees())
+
+    def expand(self, nodes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """返回 nodes 的全部出边 (起点, 终点)"""
+        starts = self.indptr[nodes]
+        counts = self.indptr[nodes + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        positions = np.arange(total) + offsets
+        return np.repeat(nodes, counts), self.indices[positions]
+
+
+def _team_author_ids(team_id: int) -> Any:
+    """在团队中有论文的作者ID（子查询）"""
+    return (
+        select(PaperAuthor.author_id)
+        .join(Paper, col(Paper.id) == PaperAuthor.paper_id)
+        .where(Paper.team_id == team_id)
+    )
+
+
+def _rank_by_size(labels: np.ndarray) -> np.ndarray:
+    """将分组标签重新编号为 0, 1, 2, ...，按组的大小降序（大小相同时按原标签）"""
+    _, groups, sizes = np.unique(labels, return_inverse=True, return_counts=True)
+    rank = np.empty(len(sizes), dtype=np.int64)
+    rank[np.lexsort((np.arange(len(sizes)), -sizes))] = np.arange(len(sizes))
+    return rank[groups]
+
+
+def load_collaboration_graph(
+    session: Session, team_id: Optional[int] = None
+) -> CollaborationGraph:
+    """
+    读取合作网络
+
+    Args:
+        team_id: 只包含该团队论文的作者及合作关系，不指定时包含全部作者
+    """
+    if team_id is None:
+        author_ids = session.exec(select(Author.id).order_by(col(Author.id))).all()
+    else:
+        author_ids = session.exec(
+            _team_author_ids(team_id).distinct().order_by(col(PaperAuthor.author_id))
+        ).all()
+
+    query = select(
+        Coauthorship.author_id,
+        Coauthorship.coauthor_id,
+        func.sum(Coauthorship.paper_count),
+    ).group_by(Coauthorship.author_id, Coauthorship.coauthor_id)
+    if team_id is not None:
+        query = query.where(Coauthorship.team_id == team_id)
+    # 直接从结果行展开为一维数组，比逐行构造 NumPy 数组快得多
+    edges = np.fromiter(
+        chain.from_iterable(session.exec(query).all()), dtype=np.int64
+    ).reshape(-1, 3)
+
+    return CollaborationGraph(
+        np.array(author_ids, dtype=np.int64), edges[:, 0], edges[:, 1], edges[:, 2]
+    )
+
+
+def connected_components(graph: CollaborationGraph) -> np.ndarray:
+    """
+    连通分量编号，按分量大小从大到小编号为 0, 1, 2, ...
+
+    每轮取自身与邻居标签的最小值，再做指针跳跃（label = label[label]）加速收敛。
+    """
+    labels = np.arange(graph.node_count)
+    if graph.edge_count == 0:
+        return _rank_by_size(labels)
+    rows = graph.edge_rows()
+    while True:
+        previous = labels
+        neighbor_min = labels.copy()
+        np.minimum.at(neighbor_min, rows, labels[graph.indices])
+        labels = np.minimum(labels, neighbor_min)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+        if np.array_equal(labels, previous):
+            return _rank_by_size(labels)
+
+
+def betweenness_centrality(
+    graph: CollaborationGraph, samples: int = BETWEENNESS_SAMPLES
+) -> np.ndarray:
+    """
+    归一化的介数中心性（不考虑边权）
+
+    节点数不超过 samples 时精确计算，否则随机抽取 samples 个源点并按比例放大估算。
+    """
+    n = graph.node_count
+    centrality = np.zeros(n)
+    if n < 3 or graph.edge_count == 0:
+        return centrality
+
+    if n <= samples:
+        sources = np.arange(n)
+    else:
+        rng = np.random.default_rng(RANDOM_SEED)
+        sources = rng.choice(n, size=samples, replace=False)
+
+    for source in sources:
+        distance = np.full(n, -1, dtype=np.int64)
+        sigma = np.zeros(n)  # 最短路径数
+        distance[source] = 0
+        sigma[source] = 1.0
+
+        # 按层广度优先搜索，统计最短路径数。下一层的节点此前都未访问，
+        # 因此指向未访问节点的边恰好是最短路径上的边，记录下来供回溯使用
+        frontier = np.array([source])
+        depth = 0
+        dag_edges = []
+        while True:
+            tails, heads = graph.expand(frontier)
+            on_path = distance[heads] < 0
+            if not on_path.any():
+                break
+            tails, heads = tails[on_path], heads[on_path]
+            depth += 1
+            distance[heads] = depth
+            sigma += np.bincount(heads, weights=sigma[tails], minlength=n)
+            dag_edges.append((tails, heads))
+            frontier = np.unique(heads)
+
+        # 自底向上累加依赖度
+        delta = np.zeros(n)
+        for tails, heads in reversed(dag_edges):
+            delta += np.bincount(
+                tails,
+                weights=sigma[tails] / sigma[heads] * (1.0 + delta[heads]),
+                minlength=n,
+            )
+        delta[source] = 0.0
+        centrality += delta
+
+    # 无向图每条路径被两个端点各计算一次；抽样时按比例放大
+    centrality *= n / len(sources) / 2.0
+    return centrality / ((n - 1) * (n - 2) / 2.0)
+
+
+def detect_communities(graph: CollaborationGraph) -> np.ndarray:
+    """
+    加权标签传播社区发现
+
+    每轮随机选取一半节点，将其标签更新为邻居中合作论文数之和最大的标签
+    （并列时保留当前标签，否则取较小的标签），只更新一半节点可避免同步更新时的振荡。
+
+    Returns:
+        社区编号，按社区规模从大到小编号为 0, 1, 2, ...
+    """
+    n = graph.node_count
+    labels = np.arange(n)
+    if graph.edge_count == 0:
+        return _rank_by_size(labels)
+
+    rng = np.random.default_rng(RANDOM_SEED)
+    rows = graph.edge_rows()
+    for _ in range(MAX_LABEL_ITERATIONS):
+        # 按 (节点, 邻居标签) 排序后分段求和，得到每个节点各候选标签的权重
+        keys = rows * n + labels[graph.indices]
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        scores = np.add.reduceat(graph.weights[order], starts)
+        nodes, candidates = np.divmod(keys[starts], n)
+        # 当前标签加 0.5，使并列时保留当前标签
+        scores += 0.5 * (candidates == labels[nodes])
+
+        # 每个节点取得分最高的候选（已按标签升序，取第一个）
+        node_starts = np.flatnonzero(np.r_[True, nodes[1:] != nodes[:-1]])
+        node_max = np.maximum.reduceat(scores, node_starts)
+        is_max = scores == np.repeat(node_max, np.diff(np.r_[node_starts, len(nodes)]))
+        winners = np.flatnonzero(is_max)
+        winners = winners[np.r_[True, nodes[winners][1:] != nodes[winners][:-1]]]
+        best = labels.copy()
+        best[nodes[winners]] = candidates[winners]
+
+        if np.array_equal(best, labels):
+            break
+        update = rng.random(n) < 0.5
+        labels = np.where(update, best, labels)
+
+    return _rank_by_size(labels)
+
+
+def modularity(graph: CollaborationGraph, communities: np.ndarray) -> float:
+    """加权模块度"""
+    total = graph.weights.sum()
+    if total == 0:
+        return 0.0
+    rows = graph.edge_rows()
+    internal = graph.weights[communities[rows] == communities[graph.indices]].sum()
+    community_strength = np.bincount(communities, weights=graph.strengths())
+    return float(internal / total - ((community_strength / total) ** 2).sum())
+
+
+def _analyze(session: Session, team_id: Optional[int]) -> Dict[str, Any]:
+    graph = load_collaboration_graph(session, team_id)
+    n = graph.node_count
+    components = connected_components(graph)
+    communities = detect_communities(graph)
+    degree = graph.degrees()
+    strength = graph.strengths()
+    degree_centrality = degree / (n - 1) if n > 1 else np.zeros(n)
+    betweenness = betweenness_centrality(graph)
+
+    name_query = select(Author.id, Author.name)
+    if team_id is not None:
+        name_query = name_query.where(col(Author.id).in_(_team_author_ids(team_id)))
+    names = dict(session.exec(name_query).all())
+
+    nodes = [
+        {
+            "author_id": author_id,
+            "name": names.get(author_id),
+            "degree": int(degree[i]),
+            "weighted_degree": float(strength[i]),
+            "degree_centrality": float(degree_centrality[i]),
+            "betweenness": float(betweenness[i]),
+            "component": int(components[i]),
+            "community": int(communities[i]),
+        }
+        for i, author_id in enumerate(graph.author_ids.tolist())
+    ]
+    nodes.sort(key=lambda node: (-node["betweenness"], -node["degree"], node["author_id"]))
+    return {
+        "team_id": team_id,
+        "node_count": n,
+        "edge_count": graph.edge_count,
+        "component_count": int(components.max()) + 1 if n else 0,
+        "largest_component_size": int((components == 0).sum()),
+        "community_count": int(communities.max()) + 1 if n else 0,
+        "modularity": modularity(graph, communities),
+        "betweenness_sampled": n > BETWEENNESS_SAMPLES,
+        "nodes": nodes,
+    }
+
+
+def get_collaboration_analytics(
+    session: Session, team_id: Optional[int] = None, limit: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    获取合作网络的整体指标和每位作者的指标（按数据版本缓存）
+
+    Args:
+        team_id: 只分析该团队论文的合作网络，不指定时分析全部作者
+        limit: 只返回介数中心性最高的前 limit 位作者，不指定时返回全部
+    """
+    result = cached(COLLABORATION_GRAPH, team_id, lambda: _analyze(session, team_id))
+    nodes = result["nodes"][:limit] if limit else result["nodes"]
+    return {
+        **result,
+        "nodes": nodes,
+        "data_version": cache_version(COLLABORATION_GRAPH),
+    }
@@ -0,0 +1,228 @@
+"""
+批量数据组装
+
+列表、导出等接口一次处理多条记录，逐条查询关联数据会产生 N+1 查询。
+这里按固定次数的集合查询（IN 列表）加载关联数据，再在内存中组装返回模型。
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Type, TypeVar
+
+from sqlmodel import Session, SQLModel, col, select
+
+from app.core.config_dev import build_file_url
+from app.models.author import Author
+from app.models.category import Category
+from app.models.journal import Journal
+from app.models.keyword import Keyword
+from app.models.paper import Paper, PaperAuthor, PaperKeyword, PaperRead
+from app.models.reference import (
+    ReferenceCategory,
+    ReferenceCategoryRead,
+    ReferenceKeyword,
+    ReferencePaper,
+    ReferenceRead,
+)
+from app.models.team import Team
+
+ModelT = TypeVar("ModelT", bound=SQLModel)
+
+# SQLite 单条语句的绑定参数数量有限，IN 列表按此大小分批
+IN_CHUNK_SIZE = 500
+
+
+def chunked(ids: Sequence[int], size: int = IN_CHUNK_SIZE) -> Iterator[List[int]]:
+    """将ID列表切分为固定大小的批次"""
+    for start in range(0, len(ids), size):
+        yield list(ids[start : start + size])
+
+
+def _unique_ids(ids: Iterable[Optional[int]]) -> List[int]:
+    """去重并去除空值，保持原有顺序"""
+    return list(dict.fromkeys(i for i in ids if i is not None))
+
+
+def load_names(
+    session: Session, model: Type[SQLModel], ids: Iterable[Optional[int]]
+) -> Dict[int, str]:
+    """批量获取 id -> name 映射（适用于 Category、Journal、Team 等）"""
+    names: Dict[int, str] = {}
+    for batch in chunked(_unique_ids(ids)):
+        rows = session.exec(
+            select(model.id, model.name).where(col(model.id).in_(batch))  # type: ignore
+        ).all()
+        names.update({row_id: name for row_id, name in rows})
+    return names
+
+
+def load_by_id(
+    session: Session, model: Type[ModelT], ids: Iterable[Optional[int]]
+) -> Dict[int, ModelT]:
+    """批量获取 id -> 记录映射"""
+    records: Dict[int, ModelT] = {}
+    for batch in chunked(_unique_ids(ids)):
+        rows = session.exec(
+            select(model).where(col(model.id).in_(batch))  # type: ignore
+        ).all()
+        records.update({row.id: row for row in rows})  # type: ignore
+    return records
+
+
+def load_paper_keywords(
+    session: Session, paper_ids: Sequence[int]
+) -> Dict[int, List[str]]:
+    """批量获取论文关键词，返回 paper_id -> 关键词名称列表"""
+    keywords: Dict[int, List[str]] = defaultdict(list)
+    for batch in chunked(paper_ids):
+        rows = session.exec(
+            select(PaperKeyword.paper_id, Keyword.name)
+            .join(Keyword)
+            .where(col(PaperKeyword.paper_id).in_(batch))
+            .order_by(col(PaperKeyword.paper_id), col(Keyword.id))
+        ).all()
+        for paper_id, name in rows:
+            keywords[paper_id].append(name)
+    return keywords
+
+
+def load_paper_authors(
+    session: Session, paper_ids: Sequence[int]
+) -> Dict[int, List[str]]:
+    """批量获取论文作者，返回 paper_id -> 按作者顺序排列的作者姓名列表"""
+    authors: Dict[int, List[str]] = defaultdict(list)
+    for batch in chunked(paper_ids):
+        rows = session.exec(
+            select(PaperAuthor.paper_id, Author.name)
+            .join(Author)
+            .where(col(PaperAuthor.paper_id).in_(batch))
+            .order_by(col(PaperAuthor.paper_id), col(PaperAuthor.author_order))
+        ).all()
+        for paper_id, name in rows:
+            authors[paper_id].append(name)
+    return authors
+
+
+def hydrate_papers(session: Session, papers: Sequence[Paper]) -> List[PaperRead]:
+    """
+    批量构建论文返回数据
+
+    无论论文数量多少，关键词、作者、分类、期刊、团队各只需一组集合查询。
+
+    Args:
+        session: 数据库会话
+        papers: 已加载的论文列表
+
+    Returns:
+        与输入顺序一致的 PaperRead 列表
+    """
+    paper_ids = _unique_ids(paper.id for paper in papers)
+    keywords = load_paper_keywords(session, paper_ids)
+    authors = load_paper_authors(session, paper_ids)
+    category_names = load_names(session, Category, (p.category_id for p in papers))
+    journal_names = load_names(session, Journal, (p.journal_id for p in papers))
+    team_names = load_names(session, Team, (p.team_id for p in papers))
+
+    results = []
+    for paper in papers:
+        paper_id = paper.id if paper.id is not None else 0
+        results.append(
+            PaperRead(
+                id=paper_id,
+                title=paper.title,
+                abstract=paper.abstract,
+                publication_date=paper.publication_date,
+                journal_id=paper.journal_id,
+                journal_name=journal_names.get(paper.journal_id or 0),
+                doi=paper.doi,
+                file_url=build_file_url(paper.file_path) if paper.file_path else None,
+                created_at=paper.created_at,
+                updated_at=paper.updated_at,
+                keywords=keywords.get(paper_id, []),
+                authors=authors.get(paper_id, []),
+                category_id=paper.category_id,
+                category_name=category_names.get(paper.category_id or 0),
+                team_id=paper.team_id,
+                team_name=team_names.get(paper.team_id),
+                created_by_id=paper.created_by_id,
+            )
+        )
+    return results
+
+
+def hydrate_paper(session: Session, paper: Paper) -> PaperRead:
+    """构建单篇论文的返回数据"""
+    return hydrate_papers(session, [paper])[0]
+
+
+def load_reference_keywords(
+    session: Session, reference_ids: Sequence[int]
+) -> Dict[int, List[str]]:
+    """批量获取参考文献关键词，返回 reference_id -> 关键词名称列表"""
+    keywords: Dict[int, List[str]] = defaultdict(list)
+    for batch in chunked(reference_ids):
+        rows = session.exec(
+            select(ReferenceKeyword.reference_id, Keyword.name)
+            .join(Keyword)
+            .where(col(ReferenceKeyword.reference_id).in_(batch))
+            .order_by(col(ReferenceKeyword.reference_id), col(Keyword.id))
+        ).all()
+        for reference_id, name in rows:
+            keywords[reference_id].append(name)
+    return keywords
+
+
+def hydrate_references(
+    session: Session, references: Sequence[ReferencePaper]
+) -> List[ReferenceRead]:
+    """
+    批量构建参考文献返回数据
+
+    无论参考文献数量多少，关键词、分类、期刊各只需一组集合查询。
+
+    Args:
+        session: 数据库会话
+        references: 已加载的参考文献列表
+
+    Returns:
+        与输入顺序一致的 ReferenceRead 列表
+    """
+    reference_ids = _unique_ids(reference.id for reference in references)
+    keywords = load_reference_keywords(session, reference_ids)
+    categories = load_by_id(
+        session, ReferenceCategory, (r.category_id for r in references)
+    )
+    journal_names = load_names(session, Journal, (r.journal_id for r in references))
+
+    results = []
+    for reference in references:
+        reference_id = reference.id if reference.id is not None else 0
+        category = categories.get(reference.category_id or 0)
+        results.append(
+            ReferenceRead(
+                id=reference_id,
+                title=reference.title,
+                authors=reference.authors,
+                doi=reference.doi,
+                file_url=(
+                    build_file_url(reference.file_path) if reference.file_path else None
+                ),
+                journal_id=reference.journal_id,
+                journal_name=journal_names.get(reference.journal_id or 0),
+                publication_year=reference.publication_year,
+                created_at=reference.created_at,
+                updated_at=reference.updated_at,
+                team_id=reference.team_id,
+                created_by_id=reference.created_by_id,
+                category_id=reference.category_id,
+                keywords=keywords.get(reference_id, []),
+                category=(
+                    ReferenceCategoryRead.from_orm(category) if category else None
+                ),
+            )
+        )
+    return results
+
+
+def hydrate_reference(session: Session, reference: ReferencePaper) -> ReferenceRead:
+    """构建单条参考文献的返回数据"""
+    return hydrate_references(session, [reference])[0]
@@ -0,0 +1,294 @@
+"""
+后台任务
+
+导出 Excel、重建台账等耗时操作不在请求中执行：接口在 job 表中登记任务后立即返回，
+事务提交后交给线程池执行，客户端轮询任务状态，完成后下载结果文件。
+
+- 任务类型用 job_handler 注册，处理函数接收数据库会话、任务记录和进度对象，
+  需要生成文件时返回 JobResult，文件移动到 data/jobs 保存
+- 结果文件和任务记录在完成 JOB_RESULT_TTL_HOURS 小时后由后台线程定期删除
+- 服务停止时未完成的任务保持 queued 状态，下次启动时由 resume_jobs 重新提交
+- 使用 API 密钥提交的任务保存密钥限定的团队，执行时同样只能访问这些团队
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, TypeVar
+
+from fastapi import HTTPException
+from sqlalchemy import event, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session, col, select
+
+from app.core.config_dev import JOB_RESULT_TTL_HOURS, JOB_WORKERS, JOBS_DIR
+from app.core.database import engine
+from app.models.job import Job, JobRead
+from app.services.auth_cache import current_team_scope, team_scope
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+JOB_RESULT_TTL = timedelta(hours=JOB_RESULT_TTL_HOURS)
+
+# 进度写入数据库的最小间隔（秒）
+PROGRESS_INTERVAL = 1.0
+
+# 清理过期结果的间隔（秒）
+SWEEP_INTERVAL = 10 * 60
+
+_QUEUED_KEY = "jobs_queued"
+
+T = TypeVar("T")
+
+
+@dataclass
+class JobResult:
+    """任务生成的文件"""
+
+    path: str  # 临时文件路径，任务完成后移动到 data/jobs
+    filename: str  # 下载时的文件名
+    media_type: str
+
+
+class JobProgress:
+    """任务进度，按时间间隔写入 job.progress"""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self._last_write = 0.0
+
+    def update(self, done: int, total: int) -> None:
+        now = time.monotonic()
+        if total <= 0 or now - self._last_write < PROGRESS_INTERVAL:
+            return
+        self._last_write = now
+        try:
+            with engine.begin() as connection:
+                connection.execute(
+                    update(Job)
+                    .where(col(Job.id) == self.job_id)
+                    .values(progress=round(min(done / total, 1.0), 4))
+                )
+        except SQLAlchemyError:
+            # 进度只用于展示，数据库忙时跳过本次写入
+            pass
+
+    def track(self, items: Iterable[T], total: int) -> Iterator[T]:
+        """逐项产出 items，并按已产出的数量更新进度"""
+        for done, item in enumerate(items, 1):
+            yield item
+            self.update(done, total)
+
+
+JobHandler = Callable[[Session, Job, JobProgress], Optional[JobResult]]
+
+_handlers: Dict[str, JobHandler] = {}
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_sweeper_stop = threading.Event()
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """注册任务类型的处理函数"""
+
+    def register(handler: JobHandler) -> JobHandler:
+        _handlers[kind] = handler
+        return handler
+
+    return register
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=JOB_WORKERS, thread_name_prefix="job"
+            )
+        return _executor
+
+
+def enqueue_job(session: Session, kind: str, user_id: int, params: Any = None) -> Job:
+    """
+    登记后台任务（不提交），事务提交后开始执行
+
+    当前请求使用限定团队的 API 密钥时，任务执行时也只能访问这些团队。
+
+    Args:
+        kind: 已用 job_handler 注册的任务类型
+        user_id: 提交任务的用户
+        params: 任务参数，SQLModel/Pydantic 对象或可序列化为 JSON 的字典
+    """
+    if kind not in _handlers:
+        raise ValueError(f"Unknown job kind: {kind}")
+    if hasattr(params, "model_dump_json"):
+        params_json = params.model_dump_json()
+    else:
+        params_json = json.dumps(params or {}, default=str)
+
+    scope = current_team_scope()
+    job = Job(
+        id=uuid.uuid4().hex,
+        kind=kind,
+        params=params_json,
+        team_ids=None if scope is None else json.dumps(sorted(scope)),
+        created_by_id=user_id,
+    )
+    session.add(job)
+    session.flush()
+    session.info.setdefault(_QUEUED_KEY, []).append(job.id)
+    return job
+
+
+@event.listens_for(Session, "after_commit")
+def _start_queued(session: Any) -> None:
+    for job_id in session.info.pop(_QUEUED_KEY, []):
+        _get_executor().submit(_run_job, job_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_queued(session: Any) -> None:
+    session.info.pop(_QUEUED_KEY, None)
+
+
+def _error_message(error: Exception) -> str:
+    if isinstance(error, HTTPException):
+        return str(error.detail)
+    return (str(error) or type(error).__name__)[:500]
+
+
+def _run_job(job_id: str) -> None:
+    """在工作线程中执行任务，结果和状态写回 job 表"""
+    with Session(engine) as session:
+        # 原子地把任务标记为执行中，多个线程或实例不会重复执行同一任务
+        claimed = session.execute(
+            update(Job)
+            .where(col(Job.id) == job_id, col(Job.status) == JOB_QUEUED)
+            .values(status=JOB_RUNNING, started_at=datetime.utcnow())
+        )
+        session.commit()
+        job = session.get(Job, job_id)
+        if claimed.rowcount == 0 or job is None:
+            # 任务已被删除或已由其他线程执行
+            return
+
+        values: Dict[str, Any]
+        try:
+            handler = _handlers.get(job.kind)
+            if handler is None:
+                raise ValueError(f"Unknown job kind: {job.kind}")
+            team_ids = None if job.team_ids is None else json.loads(job.team_ids)
+            with team_scope(team_ids):
+                result = handler(session, job, JobProgress(job_id))
+            values = {"status": JOB_DONE, "progress": 1.0}
+            if result is not None:
+                target = JOBS_DIR / f"{job_id}{Path(result.filename).suffix}"
+                shutil.move(result.path, target)
+                values.update(
+                    result_path=target.name,
+                    result_name=result.filename,
+                    media_type=result.media_type,
+                )
+        except Exception as e:
+            session.rollback()
+            values = {"status": JOB_FAILED, "error": _error_message(e)}
+
+        finished_at = datetime.utcnow()
+        session.execute(
+            update(Job)
+            .where(col(Job.id) == job_id)
+            .values(
+                **values, finished_at=finished_at, expires_at=finished_at + JOB_RESULT_TTL
+            )
+        )
+        session.commit()
+
+
+def job_result_path(job: Job) -> Optional[Path]:
+    return JOBS_DIR / job.result_path if job.result_path else None
+
+
+def job_read(job: Job) -> JobRead:
+    """任务记录转为响应，完成且有结果文件时给出下载地址"""
+    download_url = (
+        f"/api/jobs/{job.id}/download"
+        if job.status == JOB_DONE and job.result_path
+        else None
+    )
+    return JobRead.model_validate(job, update={"download_url": download_url})
+
+
+def delete_job(session: Session, job: Job) -> None:
+    """删除任务记录和结果文件（不提交）"""
+    path = job_result_path(job)
+    if path is not None and path.exists():
+        os.remove(path)
+    session.delete(job)
+
+
+def purge_expired_jobs(session: Session) -> int:
+    """删除已过期的任务及其结果文件（提交），返回删除的任务数"""
+    expired = session.exec(
+        select(Job).where(col(Job.expires_at) < datetime.utcnow())
+    ).all()
+    for job in expired:
+        delete_job(session, job)
+    session.commit()
+    return len(expired)
+
+
+def resume_jobs(session: Session) -> int:
+    """
+    重新提交未完成的任务（启动时调用），返回任务数
+
+    上次停止时正在执行的任务从头开始执行。
+    """
+    session.execute(
+        update(Job).where(col(Job.status) == JOB_RUNNING).values(status=JOB_QUEUED)
+    )
+    session.commit()
+    job_ids = session.exec(
+        select(Job.id).where(Job.status == JOB_QUEUED).order_by(col(Job.created_at))
+    ).all()
+    for job_id in job_ids:
+        _get_executor().submit(_run_job, job_id)
+    return len(job_ids)
+
+
+def _sweep_loop() -> None:
+    while not _sweeper_stop.wait(SWEEP_INTERVAL):
+        try:
+            with Session(engine) as session:
+                purge_expired_jobs(session)
+        except SQLAlchemyError:
+            # 数据库忙时等待下一次清理
+            pass
+
+
+def start_job_sweeper() -> None:
+    """清理一次过期任务，并启动定期清理的后台线程"""
+    with Session(engine) as session:
+        purge_expired_jobs(session)
+    _sweeper_stop.clear()
+    threading.Thread(target=_sweep_loop, name="job-sweeper", daemon=True).start()
+
+
+def shutdown_jobs() -> None:
+    """停止清理线程和线程池；未开始的任务保持 queued 状态"""
+    global _executor
+    _sweeper_stop.set()
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
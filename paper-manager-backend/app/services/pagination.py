@@ -0,0 +1,154 @@
+"""
+分页辅助函数
+
+列表接口共用：在数据库中统计过滤后的总数，并构建统一的分页响应。
+同时提供基于 (排序字段, id) 的游标分页，深度翻页的开销与第一页相同。
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, TypeVar
+
+from fastapi import HTTPException
+from sqlalchemy import and_, func, or_
+from sqlmodel import Session, SQLModel, col, select
+
+PageT = TypeVar("PageT", bound=SQLModel)
+
+
+def count_query(session: Session, query: Any, key_column: Any) -> int:
+    """
+    使用 SELECT count(*) 统计查询结果数量
+
+    查询可能包含作者、关键词等关联表的 JOIN，同一条记录可能匹配多行，
+    因此先按主键去重再计数，避免重复统计，也无需把 ORM 对象全部加载到内存。
+
+    Args:
+        session: 数据库会话
+        query: 已应用过滤条件的查询（不含 offset/limit）
+        key_column: 用于去重的主键列，如 Paper.id
+
+    Returns:
+        匹配的记录数量
+    """
+    subquery = (
+        query.with_only_columns(key_column).distinct().order_by(None).subquery()
+    )
+    return session.exec(select(func.count()).select_from(subquery)).one()
+
+
+def build_page(
+    response_model: Type[PageT],
+    items: Sequence[Any],
+    total: int,
+    skip: int,
+    limit: int,
+    **extra: Any,
+) -> PageT:
+    """构建分页响应（items/total/page/size/pages），extra 用于附加字段如 next_cursor"""
+    current_page = (skip // limit) + 1
+    total_pages = (total + limit - 1) // limit  # 向上取整
+
+    return response_model(
+        items=list(items),
+        total=total,
+        page=current_page,
+        size=limit,
+        pages=total_pages,
+        **extra,
+    )
+
+
+def encode_cursor(sort_key: str, value: Any, row_id: int) -> str:
+    """将最后一条记录的 (排序字段, 值, id) 编码为不透明游标"""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps({"k": sort_key, "v": value, "id": row_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, Any, int]:
+    """解析游标，返回 (排序字段, 值, id)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return str(payload["k"]), payload["v"], int(payload["id"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_paginate(
+    session: Session,
+    query: Any,
+    sort_columns: Dict[str, Any],
+    id_column: Any,
+    order_by: Optional[str],
+    cursor: Optional[str],
+    limit: int,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    游标分页
+
+    按 (排序字段 DESC NULLS LAST, id DESC) 稳定排序，使用上一页最后一条记录的
+    键值作为过滤条件，而不是 OFFSET，翻页深度不影响查询开销，
+    且并发插入新记录时已读取的结果不会错位。
+
+    Args:
+        session: 数据库会话
+        query: 已应用过滤条件的查询
+        sort_columns: 允许的排序字段名 -> 列
+        id_column: 主键列，作为排序的第二关键字保证唯一性
+        order_by: 排序字段名，未指定时使用游标中记录的字段
+        cursor: 上一页返回的 next_cursor，为空表示第一页
+        limit: 每页数量
+
+    Returns:
+        (本页记录, 下一页游标)，没有更多数据时游标为 None
+    """
+    sort_key = order_by
+    if cursor:
+        cursor_key, value, last_id = decode_cursor(cursor)
+        if sort_key and sort_key != cursor_key:
+            raise HTTPException(
+                status_code=400, detail="Cursor does not match the requested order_by"
+            )
+        sort_key = cursor_key
+
+    if sort_key not in sort_columns:
+        raise HTTPException(status_code=400, detail=f"Unsupported order_by: {sort_key}")
+    sort_column = col(sort_columns[sort_key])
+    id_column = col(id_column)
+
+    if cursor:
+        if value is None:
+            # 已进入排序字段为空的尾部区域
+            query = query.where(and_(sort_column.is_(None), id_column < last_id))
+        else:
+            if sort_column.type.python_type is datetime:
+                value = datetime.fromisoformat(value)
+            query = query.where(
+                or_(
+                    sort_column < value,
+                    and_(sort_column == value, id_column < last_id),
+                    sort_column.is_(None),
+                )
+            )
+
+    rows = list(
+        session.exec(
+            query.order_by(sort_column.desc().nulls_last(), id_column.desc()).limit(
+                limit + 1
+            )
+        ).all()
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            sort_key, getattr(last, sort_column.key), getattr(last, id_column.key)
+        )
+    return rows, next_cursor
@@ -0,0 +1,331 @@
+"""
+论文批量导入
+
+按块处理导入数据：每块内的作者、关键词名称各用一次 IN 查询解析，
+缺失的名称用一条 executemany 插入，论文及其作者、关键词关联也批量写入，
+每块单独提交。校验失败的行记录行号和原因后跳过，不影响同一块中的其他行。
+
+支持 JSON（对象数组，或 {"papers": [...]}）、CSV 和 Excel 文件。
+CSV/Excel 中的列表字段（author_names、keyword_names、author_contribution_ratios）
+使用分号分隔。
+"""
+
+import io
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Type
+
+import pandas as pd
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel, col, select
+
+from app.models.author import Author
+from app.models.category import Category
+from app.models.journal import Journal
+from app.models.keyword import Keyword
+from app.models.paper import (
+    Paper,
+    PaperAuthor,
+    PaperCreate,
+    PaperImportError,
+    PaperImportResult,
+    PaperKeyword,
+)
+from app.models.team import Team
+from app.models.user import User
+from app.services.auth_cache import user_team_ids
+from app.services.coauthor import refresh_coauthorships
+from app.services.hydration import chunked
+from app.services.workload import refresh_paper_workloads
+
+# 每次提交的论文数量
+IMPORT_CHUNK_SIZE = 500
+
+# CSV/Excel 中列表字段的分隔符
+LIST_SEPARATOR = ";"
+
+_LIST_FIELDS = ("author_names", "keyword_names", "author_contribution_ratios")
+
+
+def resolve_names(
+    session: Session, model: Type[SQLModel], names: Iterable[str]
+) -> Dict[str, int]:
+    """
+    批量获取或创建按名称查找的记录（Author、Keyword），返回 name -> id
+
+    已存在的名称用 IN 查询一次取回（同名多条时取 id 最小的一条），
+    缺失的名称用一条 executemany 插入后再查询其ID。
+    """
+    unique = list(dict.fromkeys(names))
+
+    def lookup(batch_names: List[str]) -> None:
+        for batch in chunked(batch_names):  # type: ignore
+            rows = session.exec(
+                select(model.id, model.name)  # type: ignore
+                .where(col(model.name).in_(batch))  # type: ignore
+                .order_by(model.id)  # type: ignore
+            ).all()
+            for row_id, name in rows:
+                ids.setdefault(name, row_id)
+
+    ids: Dict[str, int] = {}
+    lookup(unique)
+
+    missing = [name for name in unique if name not in ids]
+    if missing:
+        now = datetime.utcnow()
+        session.execute(
+            insert(model),
+            [{"name": name, "created_at": now, "updated_at": now} for name in missing],
+        )
+        lookup(missing)
+    return ids
+
+
+def _split_list(value: Any) -> List[Any]:
+    """将 "a; b; c" 形式的单元格拆分为列表"""
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(LIST_SEPARATOR) if item.strip()]
+    return [value]
+
+
+def _clean_tabular_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """去除表格中的空单元格，并拆分列表字段"""
+    cleaned: Dict[str, Any] = {}
+    for key, value in row.items():
+        empty = (value is None or (isinstance(value, float) and pd.isna(value))) or (
+            isinstance(value, str) and not value.strip()
+        )
+        if empty:
+            # 列表字段的空单元格视为空列表
+            if key in _LIST_FIELDS:
+                cleaned[key] = []
+            continue
+        if isinstance(value, pd.Timestamp):
+            value = value.to_pydatetime()
+        cleaned[str(key).strip()] = _split_list(value) if key in _LIST_FIELDS else value
+    return cleaned
+
+
+def parse_import_file(filename: str, content: bytes) -> List[Dict[str, Any]]:
+    """
+    解析导入文件，返回原始行数据
+
+    Raises:
+        ValueError: 文件格式不支持或内容无法解析
+    """
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+
+    if extension == "json":
+        data = json.loads(content.decode("utf-8-sig"))
+        if isinstance(data, dict):
+            data = data.get("papers")
+        if not isinstance(data, list):
+            raise ValueError("JSON must be an array of papers or {\"papers\": [...]}")
+        return data
+
+    if extension == "csv":
+        df = pd.read_csv(io.BytesIO(content), dtype=str, encoding="utf-8-sig")
+    elif extension in ("xlsx", "xls"):
+        df = pd.read_excel(io.BytesIO(content))
+    else:
+        raise ValueError(f"Unsupported file type: {extension or filename}")
+
+    df = df.astype(object).where(pd.notna(df), None)
+    return [_clean_tabular_row(row) for row in df.to_dict(orient="records")]
+
+
+def _existing_ids(
+    session: Session, column: Any, values: Iterable[Any]
+) -> Set[Any]:
+    """批量查询哪些值在指定列中已存在"""
+    found: Set[Any] = set()
+    for batch in chunked(list(dict.fromkeys(values))):
+        found.update(session.exec(select(column).where(col(column).in_(batch))).all())
+    return found
+
+
+def _validate_chunk(
+    session: Session,
+    rows: List[Tuple[int, Any]],
+    user: User,
+    default_team_id: Optional[int],
+    seen_dois: Set[str],
+    errors: List[PaperImportError],
+) -> List[Tuple[int, PaperCreate]]:
+    """校验一块数据，返回通过校验的 (行号, PaperCreate)，失败的行写入 errors"""
+    parsed: List[Tuple[int, PaperCreate]] = []
+    for row_number, raw in rows:
+        if not isinstance(raw, dict):
+            errors.append(PaperImportError(row=row_number, error="Row must be an object"))
+            continue
+        if default_team_id is not None and not raw.get("team_id"):
+            raw = {**raw, "team_id": default_team_id}
+        try:
+            paper = PaperCreate.model_validate(raw)
+        except ValidationError as e:
+            message = "; ".join(
+                f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}"
+                for err in e.errors()
+            )
+            errors.append(PaperImportError(row=row_number, error=message))
+            continue
+        paper.author_names = [n.strip() for n in paper.author_names if n.strip()]
+        paper.keyword_names = list(
+            dict.fromkeys(n.strip() for n in paper.keyword_names if n.strip())
+        )
+        parsed.append((row_number, paper))
+
+    # 每块对团队、期刊、分类、DOI 各查询一次
+    team_ids = {p.team_id for _, p in parsed}
+    existing_teams = _existing_ids(session, Team.id, team_ids)
+    # 成员关系来自认证缓存，使用 API 密钥时只包含密钥限定的团队
+    member_teams = set(user_team_ids(session, user))
+    existing_journals = _existing_ids(
+        session, Journal.id, [p.journal_id for _, p in parsed if p.journal_id]
+    )
+    existing_categories = _existing_ids(
+        session, Category.id, [p.category_id for _, p in parsed if p.category_id]
+    )
+    existing_dois = _existing_ids(session, Paper.doi, [p.doi for _, p in parsed if p.doi])
+
+    valid: List[Tuple[int, PaperCreate]] = []
+    for row_number, paper in parsed:
+        error = None
+        if paper.team_id == 0:
+            error = "Paper must be associated with a valid team (team_id cannot be 0)"
+        elif paper.team_id not in existing_teams:
+            error = f"Team {paper.team_id} not found"
+        elif paper.team_id not in member_teams:
+            error = "Not a member of this team"
+        elif paper.doi and (paper.doi in existing_dois or paper.doi in seen_dois):
+            error = "A paper with this DOI already exists"
+        elif paper.journal_id and paper.journal_id not in existing_journals:
+            error = f"Journal {paper.journal_id} not found"
+        elif paper.category_id and paper.category_id not in existing_categories:
+            error = f"Category {paper.category_id} not found"
+        elif not paper.author_names:
+            error = "At least one author is required"
+        elif len(set(paper.author_names)) != len(paper.author_names):
+            error = "Duplicate author names"
+
+        if error:
+            errors.append(PaperImportError(row=row_number, error=error))
+            continue
+        if paper.doi:
+            seen_dois.add(paper.doi)
+        valid.append((row_number, paper))
+    return valid
+
+
+def _insert_chunk(
+    session: Session, papers: List[PaperCreate], user_id: int
+) -> List[int]:
+    """写入一块已校验的论文及其关联，返回新论文ID"""
+    author_ids = resolve_names(
+        session, Author, (n for p in papers for n in p.author_names)
+    )
+    keyword_ids = resolve_names(
+        session, Keyword, (n for p in papers for n in p.keyword_names)
+    )
+
+    now = datetime.utcnow()
+    db_papers = [
+        Paper(
+            title=p.title,
+            abstract=p.abstract,
+            publication_date=p.publication_date,
+            journal_id=p.journal_id or None,
+            doi=p.doi,
+            created_by_id=user_id,
+            team_id=p.team_id,
+            category_id=p.category_id or None,
+            created_at=now,
+            updated_at=now,
+        )
+        for p in papers
+    ]
+    session.add_all(db_papers)
+    session.flush()  # 批量 INSERT，获取ID
+
+    author_links = []
+    keyword_links = []
+    for db_paper, p in zip(db_papers, papers):
+        ratios = p.author_contribution_ratios or []
+        for i, name in enumerate(p.author_names):
+            author_links.append(
+                {
+                    "paper_id": db_paper.id,
+                    "author_id": author_ids[name],
+                    "contribution_ratio": ratios[i] if i < len(ratios) else 1.0,
+                    "is_corresponding": bool(p.corresponding_author_name)
+                    and name == p.corresponding_author_name,
+                    "author_order": i + 1,
+                }
+            )
+        for name in p.keyword_names:
+            keyword_links.append(
+                {"paper_id": db_paper.id, "keyword_id": keyword_ids[name]}
+            )
+
+    if author_links:
+        session.execute(insert(PaperAuthor), author_links)
+    if keyword_links:
+        session.execute(insert(PaperKeyword), keyword_links)
+
+    paper_ids = [db_paper.id for db_paper in db_papers]
+    refresh_paper_workloads(session, paper_ids)  # type: ignore
+    refresh_coauthorships(session, paper_ids)  # type: ignore
+    return paper_ids  # type: ignore
+
+
+def import_papers(
+    session: Session,
+    rows: List[Any],
+    user: User,
+    default_team_id: Optional[int] = None,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> PaperImportResult:
+    """
+    批量导入论文
+
+    Args:
+        session: 数据库会话
+        rows: 原始行数据（与 PaperCreate 字段一致）
+        user: 导入用户，作为论文创建者；只能导入到所在团队
+        default_team_id: 行中未指定 team_id 时使用的团队
+        chunk_size: 每次提交的行数
+
+    Returns:
+        导入结果，包含新论文ID和逐行错误（行号从 1 开始）
+    """
+    assert user.id is not None, "Import user must have an ID"
+
+    result = PaperImportResult(total=len(rows))
+    seen_dois: Set[str] = set()
+    numbered = list(enumerate(rows, start=1))
+
+    for start in range(0, len(numbered), chunk_size):
+        chunk = numbered[start : start + chunk_size]
+        valid = _validate_chunk(
+            session, chunk, user, default_team_id, seen_dois, result.errors
+        )
+        if not valid:
+            continue
+        try:
+            paper_ids = _insert_chunk(session, [p for _, p in valid], user.id)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            result.errors.extend(
+                PaperImportError(row=row_number, error=f"Database error: {e}")
+                for row_number, _ in valid
+            )
+            continue
+        result.paper_ids.extend(paper_ids)
+
+    result.errors.sort(key=lambda e: e.row)
+    result.created = len(result.paper_ids)
+    result.failed = len(result.errors)
+    return result
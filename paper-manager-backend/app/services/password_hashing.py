@@ -0,0 +1,165 @@
+"""
+密码哈希线程池
+
+bcrypt 每次计算需要数百毫秒。登录、修改密码等 async 路由如果直接调用，
+计算期间事件循环无法处理其他请求；同步路由直接调用则长时间占用处理请求的线程池。
+
+密码哈希统一提交到独立的线程池（PASSWORD_HASH_WORKERS 个线程），
+bcrypt 计算时释放 GIL，不影响其他线程。线程池忙时请求排队，
+排队数超过 PASSWORD_HASH_QUEUE_SIZE 时直接返回 503，避免登录高峰时请求无限堆积。
+排队和计算耗时由 hashing_stats() 统计。
+
+修改 BCRYPT_ROUNDS 后，旧的哈希在用户下次登录成功时按新成本重新计算（见 login）。
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from fastapi import HTTPException
+
+from app.core.config_dev import (
+    BCRYPT_ROUNDS,
+    PASSWORD_HASH_QUEUE_SIZE,
+    PASSWORD_HASH_WORKERS,
+)
+from app.services.utils import get_password_hash, verify_and_update_password
+
+T = TypeVar("T")
+
+
+@dataclass
+class HashingStats:
+    """密码哈希的累计统计"""
+
+    completed: int = 0  # 完成的计算次数
+    rejected: int = 0  # 排队已满被拒绝的次数
+    running: int = 0  # 正在计算的数量
+    queued: int = 0  # 正在排队的数量
+    max_queued: int = 0  # 排队数量的最大值
+    total_wait_ms: float = 0.0  # 累计排队时间
+    max_wait_ms: float = 0.0  # 最长排队时间
+    total_hash_ms: float = 0.0  # 累计计算时间
+
+
+_stats = HashingStats()
+_stats_lock = threading.Lock()
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+            )
+        return _executor
+
+
+def shutdown_password_hashing() -> None:
+    """停止线程池，排队中的计算被取消"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def hashing_stats() -> Dict[str, Any]:
+    """线程池配置和累计统计"""
+    with _stats_lock:
+        stats = asdict(_stats)
+    completed = stats["completed"]
+    return {
+        "workers": PASSWORD_HASH_WORKERS,
+        "queue_size": PASSWORD_HASH_QUEUE_SIZE,
+        "bcrypt_rounds": BCRYPT_ROUNDS,
+        **stats,
+        "avg_wait_ms": stats["total_wait_ms"] / completed if completed else 0.0,
+        "avg_hash_ms": stats["total_hash_ms"] / completed if completed else 0.0,
+    }
+
+
+def _run(fn: Callable[..., T], submitted: float, *args: Any) -> T:
+    """在线程池中执行计算并记录排队和计算耗时"""
+    started = time.perf_counter()
+    with _stats_lock:
+        _stats.queued -= 1
+        _stats.running += 1
+    try:
+        return fn(*args)
+    finally:
+        finished = time.perf_counter()
+        wait_ms = (started - submitted) * 1000
+        with _stats_lock:
+            _stats.running -= 1
+            _stats.completed += 1
+            _stats.total_wait_ms += wait_ms
+            _stats.max_wait_ms = max(_stats.max_wait_ms, wait_ms)
+            _stats.total_hash_ms += (finished - started) * 1000
+
+
+def _submit(fn: Callable[..., T], *args: Any) -> "Future[T]":
+    """
+    提交计算到线程池
+
+    Raises:
+        HTTPException: 排队已满（503）
+    """
+    with _stats_lock:
+        pending = _stats.queued + _stats.running
+        if pending >= max(PASSWORD_HASH_WORKERS, 1) + PASSWORD_HASH_QUEUE_SIZE:
+            _stats.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Too many password operations, please retry later",
+                headers={"Retry-After": "1"},
+            )
+        _stats.queued += 1
+        _stats.max_queued = max(_stats.max_queued, _stats.queued)
+    submitted = time.perf_counter()
+    if PASSWORD_HASH_WORKERS <= 0:
+        # 不使用线程池，在调用线程中计算（仅用于对比测试）
+        future: "Future[T]" = Future()
+        try:
+            future.set_result(_run(fn, submitted, *args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    try:
+        return _get_executor().submit(_run, fn, submitted, *args)
+    except RuntimeError:
+        # 线程池已关闭
+        with _stats_lock:
+            _stats.queued -= 1
+        raise
+
+
+def hash_password(password: str) -> str:
+    """在线程池中计算密码哈希并等待结果，供同步路由使用"""
+    return _submit(get_password_hash, password).result()
+
+
+async def hash_password_async(password: str) -> str:
+    """在线程池中计算密码哈希，不阻塞事件循环"""
+    return await asyncio.wrap_future(_submit(get_password_hash, password))
+
+
+async def verify_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    在线程池中验证密码，不阻塞事件循环
+
+    Returns:
+        (密码是否正确, 需要更新时按当前 BCRYPT_ROUNDS 重新计算的哈希，否则为 None)
+    """
+    return await asyncio.wrap_future(
+        _submit(verify_and_update_password, plain_password, hashed_password)
+    )
@@ -0,0 +1,41 @@
+"""
+PDF 文本提取
+
+在文本提取进程中执行（见 app/services/text_extraction.py），因此不导入应用的其他模块。
+"""
+
+import logging
+from itertools import islice
+from typing import List, Tuple
+
+
+def extract_pdf_pages(path: str, max_pages: int, max_chars: int) -> Tuple[List[str], int]:
+    """
+    逐页提取 PDF 文本
+
+    Args:
+        path: PDF 文件路径
+        max_pages: 最多提取的页数
+        max_chars: 最多提取的字符数，超出部分截断
+
+    Returns:
+        (各页文本, 总页数)
+    """
+    from pypdf import PdfReader
+
+    # pypdf 对不规范的 PDF 输出大量警告
+    logging.getLogger("pypdf").setLevel(logging.ERROR)
+
+    reader = PdfReader(path)
+    if reader.is_encrypted:
+        reader.decrypt("")
+
+    pages: List[str] = []
+    remaining = max_chars
+    for page in islice(reader.pages, max_pages):
+        text = (page.extract_text() or "").replace("\x00", "")
+        pages.append(text[:remaining])
+        remaining -= len(text)
+        if remaining <= 0:
+            break
+    return pages, len(reader.pages)
@@ -0,0 +1,226 @@
+"""
+全文检索（SQLite FTS5）
+
+为论文（标题、摘要）、参考文献（标题、作者）和从 PDF 中提取的正文
+维护 FTS5 外部内容索引，由触发器与源表保持同步，查询按 bm25 相关度排序。
+
+默认使用 trigram 分词器，支持中文及任意子串匹配（与原有 LIKE '%x%' 语义一致）；
+SQLite 版本过低不支持 trigram 时退回 unicode61 分词。
+
+PostgreSQL 上不建立 FTS 索引，所有检索词退回 ILIKE 匹配，
+由迁移 0002 创建的 pg_trgm GIN 索引加速。
+"""
+
+from typing import Any, List, Tuple
+
+from sqlalchemy import Column, Integer, MetaData, Table, Text, or_, text
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import col, select
+
+from app.models.blob import FileBlob, FileText
+
+# trigram 分词器无法匹配少于 3 个字符的词
+MIN_TRIGRAM_LENGTH = 3
+
+# FTS 表不属于 SQLModel.metadata，由 init_search_index 单独创建
+_fts_metadata = MetaData()
+
+paper_fts = Table(
+    "paper_fts",
+    _fts_metadata,
+    Column("rowid", Integer, primary_key=True),
+    Column("paper_fts", Text),  # FTS5 隐藏列，用于 MATCH
+    Column("title", Text),
+    Column("abstract", Text),
+)
+
+reference_fts = Table(
+    "reference_fts",
+    _fts_metadata,
+    Column("rowid", Integer, primary_key=True),
+    Column("reference_fts", Text),  # FTS5 隐藏列，用于 MATCH
+    Column("title", Text),
+    Column("authors", Text),
+)
+
+file_text_fts = Table(
+    "file_text_fts",
+    _fts_metadata,
+    Column("rowid", Integer, primary_key=True),
+    Column("file_text_fts", Text),  # FTS5 隐藏列，用于 MATCH
+    Column("text", Text),
+)
+
+# (FTS 表名, 源表名, 索引列)
+_FTS_SOURCES = [
+    ("paper_fts", "paper", ["title", "abstract"]),
+    ("reference_fts", "referencepaper", ["title", "authors"]),
+    ("file_text_fts", "file_text", ["text"]),
+]
+
+# 当前索引使用的分词器，init_search_index 之后确定
+_tokenizer = "trigram"
+
+# 全文索引是否可用（非 SQLite 数据库或未初始化时退回 LIKE 匹配）
+_enabled = False
+
+
+def _trigger_statements(fts: str, source: str, columns: List[str]) -> List[str]:
+    """生成保持外部内容索引同步的触发器"""
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    insert_new = (
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values});"
+    )
+    delete_old = (
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {source} "
+        f"BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {source} "
+        f"BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {source} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def _create_fts_table(
+    conn: Connection, fts: str, source: str, columns: List[str]
+) -> None:
+    global _tokenizer
+
+    exists = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": fts},
+    ).first()
+    if exists:
+        sql = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE name = :name"), {"name": fts}
+        ).scalar_one()
+        if "trigram" not in sql:
+            _tokenizer = "unicode61"
+        return
+
+    cols = ", ".join(columns)
+    try:
+        conn.execute(
+            text(
+                f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, "
+                f"content='{source}', content_rowid='id', tokenize='{_tokenizer}')"
+            )
+        )
+    except Exception:
+        # SQLite < 3.34 不支持 trigram
+        _tokenizer = "unicode61"
+        conn.execute(
+            text(
+                f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, "
+                f"content='{source}', content_rowid='id', tokenize='unicode61')"
+            )
+        )
+
+    # 为已有数据建立索引
+    conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+
+def init_search_index(engine: Engine) -> None:
+    """创建全文索引及同步触发器（仅 SQLite）"""
+    global _enabled
+
+    if engine.dialect.name != "sqlite":
+        return
+
+    with engine.begin() as conn:
+        for fts, source, columns in _FTS_SOURCES:
+            _create_fts_table(conn, fts, source, columns)
+            for statement in _trigger_statements(fts, source, columns):
+                conn.execute(text(statement))
+    _enabled = True
+
+
+def split_terms(q: str) -> Tuple[List[str], List[str]]:
+    """
+    将用户输入拆分为可走全文索引的词和需要退回 LIKE 匹配的短词
+
+    trigram 分词器无法匹配少于 3 个字符的词；全文索引不可用时所有词都退回 LIKE。
+    """
+    terms = q.split()
+    if not _enabled:
+        return [], terms
+    if _tokenizer != "trigram":
+        return terms, []
+    indexed = [t for t in terms if len(t) >= MIN_TRIGRAM_LENGTH]
+    short = [t for t in terms if len(t) < MIN_TRIGRAM_LENGTH]
+    return indexed, short
+
+
+def build_match_query(terms: List[str]) -> str:
+    """
+    将检索词转换为安全的 FTS5 查询
+
+    每个词作为短语加引号（转义内部引号），词之间为 AND 关系，
+    避免用户输入中的 FTS 语法字符导致查询出错。
+    """
+    return " ".join('"' + t.replace('"', '""') + '"' for t in terms)
+
+
+def apply_search(
+    query: Any,
+    fts_table: Table,
+    id_column: Any,
+    source_columns: List[Any],
+    q: str,
+    rank: bool = True,
+) -> Any:
+    """
+    为查询添加全文检索条件
+
+    Args:
+        query: 原查询
+        fts_table: paper_fts 或 reference_fts
+        id_column: 源表主键列
+        source_columns: 被索引的源表列，短词退回对这些列做 LIKE 匹配
+        q: 用户输入的检索词，多个词之间为 AND 关系
+        rank: 是否按 bm25 相关度排序（游标分页时由分页自行排序）
+    """
+    indexed, short = split_terms(q)
+
+    for term in short:
+        query = query.where(or_(*[column.icontains(term) for column in source_columns]))
+
+    if indexed:
+        fts_name = fts_table.name
+        query = query.join(fts_table, fts_table.c.rowid == id_column).where(
+            fts_table.c[fts_name].op("MATCH")(build_match_query(indexed))
+        )
+        if rank:
+            query = query.order_by(text(f"bm25({fts_name})"))
+    return query
+
+
+def apply_content_search(query: Any, file_path_column: Any, q: str) -> Any:
+    """
+    按文件正文过滤：只保留文件提取出的文本包含全部检索词的记录
+
+    Args:
+        query: 原查询
+        file_path_column: Paper.file_path 或 ReferencePaper.file_path
+        q: 检索词，多个词之间为 AND 关系
+    """
+    indexed, short = split_terms(q)
+    if not indexed and not short:
+        return query
+
+    matched = select(FileBlob.file_path).join(
+        FileText, col(FileText.sha256) == FileBlob.sha256
+    )
+    for term in short:
+        matched = matched.where(col(FileText.text).icontains(term))
+    if indexed:
+        matched = matched.join(
+            file_text_fts, file_text_fts.c.rowid == FileText.id
+        ).where(file_text_fts.c.file_text_fts.op("MATCH")(build_match_query(indexed)))
+    return query.where(col(file_path_column).in_(matched))
@@ -0,0 +1,194 @@
+"""
+PDF 文本提取
+
+上传 PDF 后，在同一事务中为新内容登记一条 pending 状态的 file_text 记录，
+事务提交后交给后台进程池逐页提取文本，上传接口不等待提取完成。
+提取结果写回 file_text，由触发器同步到全文索引（见 app/services/search.py）。
+
+- 进程数由 TEXT_EXTRACTION_WORKERS 配置；pypdf 是纯 Python 实现，
+  放在独立进程中不会占用处理请求的线程的 GIL
+- 相同内容的文件只提取一次
+- 服务停止时未完成的任务保持 pending，下次启动时由 resume_text_extraction 重新提交
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlmodel import Session, col, select
+
+from app.core.config_dev import TEXT_EXTRACTION_WORKERS, config
+from app.core.database import engine
+from app.models.blob import FileBlob, FileText
+from app.services.pdf_text import extract_pdf_pages
+
+TEXT_PENDING = "pending"
+TEXT_DONE = "done"
+TEXT_FAILED = "failed"
+
+# 每个文件最多提取的页数和字符数
+MAX_TEXT_PAGES = 2000
+MAX_TEXT_CHARS = 1_000_000
+
+# 页之间的分隔符
+PAGE_SEPARATOR = "\f"
+
+_QUEUED_KEY = "text_extraction_queued"
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn 启动的进程不继承数据库连接和线程
+            _executor = ProcessPoolExecutor(
+                max_workers=TEXT_EXTRACTION_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def shutdown_text_extraction(wait: bool = False) -> None:
+    """停止进程池；未完成的任务保持 pending 状态"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+def is_pdf(file_path: str) -> bool:
+    return file_path.lower().endswith(".pdf")
+
+
+def queue_text_extraction(session: Session, blob: FileBlob) -> Optional[str]:
+    """
+    为上传的文件登记文本提取（不提交），事务提交后在后台开始提取
+
+    Returns:
+        文本提取状态；不是 PDF 时返回 None
+    """
+    if not is_pdf(blob.file_path):
+        return None
+    existing = session.exec(
+        select(FileText.status).where(FileText.sha256 == blob.sha256)
+    ).first()
+    if existing is not None:
+        return existing
+
+    session.add(FileText(sha256=blob.sha256, status=TEXT_PENDING))
+    session.flush()
+    session.info.setdefault(_QUEUED_KEY, []).append(
+        (blob.sha256, config.uploads / blob.file_path)
+    )
+    return TEXT_PENDING
+
+
+@event.listens_for(Session, "after_commit")
+def _start_queued(session: Any) -> None:
+    for sha256, path in session.info.pop(_QUEUED_KEY, []):
+        submit_text_extraction(sha256, path)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_queued(session: Any) -> None:
+    session.info.pop(_QUEUED_KEY, None)
+
+
+def submit_text_extraction(sha256: str, path: Path) -> Future:
+    """提交一个文件到后台进程池提取文本"""
+    try:
+        future = _get_executor().submit(
+            extract_pdf_pages, str(path), MAX_TEXT_PAGES, MAX_TEXT_CHARS
+        )
+    except BrokenProcessPool:
+        # 进程异常退出后进程池不可再用，重新创建
+        shutdown_text_extraction()
+        future = _get_executor().submit(
+            extract_pdf_pages, str(path), MAX_TEXT_PAGES, MAX_TEXT_CHARS
+        )
+    future.add_done_callback(partial(_save_result, sha256))
+    return future
+
+
+def _save_result(sha256: str, future: Future) -> None:
+    """将提取结果写回 file_text（在进程池的结果线程中执行）"""
+    if future.cancelled():
+        return
+    try:
+        pages, page_count = future.result()
+        values = {
+            "status": TEXT_DONE,
+            "text": PAGE_SEPARATOR.join(pages),
+            "page_count": page_count,
+            "error": None,
+        }
+    except Exception as e:
+        # 进程池损坏时不在此处关闭：回调在进程池的管理线程中执行，关闭会死锁，
+        # 下次提交时由 submit_text_extraction 重新创建
+        values = {"status": TEXT_FAILED, "error": str(e)[:500] or type(e).__name__}
+
+    with Session(engine) as session:
+        record = session.exec(select(FileText).where(FileText.sha256 == sha256)).first()
+        if record is None:
+            # 提取期间文件已被删除
+            return
+        for key, value in values.items():
+            setattr(record, key, value)
+        record.extracted_at = datetime.utcnow()
+        session.add(record)
+        session.commit()
+
+
+def _text_targets(session: Session, *filters: Any) -> List[Tuple[str, Path]]:
+    rows = session.exec(
+        select(FileText.sha256, FileBlob.file_path)
+        .join(FileBlob, col(FileBlob.sha256) == FileText.sha256)
+        .where(*filters)
+    ).all()
+    return [(sha256, config.uploads / file_path) for sha256, file_path in rows]
+
+
+def resume_text_extraction(session: Session) -> int:
+    """重新提交 pending 状态的提取任务（启动时调用），返回任务数"""
+    targets = _text_targets(session, FileText.status == TEXT_PENDING)
+    for sha256, path in targets:
+        submit_text_extraction(sha256, path)
+    return len(targets)
+
+
+def queue_missing_text_extraction(
+    session: Session, statuses: Iterable[str] = ()
+) -> List[Tuple[str, Path]]:
+    """
+    为尚未提取文本的 PDF 以及指定状态的记录登记提取（提交），返回待提取的文件
+
+    用于迁移已有文件或重试失败的提取，由调用方用 submit_text_extraction 提交。
+    """
+    missing = session.exec(
+        select(FileBlob.sha256, FileBlob.file_path)
+        .outerjoin(FileText, col(FileText.sha256) == FileBlob.sha256)
+        .where(col(FileText.id).is_(None))
+    ).all()
+    for sha256, file_path in missing:
+        if is_pdf(file_path):
+            session.add(FileText(sha256=sha256, status=TEXT_PENDING))
+
+    statuses = [s for s in statuses if s != TEXT_PENDING]
+    if statuses:
+        for record in session.exec(
+            select(FileText).where(col(FileText.status).in_(statuses))
+        ).all():
+            record.status = TEXT_PENDING
+            session.add(record)
+    session.commit()
+    return _text_targets(session, FileText.status == TEXT_PENDING)
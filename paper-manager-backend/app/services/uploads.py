@@ -0,0 +1,141 @@
+"""
+文件上传
+
+上传文件按固定大小的块读取，在线程池中写入目标目录下的临时文件并同时计算 SHA-256，
+不在事件循环中执行阻塞的磁盘读写，也不把整个文件读入内存。写完后由调用方
+原子重命名到最终位置（见 app/services/blobs.py），或在内容已存在时直接丢弃。
+
+大小上限在两处检查：请求头 Content-Length 超限时由 UploadSizeLimitMiddleware
+在解析请求体之前直接拒绝；没有 Content-Length（分块传输）时在写入过程中累计检查。
+"""
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+
+from app.core.config_dev import MAX_UPLOAD_SIZE
+
+# 每次读取和写入的块大小
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# multipart 请求体中除文件内容外的表单字段、分隔符等开销
+UPLOAD_FORM_OVERHEAD = 64 * 1024
+
+
+@dataclass
+class StoredUpload:
+    """已接收的上传文件"""
+
+    path: Path
+    size: int
+    sha256: str
+
+
+def _too_large(max_size: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File too large (max {max_size // (1024 * 1024)} MB)",
+    )
+
+
+def _write_chunk(out: BinaryIO, digest: Any, chunk: bytes) -> None:
+    digest.update(chunk)
+    out.write(chunk)
+
+
+def _discard(path: Path) -> None:
+    if path.exists():
+        os.remove(path)
+
+
+async def receive_upload(
+    upload: UploadFile,
+    directory: Path,
+    max_size: int = MAX_UPLOAD_SIZE,
+) -> StoredUpload:
+    """
+    流式接收上传文件，写入 directory 下的临时文件
+
+    返回的 path 是临时文件，调用方用 publish_upload 移动到最终位置，
+    或用 discard_upload 删除。
+
+    Args:
+        upload: 上传的文件
+        directory: 临时文件所在目录（不存在时创建），应与最终位置在同一文件系统
+        max_size: 大小上限（字节）
+
+    Raises:
+        HTTPException: 超过大小上限（413）或写入失败（500），此时不留下任何文件
+    """
+    if upload.size is not None and upload.size > max_size:
+        raise _too_large(max_size)
+
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise _too_large(max_size)
+                await run_in_threadpool(_write_chunk, out, digest, chunk)
+    except HTTPException:
+        os.remove(temp_path)
+        raise
+    except Exception as e:
+        _discard(Path(temp_path))
+        raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
+
+    return StoredUpload(path=Path(temp_path), size=size, sha256=digest.hexdigest())
+
+
+def publish_upload(stored: StoredUpload, target: Path) -> None:
+    """将临时文件原子重命名为 target（已存在时覆盖）"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # mkstemp 创建的文件仅所有者可读，改为与普通写入的文件一致
+    os.chmod(stored.path, 0o644)
+    os.replace(stored.path, target)
+    stored.path = target
+
+
+def discard_upload(stored: StoredUpload) -> None:
+    """删除未使用的临时文件"""
+    _discard(stored.path)
+
+
+class UploadSizeLimitMiddleware:
+    """
+    在读取请求体之前拒绝 Content-Length 超过上限的上传请求（路径以 /upload 结尾的 POST）
+    """
+
+    def __init__(self, app: Any, max_size: int = MAX_UPLOAD_SIZE):
+        self.app = app
+        self.max_size = max_size
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if (
+            scope["type"] == "http"
+            and scope["method"] == "POST"
+            and scope["path"].rstrip("/").endswith("/upload")
+        ):
+            headers = dict(scope["headers"])
+            length = headers.get(b"content-length", b"")
+            if length.isdigit() and int(length) > self.max_size + UPLOAD_FORM_OVERHEAD:
+                response = JSONResponse(
+                    status_code=413, content={"detail": _too_large(self.max_size).detail}
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
@@ -1,10 +1,17 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from app.core.config_dev import settings, TokenData
+from app.core.config_dev import BCRYPT_ROUNDS, settings, TokenData
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 成本不等于 BCRYPT_ROUNDS 的哈希视为需要更新（见 verify_and_update_password）
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -15,6 +22,13 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """验证密码，哈希的算法或成本已过时时同时返回按当前配置重新计算的哈希"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -36,11 +50,25 @@ def verify_token(token: str) -> Optional[TokenData]:
         username: Optional[str] = payload.get("sub")
         if username is None:
             return None
-        return TokenData(username=username)
+        return TokenData(username=username, expires_at=payload.get("exp"))
     except JWTError:
         return None
 
 
+# 期刊等级 -> 基础工作量
+BASE_WORKLOAD_MAP = {
+    "SCI_Q1": 10.0,
+    "SCI_Q2": 8.0,
+    "SCI_Q3": 6.0,
+    "SCI_Q4": 4.0,
+    "EI": 3.0,
+    "OTHER": 1.0,
+}
+
+# 未知等级的基础工作量
+DEFAULT_BASE_WORKLOAD = 1.0
+
+
 def calculate_workload(
     contribution_ratio: float, journal_grade: str = "OTHER"
 ) -> float:
@@ -55,16 +83,7 @@ def calculate_workload(
         工作量值
     """
     # 根据期刊等级确定基础工作量
-    base_workload_map = {
-        "SCI_Q1": 10.0,
-        "SCI_Q2": 8.0,
-        "SCI_Q3": 6.0,
-        "SCI_Q4": 4.0,
-        "EI": 3.0,
-        "OTHER": 1.0,
-    }
-
-    base_workload = base_workload_map.get(journal_grade, 1.0)
+    base_workload = BASE_WORKLOAD_MAP.get(journal_grade, DEFAULT_BASE_WORKLOAD)
 
     # 工作量 = 基础工作量 × 贡献比例
     return base_workload * contribution_ratio
@@ -0,0 +1,260 @@
+"""
+作者工作量统计
+
+工作量 = 期刊等级对应的基础工作量 × 贡献比例（见 calculate_workload）。
+等级表转换为 SQL CASE 表达式，在 paper_author、paper、journal 的一次连接查询中
+算出每条作者-论文记录的工作量。
+
+计算结果保存在 author_workload 台账中：论文作者、贡献比例、期刊、发表日期或
+期刊等级变化时，只重新计算受影响论文的台账行；工作量查询直接读取台账。
+台账可随时由 rebuild_workload_ledger 从源数据完整重建。
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, case, delete, extract, func, insert
+from sqlmodel import Session, col, select
+
+from app.models.author import Author
+from app.models.journal import Journal
+from app.models.paper import Paper, PaperAuthor
+from app.models.workload import AuthorWorkload
+from app.services.hydration import chunked
+from app.services.utils import BASE_WORKLOAD_MAP, DEFAULT_BASE_WORKLOAD
+
+# 论文没有期刊或期刊不存在时按 OTHER 计算
+journal_grade_expr = func.coalesce(Journal.grade, "OTHER")
+
+base_workload_expr = case(
+    BASE_WORKLOAD_MAP, value=journal_grade_expr, else_=DEFAULT_BASE_WORKLOAD
+)
+
+workload_expr = base_workload_expr * col(PaperAuthor.contribution_ratio)
+
+_LEDGER_COLUMNS = [
+    "author_id",
+    "paper_id",
+    "year",
+    "publication_date",
+    "team_id",
+    "journal_grade",
+    "contribution_ratio",
+    "is_corresponding",
+    "author_order",
+    "workload",
+]
+
+
+def _ledger_source(*filters: Any) -> Any:
+    """从源数据计算台账行的查询，列顺序与 _LEDGER_COLUMNS 一致"""
+    return (
+        select(
+            PaperAuthor.author_id,
+            PaperAuthor.paper_id,
+            extract("year", col(Paper.publication_date)),
+            Paper.publication_date,
+            Paper.team_id,
+            journal_grade_expr,
+            PaperAuthor.contribution_ratio,
+            PaperAuthor.is_corresponding,
+            PaperAuthor.author_order,
+            workload_expr,
+        )
+        .join(Paper, col(Paper.id) == PaperAuthor.paper_id)
+        .join(Journal, col(Journal.id) == Paper.journal_id, isouter=True)
+        .where(*filters)
+    )
+
+
+def refresh_paper_workloads(session: Session, paper_ids: Iterable[int]) -> None:
+    """
+    重新计算指定论文的台账行
+
+    在创建、修改、删除论文（包括批量导入）后、提交前调用。
+    """
+    ids = list(dict.fromkeys(paper_ids))
+    for batch in chunked(ids):
+        session.execute(
+            delete(AuthorWorkload).where(col(AuthorWorkload.paper_id).in_(batch))
+        )
+        session.execute(
+            insert(AuthorWorkload).from_select(
+                _LEDGER_COLUMNS,
+                _ledger_source(col(PaperAuthor.paper_id).in_(batch)),
+            )
+        )
+
+
+def refresh_journal_workloads(session: Session, journal_id: int) -> None:
+    """期刊等级变化后重新计算该期刊所有论文的台账行"""
+    paper_ids = select(Paper.id).where(Paper.journal_id == journal_id)
+    session.execute(
+        delete(AuthorWorkload).where(col(AuthorWorkload.paper_id).in_(paper_ids))
+    )
+    session.execute(
+        insert(AuthorWorkload).from_select(
+            _LEDGER_COLUMNS, _ledger_source(Paper.journal_id == journal_id)
+        )
+    )
+
+
+def rebuild_workload_ledger(session: Session) -> None:
+    """从源数据完整重建台账（不提交）"""
+    session.execute(delete(AuthorWorkload))
+    session.execute(insert(AuthorWorkload).from_select(_LEDGER_COLUMNS, _ledger_source()))
+
+
+def count_ledger_mismatches(session: Session) -> int:
+    """
+    统计台账与源数据不一致的行数（台账中多出的行 + 缺少的行）
+    """
+    ledger = select(*[getattr(AuthorWorkload, c) for c in _LEDGER_COLUMNS])
+    source = _ledger_source()
+    stale = session.exec(
+        select(func.count()).select_from(ledger.except_(source).subquery())
+    ).one()
+    missing = session.exec(
+        select(func.count()).select_from(source.except_(ledger).subquery())
+    ).one()
+    return stale + missing
+
+
+def sync_workload_ledger(session: Session) -> None:
+    """台账行数与源数据不一致时重建（如升级前已存在的论文数据）"""
+    ledger_count = session.exec(select(func.count()).select_from(AuthorWorkload)).one()
+    source_count = session.exec(
+        select(func.count()).select_from(_ledger_source().subquery())
+    ).one()
+    if ledger_count != source_count:
+        rebuild_workload_ledger(session)
+    session.commit()
+
+
+def ledger_filters(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    team_id: Optional[int] = None,
+) -> List[Any]:
+    """台账过滤条件（发表日期范围、团队），与论文列表接口的语义一致"""
+    filters = []
+    if start_date:
+        filters.append(col(AuthorWorkload.publication_date).is_not(None))
+        filters.append(col(AuthorWorkload.publication_date) >= start_date)
+    if end_date:
+        filters.append(col(AuthorWorkload.publication_date).is_not(None))
+        filters.append(col(AuthorWorkload.publication_date) <= end_date)
+    if team_id:
+        filters.append(AuthorWorkload.team_id == team_id)
+    return filters
+
+
+def get_paper_workloads(
+    session: Session,
+    author_id: Optional[int] = None,
+    paper_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    team_id: Optional[int] = None,
+    sort_by_date: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    获取作者-论文维度的工作量明细（读取台账）
+
+    Args:
+        author_id: 只统计该作者
+        paper_id: 只统计该论文
+        start_date / end_date: 发表日期范围
+        team_id: 论文所属团队
+        sort_by_date: 是否按发表日期升序排列（无发表日期的在前），否则按论文ID排列
+
+    Returns:
+        明细列表，同一论文的多位作者按作者顺序排列
+    """
+    query = (
+        select(AuthorWorkload, Author.name, Paper.title, Paper.journal_id, Journal.name)
+        .join(Paper, col(Paper.id) == AuthorWorkload.paper_id)
+        .join(Author, col(Author.id) == AuthorWorkload.author_id, isouter=True)
+        .join(Journal, col(Journal.id) == Paper.journal_id, isouter=True)
+        .where(*ledger_filters(start_date, end_date, team_id))
+    )
+    if author_id is not None:
+        query = query.where(AuthorWorkload.author_id == author_id)
+    if paper_id is not None:
+        query = query.where(AuthorWorkload.paper_id == paper_id)
+    if sort_by_date:
+        query = query.order_by(
+            col(AuthorWorkload.publication_date).is_not(None),
+            col(AuthorWorkload.publication_date),
+        )
+    query = query.order_by(
+        col(AuthorWorkload.paper_id), col(AuthorWorkload.author_order)
+    )
+
+    return [
+        {
+            "author_id": entry.author_id,
+            "author_name": author_name,
+            "paper_id": entry.paper_id,
+            "paper_title": title,
+            "publication_date": entry.publication_date,
+            "journal_id": journal_id,
+            "journal_name": journal_name,
+            "journal_grade": entry.journal_grade,
+            "contribution_ratio": entry.contribution_ratio,
+            "is_corresponding": entry.is_corresponding,
+            "author_order": entry.author_order,
+            "workload": entry.workload,
+        }
+        for entry, author_name, title, journal_id, journal_name in session.exec(
+            query
+        ).all()
+    ]
+
+
+def get_author_workload_totals(
+    session: Session,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    team_id: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    获取所有作者的工作量汇总（对台账一次 GROUP BY）
+
+    没有符合条件论文的作者也会返回，数量和工作量为 0。
+
+    Returns:
+        汇总列表，按总工作量降序
+    """
+    matched = and_(
+        col(AuthorWorkload.author_id) == Author.id,
+        *ledger_filters(start_date, end_date, team_id),
+    )
+    total_workload = func.coalesce(func.sum(AuthorWorkload.workload), 0)
+    query = (
+        select(
+            Author.id,
+            Author.name,
+            func.count(col(AuthorWorkload.paper_id)),
+            func.coalesce(
+                func.sum(case((col(AuthorWorkload.is_corresponding), 1), else_=0)), 0
+            ),
+            total_workload,
+        )
+        .join(AuthorWorkload, matched, isouter=True)
+        .group_by(col(Author.id))
+        .order_by(total_workload.desc(), col(Author.id))
+    )
+
+    return [
+        {
+            "author_id": author_id,
+            "author_name": name,
+            "paper_count": paper_count,
+            "corresponding_count": corresponding_count,
+            "total_workload": total,
+        }
+        for author_id, name, paper_count, corresponding_count, total in session.exec(
+            query
+        ).all()
+    ]
@@ -0,0 +1,76 @@
+"""
+Alembic 迁移环境
+
+使用应用的数据库配置（DATABASE_URL / DB_NAME）和 SQLModel 模型。
+由 app.core.database.upgrade_db 调用时通过 config.attributes["connection"] 传入连接，
+在调用方的事务中执行迁移。
+"""
+
+from logging.config import fileConfig
+from typing import Any
+
+from alembic import context
+from sqlalchemy.engine import Connection
+from sqlmodel import SQLModel
+
+import app.models  # noqa: F401  导入即把所有模型注册到 SQLModel.metadata
+from app.core.database import engine
+
+config = context.config
+
+# 命令行执行时使用 alembic.ini 中的日志配置，由应用调用时沿用应用的日志配置
+if config.config_file_name is not None and "connection" not in config.attributes:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = SQLModel.metadata
+
+
+def include_name(name: Any, type_: str, parent_names: Any) -> bool:
+    """
+    比较表结构时忽略不属于模型的对象：SQLite 全文索引的虚拟表及其影子表
+    （由 init_search_index 维护），以及 PostgreSQL 的 trigram 索引（见 0002）
+    """
+    if type_ == "table":
+        return "_fts" not in name
+    if type_ == "index":
+        return not name.endswith("_trgm")
+    return True
+
+
+def _run_migrations(connection: Connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_name=include_name,
+        # SQLite 不支持大部分 ALTER TABLE，以重建表的方式修改
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_offline() -> None:
+    """生成 SQL 脚本（alembic upgrade head --sql），不连接数据库"""
+    context.configure(
+        url=engine.url.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run_migrations(connection)
+        return
+    with engine.begin() as connection:
+        _run_migrations(connection)
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,560 @@
+"""baseline schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 02:44:46.660694
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 基线：引入 Alembic 时的完整表结构。只创建不存在的表和索引，
+    # 之前由 create_all 创建的数据库也可以直接升级
+    op.create_table(
+        "author",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("email", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("affiliation", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("email"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        op.f("ix_author_name"), "author", ["name"], unique=False, if_not_exists=True
+    )
+
+    op.create_table(
+        "category",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("description", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("parent_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["parent_id"],
+            ["category.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        op.f("ix_category_name"), "category", ["name"], unique=False, if_not_exists=True
+    )
+
+    op.create_table(
+        "file_blob",
+        sa.Column(
+            "sha256", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False
+        ),
+        sa.Column("file_path", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("sha256"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "journal",
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("grade", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("description", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        op.f("ix_journal_name"), "journal", ["name"], unique=True, if_not_exists=True
+    )
+
+    op.create_table(
+        "keyword",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        op.f("ix_keyword_name"), "keyword", ["name"], unique=True, if_not_exists=True
+    )
+
+    op.create_table(
+        "user",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("username", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("email", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("full_name", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column(
+            "hashed_password", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+        ),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("is_superuser", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        op.f("ix_user_email"), "user", ["email"], unique=True, if_not_exists=True
+    )
+    op.create_index(
+        op.f("ix_user_username"), "user", ["username"], unique=True, if_not_exists=True
+    )
+
+    op.create_table(
+        "category_closure",
+        sa.Column("ancestor_id", sa.Integer(), nullable=False),
+        sa.Column("descendant_id", sa.Integer(), nullable=False),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["ancestor_id"],
+            ["category.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["descendant_id"],
+            ["category.id"],
+        ),
+        sa.PrimaryKeyConstraint("ancestor_id", "descendant_id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        op.f("ix_category_closure_descendant_id"),
+        "category_closure",
+        ["descendant_id"],
+        unique=False,
+        if_not_exists=True,
+    )
+
+    op.create_table(
+        "file_text",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column(
+            "sha256", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False
+        ),
+        sa.Column("status", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("page_count", sa.Integer(), nullable=True),
+        sa.Column("text", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("error", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("extracted_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["sha256"],
+            ["file_blob.sha256"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("sha256"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        op.f("ix_file_text_status"),
+        "file_text",
+        ["status"],
+        unique=False,
+        if_not_exists=True,
+    )
+
+    op.create_table(
+        "job",
+        sa.Column("id", sqlmodel.sql.sqltypes.AutoString(length=32), nullable=False),
+        sa.Column("kind", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("status", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("params", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("progress", sa.Float(), nullable=False),
+        sa.Column("result_path", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("result_name", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("media_type", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("error", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("created_by_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["created_by_id"],
+            ["user.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        op.f("ix_job_created_by_id"),
+        "job",
+        ["created_by_id"],
+        unique=False,
+        if_not_exists=True,
+    )
+    op.create_index(
+        op.f("ix_job_expires_at"),
+        "job",
+        ["expires_at"],
+        unique=False,
+        if_not_exists=True,
+    )
+    op.create_index(
+        op.f("ix_job_kind"), "job", ["kind"], unique=False, if_not_exists=True
+    )
+    op.create_index(
+        op.f("ix_job_status"), "job", ["status"], unique=False, if_not_exists=True
+    )
+
+    op.create_table(
+        "team",
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("description", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("creator_id", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("max_members", sa.Integer(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("last_active_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["creator_id"],
+            ["user.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        op.f("ix_team_name"), "team", ["name"], unique=False, if_not_exists=True
+    )
+
+    op.create_table(
+        "coauthorship",
+        sa.Column("author_id", sa.Integer(), nullable=False),
+        sa.Column("coauthor_id", sa.Integer(), nullable=False),
+        sa.Column("team_id", sa.Integer(), nullable=False),
+        sa.Column("paper_count", sa.Integer(), nullable=False),
+        sa.Column("first_year", sa.Integer(), nullable=True),
+        sa.Column("last_year", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["author_id"],
+            ["author.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["coauthor_id"],
+            ["author.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["team_id"],
+            ["team.id"],
+        ),
+        sa.PrimaryKeyConstraint("author_id", "coauthor_id", "team_id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        op.f("ix_coauthorship_coauthor_id"),
+        "coauthorship",
+        ["coauthor_id"],
+        unique=False,
+        if_not_exists=True,
+    )
+    op.create_index(
+        op.f("ix_coauthorship_team_id"),
+        "coauthorship",
+        ["team_id"],
+        unique=False,
+        if_not_exists=True,
+    )
+
+    op.create_table(
+        "paper",
+        sa.Column("title", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("abstract", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("publication_date", sa.DateTime(), nullable=True),
+        sa.Column("journal_id", sa.Integer(), nullable=True),
+        sa.Column("doi", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("file_path", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_by_id", sa.Integer(), nullable=False),
+        sa.Column("team_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["category_id"],
+            ["category.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["created_by_id"],
+            ["user.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["journal_id"],
+            ["journal.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["team_id"],
+            ["team.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("doi"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        op.f("ix_paper_title"), "paper", ["title"], unique=False, if_not_exists=True
+    )
+
+    op.create_table(
+        "reference_category",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("description", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("parent_id", sa.Integer(), nullable=True),
+        sa.Column("team_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["parent_id"],
+            ["reference_category.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["team_id"],
+            ["team.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        op.f("ix_reference_category_name"),
+        "reference_category",
+        ["name"],
+        unique=False,
+        if_not_exists=True,
+    )
+
+    op.create_table(
+        "teamuser",
+        sa.Column("team_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "role", sa.Enum("OWNER", "ADMIN", "MEMBER", name="teamrole"), nullable=False
+        ),
+        sa.Column("joined_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["team_id"],
+            ["team.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["user.id"],
+        ),
+        sa.PrimaryKeyConstraint("team_id", "user_id"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "author_workload",
+        sa.Column("author_id", sa.Integer(), nullable=False),
+        sa.Column("paper_id", sa.Integer(), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=True),
+        sa.Column("publication_date", sa.DateTime(), nullable=True),
+        sa.Column("team_id", sa.Integer(), nullable=False),
+        sa.Column("journal_grade", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("contribution_ratio", sa.Float(), nullable=False),
+        sa.Column("is_corresponding", sa.Boolean(), nullable=False),
+        sa.Column("author_order", sa.Integer(), nullable=False),
+        sa.Column("workload", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["author_id"],
+            ["author.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["paper_id"],
+            ["paper.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["team_id"],
+            ["team.id"],
+        ),
+        sa.PrimaryKeyConstraint("author_id", "paper_id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        op.f("ix_author_workload_paper_id"),
+        "author_workload",
+        ["paper_id"],
+        unique=False,
+        if_not_exists=True,
+    )
+    op.create_index(
+        op.f("ix_author_workload_team_id"),
+        "author_workload",
+        ["team_id"],
+        unique=False,
+        if_not_exists=True,
+    )
+    op.create_index(
+        op.f("ix_author_workload_year"),
+        "author_workload",
+        ["year"],
+        unique=False,
+        if_not_exists=True,
+    )
+
+    op.create_table(
+        "paper_author",
+        sa.Column("paper_id", sa.Integer(), nullable=False),
+        sa.Column("author_id", sa.Integer(), nullable=False),
+        sa.Column("contribution_ratio", sa.Float(), nullable=False),
+        sa.Column("is_corresponding", sa.Boolean(), nullable=False),
+        sa.Column("author_order", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["author_id"],
+            ["author.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["paper_id"],
+            ["paper.id"],
+        ),
+        sa.PrimaryKeyConstraint("paper_id", "author_id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        op.f("ix_paper_author_author_id"),
+        "paper_author",
+        ["author_id"],
+        unique=False,
+        if_not_exists=True,
+    )
+
+    op.create_table(
+        "paperkeyword",
+        sa.Column("paper_id", sa.Integer(), nullable=False),
+        sa.Column("keyword_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["keyword_id"],
+            ["keyword.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["paper_id"],
+            ["paper.id"],
+        ),
+        sa.PrimaryKeyConstraint("paper_id", "keyword_id"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "reference_category_closure",
+        sa.Column("ancestor_id", sa.Integer(), nullable=False),
+        sa.Column("descendant_id", sa.Integer(), nullable=False),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["ancestor_id"],
+            ["reference_category.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["descendant_id"],
+            ["reference_category.id"],
+        ),
+        sa.PrimaryKeyConstraint("ancestor_id", "descendant_id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        op.f("ix_reference_category_closure_descendant_id"),
+        "reference_category_closure",
+        ["descendant_id"],
+        unique=False,
+        if_not_exists=True,
+    )
+
+    op.create_table(
+        "referencepaper",
+        sa.Column("title", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("authors", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("doi", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("file_path", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("journal_id", sa.Integer(), nullable=True),
+        sa.Column("publication_year", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("team_id", sa.Integer(), nullable=True),
+        sa.Column("created_by_id", sa.Integer(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["category_id"],
+            ["reference_category.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["created_by_id"],
+            ["user.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["journal_id"],
+            ["journal.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["team_id"],
+            ["team.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("doi"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        op.f("ix_referencepaper_publication_year"),
+        "referencepaper",
+        ["publication_year"],
+        unique=False,
+        if_not_exists=True,
+    )
+    op.create_index(
+        op.f("ix_referencepaper_title"),
+        "referencepaper",
+        ["title"],
+        unique=False,
+        if_not_exists=True,
+    )
+
+    op.create_table(
+        "referencekeyword",
+        sa.Column("reference_id", sa.Integer(), nullable=False),
+        sa.Column("keyword_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["keyword_id"],
+            ["keyword.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["reference_id"],
+            ["referencepaper.id"],
+        ),
+        sa.PrimaryKeyConstraint("reference_id", "keyword_id"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("referencekeyword")
+    op.drop_table("referencepaper")
+    op.drop_table("reference_category_closure")
+    op.drop_table("paperkeyword")
+    op.drop_table("paper_author")
+    op.drop_table("author_workload")
+    op.drop_table("teamuser")
+    op.drop_table("reference_category")
+    op.drop_table("paper")
+    op.drop_table("coauthorship")
+    op.drop_table("team")
+    op.drop_table("job")
+    op.drop_table("file_text")
+    op.drop_table("category_closure")
+    op.drop_table("user")
+    op.drop_table("keyword")
+    op.drop_table("journal")
+    op.drop_table("file_blob")
+    op.drop_table("category")
+    op.drop_table("author")
@@ -0,0 +1,59 @@
+"""postgresql trigram indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 03:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.exc import DBAPIError
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# PostgreSQL 上没有 FTS5 全文索引，检索退回 ILIKE '%词%'，用 pg_trgm 的 GIN 索引加速
+# (表名, 列名)，索引名为 ix_{表名}_{列名}_trgm
+TRIGRAM_COLUMNS = [
+    ("paper", "title"),
+    ("paper", "abstract"),
+    ("referencepaper", "title"),
+    ("referencepaper", "authors"),
+    ("file_text", "text"),
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    try:
+        with bind.begin_nested():
+            op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except DBAPIError:
+        # 没有创建扩展的权限时不建索引，检索仍可用，只是需要全表扫描
+        print("WARNING: pg_trgm is not available, skipping trigram indexes")
+        return
+
+    for table, column in TRIGRAM_COLUMNS:
+        op.create_index(
+            f"ix_{table}_{column}_trgm",
+            table,
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table, column in TRIGRAM_COLUMNS:
+        op.drop_index(f"ix_{table}_{column}_trgm", table_name=table, if_exists=True)
@@ -0,0 +1,58 @@
+"""filter column indexes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 03:14:27.557407
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 论文、参考文献列表的筛选和排序列，(索引名, 表名, 列)
+# 由 scripts/check_query_plans.py 检查各列表接口是否用到
+INDEXES = [
+    ("ix_paper_team_id_publication_date", "paper", ["team_id", "publication_date"]),
+    ("ix_paper_category_id", "paper", ["category_id"]),
+    ("ix_paper_journal_id", "paper", ["journal_id"]),
+    ("ix_paper_publication_date", "paper", ["publication_date"]),
+    ("ix_paper_created_at", "paper", ["created_at"]),
+    ("ix_paper_author_author_id_paper_id", "paper_author", ["author_id", "paper_id"]),
+    ("ix_paperkeyword_keyword_id_paper_id", "paperkeyword", ["keyword_id", "paper_id"]),
+    (
+        "ix_referencepaper_team_id_publication_year",
+        "referencepaper",
+        ["team_id", "publication_year"],
+    ),
+    ("ix_referencepaper_category_id", "referencepaper", ["category_id"]),
+    ("ix_referencepaper_journal_id", "referencepaper", ["journal_id"]),
+    ("ix_referencepaper_created_at", "referencepaper", ["created_at"]),
+    (
+        "ix_referencekeyword_keyword_id_reference_id",
+        "referencekeyword",
+        ["keyword_id", "reference_id"],
+    ),
+    ("ix_teamuser_user_id", "teamuser", ["user_id"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+    # 被 (author_id, paper_id) 索引取代
+    op.drop_index("ix_paper_author_author_id", table_name="paper_author", if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_paper_author_author_id", "paper_author", ["author_id"], if_not_exists=True
+    )
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,65 @@
+"""api keys
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 03:25:11.741174
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCOPE = sa.Enum("READ", "WRITE", name="apikeyscope")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "api_key",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("prefix", sqlmodel.sql.sqltypes.AutoString(length=16), nullable=False),
+        sa.Column("key_hash", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+        sa.Column("scope", SCOPE, nullable=False),
+        sa.Column("all_teams", sa.Boolean(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=True),
+        sa.Column("last_used_at", sa.DateTime(), nullable=True),
+        sa.Column("use_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_api_key_key_hash", "api_key", ["key_hash"], unique=True, if_not_exists=True
+    )
+    op.create_index("ix_api_key_user_id", "api_key", ["user_id"], if_not_exists=True)
+
+    op.create_table(
+        "api_key_team",
+        sa.Column("api_key_id", sa.Integer(), nullable=False),
+        sa.Column("team_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["api_key_id"], ["api_key.id"]),
+        sa.ForeignKeyConstraint(["team_id"], ["team.id"]),
+        sa.PrimaryKeyConstraint("api_key_id", "team_id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_api_key_team_team_id", "api_key_team", ["team_id"], if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("api_key_team", if_exists=True)
+    op.drop_table("api_key", if_exists=True)
+    # PostgreSQL 上枚举是单独的类型
+    SCOPE.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,32 @@
+"""job team scope
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 05:02:47.318524
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 使用 API 密钥提交的任务保存密钥限定的团队
+    op.add_column(
+        "job",
+        sa.Column("team_ids", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("job") as batch_op:
+        batch_op.drop_column("team_ids")
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Login Storm Benchmark Script
+Command-line tool for measuring how a burst of logins affects unrelated
+requests: the server is started against a throwaway database, one client keeps
+requesting a probe endpoint while other clients log in as fast as they can
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+from colorama import init, Fore, Style
+
+# Add project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Initialize colorama for Windows
+init(autoreset=True)
+
+ADMIN_PASSWORD = "benchmark-password"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(args: argparse.Namespace, data_dir: str, port: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{Path(data_dir) / 'benchmark.db'}",
+        "ADMIN_USERNAME": "admin",
+        "ADMIN_PASSWORD": ADMIN_PASSWORD,
+        "BCRYPT_ROUNDS": str(args.rounds),
+        "PASSWORD_HASH_WORKERS": str(args.workers),
+        "PASSWORD_HASH_QUEUE_SIZE": str(args.queue_size),
+    }
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+        ],
+        cwd=project_root,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_ready(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Server did not start")
+
+
+def login(client: httpx.Client) -> httpx.Response:
+    return client.post(
+        "/api/users/token", data={"username": "admin", "password": ADMIN_PASSWORD}
+    )
+
+
+def probe(
+    client: httpx.Client, url: str, stop: threading.Event, latencies: List[float]
+) -> None:
+    """Request the probe endpoint back to back, recording latencies"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        client.get(url)
+        latencies.append(time.perf_counter() - start)
+        time.sleep(0.005)
+
+
+def storm(base_url: str, stop: threading.Event, counts: Dict[int, int], lock: threading.Lock) -> None:
+    """Log in repeatedly, counting the response status codes"""
+    with httpx.Client(base_url=base_url, timeout=60.0) as client:
+        while not stop.is_set():
+            status_code = login(client).status_code
+            with lock:
+                counts[status_code] = counts.get(status_code, 0) + 1
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)] * 1000
+
+
+def run_phase(
+    base_url: str, token: str, args: argparse.Namespace, logins: int
+) -> Dict[str, object]:
+    """Probe for --duration seconds while `logins` clients log in"""
+    stop = threading.Event()
+    latencies: List[float] = []
+    counts: Dict[int, int] = {}
+    lock = threading.Lock()
+    client = httpx.Client(
+        base_url=base_url, timeout=60.0, headers={"Authorization": f"Bearer {token}"}
+    )
+    threads = [
+        threading.Thread(target=storm, args=(base_url, stop, counts, lock))
+        for _ in range(logins)
+    ] + [threading.Thread(target=probe, args=(client, args.probe, stop, latencies))]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    client.close()
+    return {
+        "requests": len(latencies),
+        "p50": percentile(latencies, 0.50),
+        "p99": percentile(latencies, 0.99),
+        "max": max(latencies) * 1000 if latencies else 0.0,
+        "logins": counts,
+    }
+
+
+def main_cli() -> int:
+    """Main function for command-line execution"""
+    parser = argparse.ArgumentParser(
+        description="Measure the latency of an unrelated endpoint during a login storm"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=16, help="Clients logging in concurrently"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=10.0, help="Seconds to run each phase"
+    )
+    parser.add_argument(
+        "--probe", default="/api/users/me", help="Endpoint measured during the storm"
+    )
+    parser.add_argument("--rounds", type=int, default=12, help="BCRYPT_ROUNDS")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="PASSWORD_HASH_WORKERS (0 hashes on the event loop, as before the pool)",
+    )
+    parser.add_argument(
+        "--queue-size", type=int, default=64, help="PASSWORD_HASH_QUEUE_SIZE"
+    )
+    args = parser.parse_args()
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory() as data_dir:
+        server = start_server(args, data_dir, port)
+        try:
+            wait_ready(base_url)
+            with httpx.Client(base_url=base_url, timeout=60.0) as client:
+                response = login(client)
+                if response.status_code != 200:
+                    print(f"{Fore.RED}Login failed: {response.text}{Style.RESET_ALL}")
+                    return 1
+                token = response.json()["access_token"]
+
+            print(
+                f"{Fore.CYAN}bcrypt rounds {args.rounds}, {args.workers} hashing workers, "
+                f"{args.concurrency} login clients, {args.duration:g}s per phase, "
+                f"probe {args.probe}{Style.RESET_ALL}"
+            )
+            print(
+                f"{'phase':<10}{'probes':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+                f"{'logins/s':>10}  statuses"
+            )
+            for phase, logins in (("idle", 0), ("storm", args.concurrency)):
+                result = run_phase(base_url, token, args, logins)
+                counts: Dict[int, int] = result["logins"]  # type: ignore
+                rate = sum(counts.values()) / args.duration
+                statuses = ", ".join(f"{code}: {n}" for code, n in sorted(counts.items()))
+                print(
+                    f"{phase:<10}{result['requests']:>8}{result['p50']:>10.2f}"
+                    f"{result['p99']:>10.2f}{result['max']:>10.2f}{rate:>10.1f}  {statuses}"
+                )
+
+            with httpx.Client(
+                base_url=base_url, timeout=60.0, headers={"Authorization": f"Bearer {token}"}
+            ) as client:
+                stats = client.get("/api/users/password-hashing").json()
+            print(
+                f"hashing: {stats['completed']} completed, {stats['rejected']} rejected, "
+                f"max queued {stats['max_queued']}, avg wait {stats['avg_wait_ms']:.1f} ms, "
+                f"max wait {stats['max_wait_ms']:.1f} ms, avg hash {stats['avg_hash_ms']:.1f} ms"
+            )
+        except Exception as e:
+            print(f"{Fore.RED}Benchmark failed: {e}{Style.RESET_ALL}")
+            return 1
+        finally:
+            server.terminate()
+            server.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+SQLite Concurrency Benchmark Script
+Command-line tool for comparing read/write throughput of the SQLite profiles
+(DB_PROFILE) under concurrent readers and writers
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+from sqlalchemy import func, insert, update
+from sqlalchemy.exc import OperationalError
+from sqlmodel import SQLModel, col, create_engine, select
+from colorama import init, Fore, Style
+
+# Add project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Initialize colorama for Windows
+init(autoreset=True)
+
+import app.models  # noqa: F401  (side effect: registers all models with SQLModel.metadata)
+from app.core.config_dev import SQLITE_PROFILES
+from app.core.database import apply_sqlite_pragmas
+from app.models.paper import Paper
+
+
+class Stats:
+    """Latencies and errors collected by the worker threads"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {"read": [], "write": []}
+        self.errors: Dict[str, int] = {"read": 0, "write": 0}
+
+    def record(self, kind: str, seconds: float) -> None:
+        with self.lock:
+            self.latencies[kind].append(seconds)
+
+    def error(self, kind: str) -> None:
+        with self.lock:
+            self.errors[kind] += 1
+
+
+# Foreign keys are not enforced by SQLite, the papers need no user or team rows
+OWNER = {"created_by_id": 1, "team_id": 1}
+
+
+def seed(engine, rows: int) -> None:
+    SQLModel.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Paper),
+            [
+                {
+                    "title": f"Paper {i}",
+                    "abstract": "lorem ipsum " * 20,
+                    "created_at": now,
+                    "updated_at": now,
+                    **OWNER,
+                }
+                for i in range(rows)
+            ],
+        )
+
+
+def reader(engine, stats: Stats, stop: threading.Event, rows: int) -> None:
+    """Paper list page: one page of rows plus the total count"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            with engine.connect() as connection:
+                connection.execute(
+                    select(Paper)
+                    .order_by(col(Paper.id).desc())
+                    .offset(random.randrange(rows))
+                    .limit(20)
+                ).all()
+                connection.execute(select(func.count()).select_from(Paper)).scalar()
+        except OperationalError:
+            stats.error("read")
+            continue
+        stats.record("read", time.perf_counter() - start)
+
+
+def writer(engine, stats: Stats, stop: threading.Event, rows: int) -> None:
+    """One transaction inserting a paper and touching an existing one"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            with engine.begin() as connection:
+                now = datetime.utcnow()
+                connection.execute(
+                    insert(Paper).values(
+                        title="New paper", created_at=now, updated_at=now, **OWNER
+                    )
+                )
+                connection.execute(
+                    update(Paper)
+                    .where(col(Paper.id) == random.randrange(1, rows))
+                    .values(updated_at=now)
+                )
+        except OperationalError:
+            stats.error("write")
+            continue
+        stats.record("write", time.perf_counter() - start)
+
+
+def run_profile(profile: str, args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(
+            f"sqlite:///{Path(tmp) / 'benchmark.db'}",
+            connect_args={"check_same_thread": False},
+            pool_size=args.readers + args.writers,
+        )
+        apply_sqlite_pragmas(engine, SQLITE_PROFILES[profile])
+        seed(engine, args.rows)
+
+        stats = Stats()
+        stop = threading.Event()
+        threads = [
+            threading.Thread(target=reader, args=(engine, stats, stop, args.rows))
+            for _ in range(args.readers)
+        ] + [
+            threading.Thread(target=writer, args=(engine, stats, stop, args.rows))
+            for _ in range(args.writers)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(args.duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+
+    results = {}
+    for kind, latencies in stats.latencies.items():
+        latencies.sort()
+        results[kind] = {
+            "ops": len(latencies) / args.duration,
+            "p50": statistics.median(latencies) * 1000 if latencies else 0.0,
+            "p95": latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0,
+            "errors": stats.errors[kind],
+        }
+    return results
+
+
+def main_cli() -> int:
+    """Main function for command-line execution"""
+    parser = argparse.ArgumentParser(
+        description="Benchmark concurrent reads and writes for each SQLite profile"
+    )
+    parser.add_argument("--readers", type=int, default=8, help="Reader threads")
+    parser.add_argument("--writers", type=int, default=2, help="Writer threads")
+    parser.add_argument(
+        "--duration", type=float, default=5.0, help="Seconds to run each profile"
+    )
+    parser.add_argument("--rows", type=int, default=5000, help="Papers to seed")
+    parser.add_argument(
+        "--profile",
+        action="append",
+        choices=list(SQLITE_PROFILES),
+        help="Profile to run (repeatable, default: all)",
+    )
+    args = parser.parse_args()
+
+    profiles = args.profile or list(SQLITE_PROFILES)
+    print(
+        f"{Fore.CYAN}{args.readers} readers, {args.writers} writers, "
+        f"{args.duration:g}s per profile, {args.rows} papers{Style.RESET_ALL}"
+    )
+    print(
+        f"{'profile':<10}{'kind':<7}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}"
+    )
+    for profile in profiles:
+        for kind, result in run_profile(profile, args).items():
+            color = Fore.RED if result["errors"] else Fore.GREEN
+            print(
+                f"{color}{profile:<10}{kind:<7}{result['ops']:>10.1f}"
+                f"{result['p50']:>10.2f}{result['p95']:>10.2f}"
+                f"{result['errors']:>8}{Style.RESET_ALL}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Query Plan Check Script
+Command-line tool for verifying that the paper and reference list filters are
+served by indexes: every SELECT issued by the endpoints is run through SQLite's
+EXPLAIN QUERY PLAN and full table scans are reported
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, List, Set, Tuple
+
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel
+from colorama import init, Fore, Style
+
+# Add project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Initialize colorama for Windows
+init(autoreset=True)
+
+# The checks run against a throwaway SQLite database with the full schema
+_tmp_dir = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_tmp_dir.name) / 'query_plans.db'}"
+
+from fastapi.testclient import TestClient
+
+from app.core.database import async_engine, engine, init_db, upgrade_db
+from app.main import app
+from app.models.author import Author
+from app.models.category import Category
+from app.models.journal import Journal
+from app.models.keyword import Keyword
+from app.models.paper import Paper, PaperAuthor, PaperKeyword
+from app.models.reference import ReferenceCategory, ReferenceKeyword, ReferencePaper
+from app.models.team import Team, TeamRole, TeamUser
+from app.models.user import User
+from app.services.utils import create_access_token, get_password_hash
+
+# "SCAN paper" is a full table scan; "SCAN paper USING INDEX ..." walks an index,
+# "SCAN paper_fts VIRTUAL TABLE ..." is a full-text index lookup and
+# "SCAN anon_1" reads a subquery
+FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$")
+
+# (name, URL, tables allowed to be scanned)
+CHECKS: List[Tuple[str, str, Set[str]]] = [
+    # Without filters every paper is a candidate row
+    ("papers", "/api/papers/", {"paper"}),
+    ("papers by team", "/api/papers/?team_id=1", set()),
+    ("papers by category", "/api/papers/?category_id=1", set()),
+    ("papers by author", "/api/papers/?author_name=Author", set()),
+    ("papers by keyword", "/api/papers/?keyword=keyword", set()),
+    ("papers by journal", "/api/papers/?journal_id=1", set()),
+    ("papers by date", "/api/papers/?start_date=2020-01-01&end_date=2021-01-01", set()),
+    (
+        "papers by team and date",
+        "/api/papers/?team_id=1&start_date=2020-01-01",
+        set(),
+    ),
+    ("papers search", "/api/papers/?q=paper", set()),
+    ("papers by created_at", "/api/papers/?order_by=created_at", set()),
+    ("papers by publication_date", "/api/papers/?order_by=publication_date", set()),
+    (
+        "team papers by publication_date",
+        "/api/papers/?team_id=1&order_by=publication_date",
+        set(),
+    ),
+    ("references", "/api/references/", set()),
+    ("references by team", "/api/references/?team_id=1", set()),
+    ("references by category", "/api/references/?team_id=1&category_id=1", set()),
+    ("references by keyword", "/api/references/?keyword=keyword", set()),
+    ("references by journal", "/api/references/?journal_id=1", set()),
+    ("references by year", "/api/references/?publication_year=2020", set()),
+    ("references search", "/api/references/?q=reference", set()),
+    ("references by created_at", "/api/references/?order_by=created_at", set()),
+    (
+        "team references by publication_year",
+        "/api/references/?team_id=1&order_by=publication_year",
+        set(),
+    ),
+]
+
+
+def seed() -> str:
+    """Create one row of each kind referenced by the checks, returns a token"""
+    now = datetime(2020, 6, 1)
+    with Session(engine) as session:
+        user = User(
+            username="planner",
+            email="planner@example.com",
+            full_name="Planner",
+            hashed_password=get_password_hash("planner"),
+        )
+        session.add(user)
+        session.flush()
+        team = Team(name="Team", creator_id=user.id)  # type: ignore
+        journal = Journal(name="Journal")
+        category = Category(name="Category")
+        author = Author(name="Author")
+        keyword = Keyword(name="keyword")
+        session.add_all([team, journal, category, author, keyword])
+        session.flush()
+        session.add(TeamUser(team_id=team.id, user_id=user.id, role=TeamRole.OWNER))
+        reference_category = ReferenceCategory(name="Category", team_id=team.id)  # type: ignore
+        paper = Paper(
+            title="A paper",
+            publication_date=now,
+            journal_id=journal.id,
+            category_id=category.id,
+            created_by_id=user.id,  # type: ignore
+            team_id=team.id,  # type: ignore
+        )
+        reference = ReferencePaper(
+            title="A reference",
+            authors="Author",
+            journal_id=journal.id,
+            publication_year=2020,
+            team_id=team.id,
+            created_by_id=user.id,  # type: ignore
+        )
+        session.add_all([reference_category, paper, reference])
+        session.flush()
+        reference.category_id = reference_category.id
+        session.add(PaperAuthor(paper_id=paper.id, author_id=author.id, author_order=1))  # type: ignore
+        session.add(PaperKeyword(paper_id=paper.id, keyword_id=keyword.id))
+        session.add(ReferenceKeyword(reference_id=reference.id, keyword_id=keyword.id))
+        session.commit()
+    return create_access_token({"sub": "planner"})
+
+
+def explain(statement: str, parameters: Any) -> List[str]:
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        ).all()
+    return [row[-1] for row in rows]
+
+
+def run_check(
+    client: TestClient, url: str, allowed: Set[str], token: str
+) -> Tuple[int, List[Tuple[str, List[str]]]]:
+    """Request the URL, returns the status code and the SELECTs with full scans"""
+    statements: List[Tuple[str, Any]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    listeners = [engine, async_engine.sync_engine]
+    for target in listeners:
+        event.listen(target, "before_cursor_execute", record)
+    try:
+        response = client.get(url, headers={"Authorization": f"Bearer {token}"})
+    finally:
+        for target in listeners:
+            event.remove(target, "before_cursor_execute", record)
+
+    failures = []
+    for statement, parameters in statements:
+        plan = explain(statement, parameters)
+        scanned = [
+            match.group(1)
+            for match in map(FULL_SCAN.match, plan)
+            if match
+            and match.group(1) in SQLModel.metadata.tables
+            and match.group(1) not in allowed
+        ]
+        if scanned:
+            failures.append((statement, plan))
+    return response.status_code, failures
+
+
+def main_cli() -> int:
+    """Main function for command-line execution"""
+    parser = argparse.ArgumentParser(
+        description="Check that the list and filter endpoints use indexes"
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Print the query plan of failed queries"
+    )
+    args = parser.parse_args()
+
+    upgrade_db(engine)
+    token = seed()
+    init_db()
+
+    failed = 0
+    client = TestClient(app)
+    try:
+        for name, url, allowed in CHECKS:
+            status_code, failures = run_check(client, url, allowed, token)
+            if status_code != 200:
+                failed += 1
+                print(f"{Fore.RED}ERROR {name}: HTTP {status_code}{Style.RESET_ALL}")
+                continue
+            if not failures:
+                print(f"{Fore.GREEN}OK    {name}{Style.RESET_ALL}")
+                continue
+            failed += 1
+            print(f"{Fore.RED}SCAN  {name}{Style.RESET_ALL}")
+            for statement, plan in failures:
+                print(f"      {' '.join(statement.split())[:160]}")
+                if args.verbose:
+                    for line in plan:
+                        print(f"        {line}")
+    finally:
+        asyncio.run(async_engine.dispose())
+        engine.dispose()
+
+    if failed:
+        print(f"{Fore.RED}{failed} of {len(CHECKS)} checks failed{Style.RESET_ALL}")
+        return 1
+    print(f"{Fore.GREEN}All {len(CHECKS)} checks use indexes{Style.RESET_ALL}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
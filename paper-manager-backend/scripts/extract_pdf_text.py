@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+PDF Text Extraction Script
+Command-line tool for extracting the text of uploaded PDFs into the full-text index
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from sqlmodel import Session, func, select
+from colorama import init, Fore, Style
+
+# Add project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Initialize colorama for Windows
+init(autoreset=True)
+
+from app.core.database import init_db, engine
+from app.models.blob import FileText
+from app.services.text_extraction import (
+    TEXT_FAILED,
+    queue_missing_text_extraction,
+    shutdown_text_extraction,
+    submit_text_extraction,
+)
+
+
+def main_cli() -> int:
+    """Main function for command-line execution"""
+    parser = argparse.ArgumentParser(
+        description="Extract the text of uploaded PDFs that have not been indexed yet"
+    )
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="Also retry files whose extraction failed before",
+    )
+    args = parser.parse_args()
+
+    print(f"{Fore.CYAN}Initializing database...{Style.RESET_ALL}")
+    init_db()
+
+    with Session(engine) as session:
+        statuses = [TEXT_FAILED] if args.retry_failed else []
+        targets = queue_missing_text_extraction(session, statuses)
+        if not targets:
+            print(f"{Fore.GREEN}All PDF files are already extracted{Style.RESET_ALL}")
+            return 0
+
+        print(f"{Fore.CYAN}Extracting text from {len(targets)} files...{Style.RESET_ALL}")
+        for sha256, path in targets:
+            submit_text_extraction(sha256, path)
+        # Results are written back before the pool shuts down
+        shutdown_text_extraction(wait=True)
+
+        counts = dict(
+            session.exec(
+                select(FileText.status, func.count()).group_by(FileText.status)  # type: ignore
+            ).all()
+        )
+        for status, count in sorted(counts.items()):
+            color = Fore.RED if status == TEXT_FAILED else Fore.GREEN
+            print(f"{color}{status}: {count}{Style.RESET_ALL}")
+    return 1 if counts.get(TEXT_FAILED) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Bulk Paper Import Script
+Command-line tool for importing papers from JSON, CSV or Excel files
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from sqlmodel import Session, select
+from colorama import init, Fore, Style
+
+# Add project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Initialize colorama for Windows
+init(autoreset=True)
+
+from app.core.database import init_db, engine
+from app.models.user import User
+from app.services.paper_import import (
+    IMPORT_CHUNK_SIZE,
+    import_papers,
+    parse_import_file,
+)
+
+
+def main_cli() -> int:
+    """Main function for command-line execution"""
+    parser = argparse.ArgumentParser(
+        description="Import papers in bulk from a JSON, CSV or Excel file"
+    )
+    parser.add_argument("file", help="Path to a .json, .csv, .xlsx or .xls file")
+    parser.add_argument(
+        "--username",
+        default="admin",
+        help="User recorded as the creator of the papers (default: admin)",
+    )
+    parser.add_argument(
+        "--team-id",
+        type=int,
+        default=None,
+        help="Default team for rows without a team_id",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=IMPORT_CHUNK_SIZE,
+        help=f"Rows committed per transaction (default: {IMPORT_CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "--errors-file",
+        default=None,
+        help="Write the per-row error report to this JSON file",
+    )
+    args = parser.parse_args()
+
+    path = Path(args.file)
+    if not path.is_file():
+        print(f"{Fore.RED}File not found: {path}{Style.RESET_ALL}")
+        return 1
+
+    try:
+        rows = parse_import_file(path.name, path.read_bytes())
+    except (ValueError, UnicodeDecodeError) as e:
+        print(f"{Fore.RED}Invalid import file: {e}{Style.RESET_ALL}")
+        return 1
+
+    print(f"{Fore.CYAN}Initializing database...{Style.RESET_ALL}")
+    init_db()
+
+    with Session(engine) as session:
+        user = session.exec(select(User).where(User.username == args.username)).first()
+        if not user:
+            print(f"{Fore.RED}User '{args.username}' not found{Style.RESET_ALL}")
+            return 1
+
+        print(f"{Fore.CYAN}Importing {len(rows)} rows from {path}...{Style.RESET_ALL}")
+        result = import_papers(
+            session,
+            rows,
+            user,
+            default_team_id=args.team_id,
+            chunk_size=args.chunk_size,
+        )
+
+    print(f"{Fore.CYAN}" + "=" * 50 + f"{Style.RESET_ALL}")
+    print(f"{Fore.BLUE}Total rows: {result.total}{Style.RESET_ALL}")
+    print(f"{Fore.GREEN}Imported: {result.created}{Style.RESET_ALL}")
+    color = Fore.RED if result.failed else Fore.GREEN
+    print(f"{color}Failed: {result.failed}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}" + "=" * 50 + f"{Style.RESET_ALL}")
+
+    for error in result.errors[:20]:
+        print(f"{Fore.YELLOW}Row {error.row}: {error.error}{Style.RESET_ALL}")
+    if len(result.errors) > 20:
+        print(
+            f"{Fore.YELLOW}... and {len(result.errors) - 20} more errors{Style.RESET_ALL}"
+        )
+
+    if args.errors_file:
+        Path(args.errors_file).write_text(
+            json.dumps([e.model_dump() for e in result.errors], ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+        print(f"{Fore.CYAN}Error report written to {args.errors_file}{Style.RESET_ALL}")
+
+    return 0 if not result.failed else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Blob Storage Migration Script
+Command-line tool for moving uploaded files into the content-addressed blob store
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Set, Tuple
+
+from sqlmodel import Session, col, select
+from colorama import init, Fore, Style
+
+# Add project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Initialize colorama for Windows
+init(autoreset=True)
+
+from app.core.config_dev import PAPERS_DIR, config, get_team_upload_dir
+from app.core.database import init_db, engine
+from app.models.blob import FileBlob
+from app.models.paper import Paper
+from app.models.reference import ReferencePaper
+from app.services.blobs import (
+    BLOB_PREFIX,
+    BLOBS_DIR,
+    acquire_blob,
+    count_blob_mismatches,
+    rebuild_blob_refcounts,
+    release_file,
+    resolve_file_path,
+)
+from app.services.uploads import UPLOAD_CHUNK_SIZE
+
+# Temporary files younger than this may belong to uploads or deletions in progress
+STALE_PART_SECONDS = 24 * 60 * 60
+
+
+def hash_file(path: Path) -> Tuple[str, int]:
+    """Return the SHA-256 and size of a file"""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def link_or_copy(source: Path, target: Path) -> None:
+    """Create target with the content of source, hard-linking when possible"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+    os.chmod(target, 0o644)
+
+
+def legacy_dir(record) -> Path:
+    """Directory that held the record's file before the blob store"""
+    if isinstance(record, Paper):
+        return PAPERS_DIR
+    return get_team_upload_dir(record.team_id) if record.team_id else config.teams
+
+
+def migrate_records(session: Session, model, dry_run: bool) -> Tuple[int, int, int]:
+    """
+    Move the files of one model into the blob store, one commit per record
+
+    Returns:
+        (migrated records, missing files, bytes reclaimed by deduplication)
+    """
+    records = session.exec(
+        select(model).where(
+            col(model.file_path).is_not(None),
+            ~col(model.file_path).startswith(BLOB_PREFIX),
+        )
+    ).all()
+
+    migrated = missing = reclaimed = 0
+    seen: Set[str] = set()
+    for record in records:
+        directory = legacy_dir(record)
+        source = resolve_file_path(record.file_path, directory)
+        if not source.is_file():
+            print(
+                f"{Fore.YELLOW}Missing file for {model.__name__} {record.id}: "
+                f"{record.file_path}{Style.RESET_ALL}"
+            )
+            missing += 1
+            continue
+
+        sha256, size = hash_file(source)
+        if dry_run:
+            exists = sha256 in seen or session.get(FileBlob, sha256) is not None
+            reclaimed += size if exists else 0
+            seen.add(sha256)
+            migrated += 1
+            continue
+
+        blob = acquire_blob(session, sha256, size, source.suffix.lower())
+        target = config.uploads / blob.file_path
+        if target.exists():
+            reclaimed += size
+        else:
+            link_or_copy(source, target)
+
+        old_file_path = record.file_path
+        record.file_path = blob.file_path
+        session.add(record)
+        # The old file is removed after the commit and restored on rollback
+        release_file(session, old_file_path, directory)
+        session.commit()
+        migrated += 1
+    return migrated, missing, reclaimed
+
+
+def remove_orphan_files(session: Session, dry_run: bool) -> Tuple[int, int]:
+    """Remove files under the blob directory that no FileBlob row refers to"""
+    known = set(session.exec(select(FileBlob.file_path)).all())
+    now = time.time()
+    removed = size = 0
+    for path in BLOBS_DIR.rglob("*"):
+        if not path.is_file():
+            continue
+        relative = path.relative_to(config.uploads).as_posix()
+        if relative in known:
+            continue
+        stat = path.stat()
+        if path.suffix in (".part", ".deleted") and now - stat.st_mtime < STALE_PART_SECONDS:
+            continue
+        if not dry_run:
+            path.unlink()
+        removed += 1
+        size += stat.st_size
+    if not dry_run:
+        for directory in BLOBS_DIR.iterdir():
+            if directory.is_dir() and not any(directory.iterdir()):
+                directory.rmdir()
+    return removed, size
+
+
+def format_size(size: int) -> str:
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def main_cli() -> int:
+    """Main function for command-line execution"""
+    parser = argparse.ArgumentParser(
+        description="Move uploaded paper and reference files into the blob store"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only report what would be migrated, do not move files or change records",
+    )
+    parser.add_argument(
+        "--gc",
+        action="store_true",
+        help="Also remove files in the blob directory that no record refers to",
+    )
+    args = parser.parse_args()
+
+    print(f"{Fore.CYAN}Initializing database...{Style.RESET_ALL}")
+    init_db()
+
+    with Session(engine) as session:
+        total_missing = total_reclaimed = 0
+        for model in (Paper, ReferencePaper):
+            migrated, missing, reclaimed = migrate_records(session, model, args.dry_run)
+            total_missing += missing
+            total_reclaimed += reclaimed
+            action = "Would migrate" if args.dry_run else "Migrated"
+            print(f"{Fore.GREEN}{action} {migrated} {model.__name__} files{Style.RESET_ALL}")
+
+        print(
+            f"{Fore.GREEN}Space reclaimed by deduplication: {format_size(total_reclaimed)}"
+            f"{Style.RESET_ALL}"
+        )
+        if total_missing:
+            print(
+                f"{Fore.YELLOW}Records whose file is missing (left unchanged): "
+                f"{total_missing}{Style.RESET_ALL}"
+            )
+
+        mismatches = count_blob_mismatches(session)
+        if mismatches and not args.dry_run:
+            print(f"{Fore.CYAN}Fixing {mismatches} blob reference counts...{Style.RESET_ALL}")
+            rebuild_blob_refcounts(session)
+            session.commit()
+        elif mismatches:
+            print(f"{Fore.YELLOW}Blob reference counts out of date: {mismatches}{Style.RESET_ALL}")
+
+        if args.gc:
+            removed, size = remove_orphan_files(session, args.dry_run)
+            action = "Would remove" if args.dry_run else "Removed"
+            print(
+                f"{Fore.GREEN}{action} {removed} unreferenced blob files "
+                f"({format_size(size)}){Style.RESET_ALL}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Workload Ledger Maintenance Script
+Command-line tool for checking and rebuilding the author workload ledger
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from sqlmodel import Session
+from colorama import init, Fore, Style
+
+# Add project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Initialize colorama for Windows
+init(autoreset=True)
+
+from app.core.database import init_db, engine
+from app.services.workload import count_ledger_mismatches, rebuild_workload_ledger
+
+
+def main_cli() -> int:
+    """Main function for command-line execution"""
+    parser = argparse.ArgumentParser(description="Author workload ledger maintenance")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report rows that differ from the source data, do not rebuild",
+    )
+    args = parser.parse_args()
+
+    print(f"{Fore.CYAN}Initializing database...{Style.RESET_ALL}")
+    init_db()
+
+    with Session(engine) as session:
+        mismatches = count_ledger_mismatches(session)
+        if mismatches:
+            print(f"{Fore.YELLOW}Ledger rows out of date: {mismatches}{Style.RESET_ALL}")
+        else:
+            print(f"{Fore.GREEN}Ledger is consistent with source data{Style.RESET_ALL}")
+
+        if args.check:
+            return 1 if mismatches else 0
+
+        print(f"{Fore.CYAN}Rebuilding workload ledger...{Style.RESET_ALL}")
+        rebuild_workload_ledger(session)
+        session.commit()
+
+        remaining = count_ledger_mismatches(session)
+        if remaining:
+            print(f"{Fore.RED}Rebuild left {remaining} mismatched rows{Style.RESET_ALL}")
+            return 1
+        print(f"{Fore.GREEN}Workload ledger rebuilt successfully{Style.RESET_ALL}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
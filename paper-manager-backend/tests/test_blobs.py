@@ -0,0 +1,150 @@
+"""
+blob 存储与事务的一致性
+
+运行：python -m unittest discover tests
+"""
+
+import hashlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Tuple
+from unittest import mock
+
+from fastapi import UploadFile
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import app.models  # noqa: F401  (side effect: registers all models with SQLModel.metadata)
+from app.core.config_dev import config
+from app.models.blob import FileBlob
+from app.services import blobs
+
+
+class BlobTransactionTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        uploads = root / "uploads"
+        for patcher in (
+            mock.patch.object(config, "uploads", uploads),
+            mock.patch.object(blobs, "BLOBS_DIR", uploads / "blobs"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+        self.engine = create_engine(f"sqlite:///{root / 'test.db'}")
+        SQLModel.metadata.create_all(self.engine)
+        self.addCleanup(self.engine.dispose)
+        self.async_engine = create_async_engine(f"sqlite+aiosqlite:///{root / 'test.db'}")
+
+    async def asyncTearDown(self):
+        await self.async_engine.dispose()
+
+    def add_blob(self, content: bytes, ref_count: int = 1) -> FileBlob:
+        """创建 blob 记录和文件"""
+        sha256 = hashlib.sha256(content).hexdigest()
+        blob = FileBlob(
+            sha256=sha256,
+            file_path=blobs.blob_relative_path(sha256, ".pdf"),
+            size=len(content),
+            ref_count=ref_count,
+        )
+        path = config.uploads / blob.file_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+        with Session(self.engine) as session:
+            session.add(blob)
+            session.commit()
+            session.refresh(blob)
+        return blob
+
+    def ref_count(self, sha256: str):
+        with Session(self.engine) as session:
+            blob = session.get(FileBlob, sha256)
+            return None if blob is None else blob.ref_count
+
+    def blob_dir_files(self, blob: FileBlob):
+        return sorted(p.name for p in (config.uploads / blob.file_path).parent.iterdir())
+
+    def all_blob_files(self):
+        return sorted(
+            str(p.relative_to(config.uploads))
+            for p in blobs.BLOBS_DIR.rglob("*")
+            if p.is_file()
+        )
+
+    async def store(self, content: bytes, commit: bool) -> Tuple[str, str]:
+        """上传文件，返回 (sha256, file_path)"""
+        before = self.all_blob_files()
+        upload = UploadFile(file=io.BytesIO(content), filename="paper.PDF")
+        async with AsyncSession(self.async_engine) as session:
+            blob = await blobs.store_upload(session, upload)
+            sha256, file_path = blob.sha256, blob.file_path
+            # 提交之前 blob 路径下没有新文件，只有临时文件
+            published = [
+                p for p in self.all_blob_files() if p not in before and ".upload-" not in p
+            ]
+            self.assertEqual(published, [])
+            if commit:
+                await session.commit()
+        return sha256, file_path
+
+    def test_release_then_commit_deletes_file(self):
+        blob = self.add_blob(b"%PDF-1.4 committed")
+        with Session(self.engine) as session:
+            blobs.release_file(session, blob.file_path, config.uploads)
+            session.commit()
+
+        self.assertIsNone(self.ref_count(blob.sha256))
+        self.assertEqual(self.blob_dir_files(blob), [])
+
+    def test_release_then_rollback_restores_file(self):
+        blob = self.add_blob(b"%PDF-1.4 rolled back")
+        with Session(self.engine) as session:
+            blobs.release_file(session, blob.file_path, config.uploads)
+            session.rollback()
+
+        self.assertEqual(self.ref_count(blob.sha256), 1)
+        self.assertEqual(self.blob_dir_files(blob), [Path(blob.file_path).name])
+
+    def test_request_failing_after_release_keeps_file(self):
+        """请求在 release_file 之后出错，会话未提交就关闭，文件保持原位"""
+        blob = self.add_blob(b"%PDF-1.4 failed request")
+        with self.assertRaises(RuntimeError):
+            with Session(self.engine) as session:
+                blobs.release_file(session, blob.file_path, config.uploads)
+                raise RuntimeError("request failed before commit")
+
+        self.assertEqual(self.ref_count(blob.sha256), 1)
+        self.assertEqual(self.blob_dir_files(blob), [Path(blob.file_path).name])
+
+
+    async def test_upload_published_on_commit(self):
+        sha256, file_path = await self.store(b"%PDF-1.4 uploaded", commit=True)
+
+        self.assertEqual(self.ref_count(sha256), 1)
+        self.assertEqual(file_path, blobs.blob_relative_path(sha256, ".pdf"))
+        self.assertEqual(self.all_blob_files(), [file_path])
+        self.assertEqual((config.uploads / file_path).read_bytes(), b"%PDF-1.4 uploaded")
+
+    async def test_upload_of_existing_content_keeps_one_file(self):
+        blob = self.add_blob(b"%PDF-1.4 duplicate")
+        await self.store(b"%PDF-1.4 duplicate", commit=True)
+
+        self.assertEqual(self.ref_count(blob.sha256), 2)
+        self.assertEqual(self.all_blob_files(), [blob.file_path])
+
+    async def test_upload_without_commit_leaves_no_file(self):
+        """请求在上传之后出错，不留下没有记录的文件"""
+        sha256, _ = await self.store(b"%PDF-1.4 abandoned", commit=False)
+
+        self.assertIsNone(self.ref_count(sha256))
+        self.assertEqual(self.all_blob_files(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()